@@ -9,7 +9,7 @@ and provides a convenient interface for:
 """
 
 import asyncio
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Mapping, Optional
 
 from basket_ai.types import Context, Model, Tool
 
@@ -77,9 +77,18 @@ class Agent:
             event_type: Event type to subscribe to
             handler: Callback function (can be sync or async)
         """
-        if event_type not in self.event_handlers:
-            self.event_handlers[event_type] = []
-        self.event_handlers[event_type].append(handler)
+        self.event_handlers.setdefault(event_type, []).append(handler)
+
+    def on_many(self, handlers: Mapping[str, Callable]) -> None:
+        """
+        Subscribe several handlers in one call.
+
+        Args:
+            handlers: Mapping of event type to handler (sync or async)
+        """
+        event_handlers = self.event_handlers
+        for event_type, handler in handlers.items():
+            event_handlers.setdefault(event_type, []).append(handler)
 
     async def _emit_event(self, event: Dict[str, Any]) -> None:
         """Emit an event to all subscribed handlers."""
@@ -138,6 +138,22 @@ class TestAgentEventSubscription:
 
         assert len(agent.event_handlers["test_event"]) == 2
 
+    def test_on_many(self, sample_model):
+        """Test registering several handlers in one call."""
+        agent = Agent(sample_model)
+
+        def handler1(event):
+            pass
+
+        def handler2(event):
+            pass
+
+        agent.on("a", handler1)
+        agent.on_many({"a": handler2, "b": handler2})
+
+        assert agent.event_handlers["a"] == [handler1, handler2]
+        assert agent.event_handlers["b"] == [handler2]
+
     @pytest.mark.asyncio
     async def test_emit_event(self, sample_model):
         """Test event emission."""
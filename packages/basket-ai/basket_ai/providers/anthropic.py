@@ -17,7 +17,7 @@ from anthropic import AsyncAnthropic
 logger = logging.getLogger(__name__)
 
 from basket_ai.providers.base import BaseProvider
-from basket_ai.providers.utils import get_env_api_key
+from basket_ai.providers.utils import get_env_api_key, tool_parameters_schema
 from basket_ai.stream import AssistantMessageEventStream
 from basket_ai.types import (
     AssistantMessage,
@@ -108,7 +108,7 @@ class AnthropicProvider(BaseProvider):
                 provider=model.provider,
                 model=model.id,
                 stop_reason=StopReason.STOP,
-                timestamp=int(time.time() * 1000),
+                timestamp=time.time_ns() // 1_000_000,
             )
 
             try:
@@ -415,11 +415,8 @@ class AnthropicProvider(BaseProvider):
         """Convert Tool definitions to Anthropic format."""
         result = []
         for tool in tools:
-            # Get JSON Schema from Pydantic model or dict
-            if hasattr(tool.parameters, "model_json_schema"):
-                input_schema = tool.parameters.model_json_schema()
-            else:
-                input_schema = tool.parameters
+            # Get JSON Schema from Pydantic model (cached per class) or dict
+            input_schema = tool_parameters_schema(tool.parameters)
 
             tool_name = to_claude_code_name(tool.name) if oauth_token else tool.name
 
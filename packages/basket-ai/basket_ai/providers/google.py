@@ -12,7 +12,7 @@ import time
 from typing import Any, Dict, List, Literal, Optional
 
 from basket_ai.providers.base import BaseProvider
-from basket_ai.providers.utils import get_env_api_key
+from basket_ai.providers.utils import get_env_api_key, tool_parameters_schema
 from basket_ai.stream import AssistantMessageEventStream
 from basket_ai.types import (
     AssistantMessage,
@@ -74,7 +74,7 @@ class GoogleProvider(BaseProvider):
                 provider=model.provider,
                 model=model.id,
                 stop_reason=StopReason.STOP,
-                timestamp=int(time.time() * 1000),
+                timestamp=time.time_ns() // 1_000_000,
             )
 
             try:
@@ -185,7 +185,7 @@ class GoogleProvider(BaseProvider):
 
                                 # Generate unique ID
                                 _tool_call_counter += 1
-                                tool_call_id = f"{part.function_call.name}_{int(time.time() * 1000)}_{_tool_call_counter}"
+                                tool_call_id = f"{part.function_call.name}_{time.time_ns() // 1_000_000}_{_tool_call_counter}"
 
                                 # Parse arguments
                                 args = dict(part.function_call.args) if part.function_call.args else {}
@@ -359,11 +359,8 @@ class GoogleProvider(BaseProvider):
         """Convert tools to Google format."""
         declarations = []
         for tool in tools:
-            # Get JSON Schema from Pydantic model or dict
-            if hasattr(tool.parameters, "model_json_schema"):
-                schema = tool.parameters.model_json_schema()
-            else:
-                schema = tool.parameters
+            # Get JSON Schema from Pydantic model (cached per class) or dict
+            schema = tool_parameters_schema(tool.parameters)
 
             declarations.append({
                 "function_declaration": {
@@ -15,7 +15,7 @@ from openai import AsyncOpenAI
 from openai.types.chat import ChatCompletionChunk
 
 from basket_ai.providers.base import BaseProvider
-from basket_ai.providers.utils import get_env_api_key, normalize_mistral_tool_id
+from basket_ai.providers.utils import get_env_api_key, normalize_mistral_tool_id, tool_parameters_schema
 from basket_ai.stream import AssistantMessageEventStream
 from basket_ai.types import (
     AssistantMessage,
@@ -73,7 +73,7 @@ class OpenAICompletionsProvider(BaseProvider):
                 provider=model.provider,
                 model=model.id,
                 stop_reason=StopReason.STOP,
-                timestamp=int(time.time() * 1000),
+                timestamp=time.time_ns() // 1_000_000,
             )
 
             try:
@@ -376,11 +376,8 @@ class OpenAICompletionsProvider(BaseProvider):
         """Convert Tool definitions to OpenAI format."""
         result = []
         for tool in tools:
-            # Get JSON Schema from Pydantic model or dict
-            if hasattr(tool.parameters, "model_json_schema"):
-                parameters = tool.parameters.model_json_schema()
-            else:
-                parameters = tool.parameters
+            # Get JSON Schema from Pydantic model (cached per class) or dict
+            parameters = tool_parameters_schema(tool.parameters)
 
             result.append({
                 "type": "function",
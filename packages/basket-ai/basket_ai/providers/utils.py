@@ -2,8 +2,9 @@
 Utility functions for provider implementations.
 """
 
+import functools
 import os
-from typing import Optional
+from typing import Any, Dict, Optional
 
 
 def get_env_api_key(provider: str) -> Optional[str]:
@@ -73,7 +74,32 @@ def normalize_mistral_tool_id(tool_id: str) -> str:
     return normalized
 
 
+@functools.lru_cache(maxsize=256)
+def _model_schema(model: type) -> Dict[str, Any]:
+    return model.model_json_schema()
+
+
+def tool_parameters_schema(parameters: Any) -> Dict[str, Any]:
+    """
+    Return the JSON Schema for a tool's parameters.
+
+    Pydantic models are converted once per class (the schema is rebuilt on every
+    model_json_schema() call otherwise, i.e. once per tool per request); plain
+    JSON Schema dicts are returned as is.
+
+    Args:
+        parameters: Pydantic model class or JSON Schema dict
+
+    Returns:
+        JSON Schema dict (shared; callers must not mutate it)
+    """
+    if isinstance(parameters, type) and hasattr(parameters, "model_json_schema"):
+        return _model_schema(parameters)
+    return parameters
+
+
 __all__ = [
     "get_env_api_key",
     "normalize_mistral_tool_id",
+    "tool_parameters_schema",
 ]
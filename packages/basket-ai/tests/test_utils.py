@@ -5,7 +5,9 @@ Tests JSON parsing and token counting utilities.
 """
 
 import pytest
+from pydantic import BaseModel
 
+from basket_ai.providers.utils import tool_parameters_schema
 from basket_ai.utils.json_parsing import parse_partial_json, try_parse_json
 from basket_ai.utils.token_counting import estimate_tokens, estimate_tokens_from_messages
 
@@ -118,5 +120,24 @@ class TestTokenCounting:
         assert count > 100
 
 
+class TestToolParametersSchema:
+    """Tests for tool parameter schema conversion."""
+
+    def test_model_schema_built_once_per_class(self):
+        """A Pydantic model's schema is generated once and reused."""
+
+        class Params(BaseModel):
+            path: str
+
+        first = tool_parameters_schema(Params)
+        assert first["properties"]["path"]["type"] == "string"
+        assert tool_parameters_schema(Params) is first
+
+    def test_dict_schema_passed_through(self):
+        """A JSON Schema dict is returned unchanged."""
+        schema = {"type": "object", "properties": {}}
+        assert tool_parameters_schema(schema) is schema
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
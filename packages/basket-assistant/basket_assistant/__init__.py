@@ -2,9 +2,18 @@
 Pi Coding Agent - Interactive CLI coding assistant.
 """
 
-from .agent import CodingAgent
 from .main import main
 
 __version__ = "0.1.0"
 
 __all__ = ["CodingAgent", "main"]
+
+
+def __getattr__(name: str):
+    # CodingAgent pulls in the whole agent/tool stack; load it on first access so
+    # `basket --help` and other fast paths don't pay for it.
+    if name == "CodingAgent":
+        from .agent import CodingAgent
+
+        return CodingAgent
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
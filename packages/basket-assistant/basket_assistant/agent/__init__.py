@@ -2,10 +2,11 @@
 CodingAgent: main coding agent class composed from prompts, session, tools, events, run.
 """
 
+import asyncio
 import logging
 import os
 from pathlib import Path
-from typing import Callable, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from basket_agent import Agent
 from basket_ai.api import get_model
@@ -48,14 +49,20 @@ class CodingAgent:
         sessions_dir = Path(self.settings.sessions_dir).expanduser()
         self.session_manager = SessionManager(sessions_dir)
 
-        model_kwargs: dict = {}
-        if self.settings.model.base_url:
-            model_kwargs["base_url"] = self.settings.model.base_url
+        self._base_model_kwargs: dict = (
+            {"base_url": self.settings.model.base_url}
+            if self.settings.model.base_url
+            else {}
+        )
         self.model = get_model(
             self.settings.model.provider,
             self.settings.model.model_id,
-            **model_kwargs,
+            **self._base_model_kwargs,
         )
+        # (provider, model_id) -> model shared by subagents; see tools.subagent_model
+        self._subagent_models: Dict[Tuple[str, str], Any] = {
+            (self.settings.model.provider, self.settings.model.model_id): self.model
+        }
         logger.info(
             "Using model: provider=%s, model_id=%s, base_url=%s",
             self.settings.model.provider,
@@ -72,12 +79,23 @@ class CodingAgent:
 
         self._current_todos: List[dict] = []
         self._session_id: Optional[str] = None
+        # Latest background save started by todo_write; see tools.todo_write.flush_todo_saves
+        self._todo_save_task: Optional[asyncio.Task] = None
         self._todo_show_full: bool = False
         self._plan_mode: bool = (
             getattr(self.settings.permissions, "default_mode", "default") == "plan"
         )
         self._pending_asks: List[dict] = []
         self._assistant_event_handlers: Dict[str, List[Callable]] = {}
+        # Subagent tool lists: registerable tools rebuilt when skills change, filtered per allow-set
+        self._registerable_tools: Optional[Tuple[dict, ...]] = None
+        self._registerable_tools_key: tuple = ()
+        self._subagent_tools_cache: Dict[frozenset, Tuple[dict, ...]] = {}
+        # Subagent name -> (config, tools, Agent) reused across task calls
+        self._subagent_pool: Dict[str, tuple] = {}
+        self._subagents_running: Set[str] = set()
+        # Resolved skills/agents dirs per settings field; see prompts._cached_dirs
+        self._dirs_cache: Dict[str, tuple] = {}
 
         events.setup_event_handlers(self)
 
@@ -93,13 +111,13 @@ class CodingAgent:
         return prompts.get_system_prompt_base()
 
     def _get_agents_dirs(self):
-        return prompts.get_agents_dirs(self.settings)
+        return prompts.agents_dirs_for(self)
 
     def _get_subagent_configs(self):
         return prompts.get_subagent_configs(self)
 
     def _get_skills_dirs(self):
-        return prompts.get_skills_dirs(self.settings)
+        return prompts.skills_dirs_for(self)
 
     def _get_plan_mode_prompt_suffix(self) -> str:
         return prompts.get_plan_mode_prompt_suffix()
@@ -136,7 +154,7 @@ class CodingAgent:
             invoked_skill_id=invoked_skill_id,
         )
 
-    def _filter_tools_for_subagent(self, cfg) -> list:
+    def _filter_tools_for_subagent(self, cfg) -> Tuple[dict, ...]:
         return tools.filter_tools_for_subagent(self, cfg)
 
     async def run_subagent(self, subagent_name: str, user_prompt: str) -> str:
@@ -161,11 +179,13 @@ class CodingAgent:
         self,
         stream_llm_events: bool = True,
         invoked_skill_id: Optional[str] = None,
+        last_user_text: Optional[str] = None,
     ):
         return await events.run_with_trajectory_if_enabled(
             self,
             stream_llm_events=stream_llm_events,
             invoked_skill_id=invoked_skill_id,
+            last_user_text=last_user_text,
         )
 
     async def run_interactive(self) -> None:
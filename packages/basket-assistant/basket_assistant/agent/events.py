@@ -1,23 +1,75 @@
 """Agent event handlers, before_run/turn_done emission, trajectory recording."""
 
 import asyncio
+import functools
 import logging
 import os
+import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from ..tools import flush_todo_saves
+
 logger = logging.getLogger(__name__)
 
+# Streamed text is written to stdout in batches: flush on newline, when the buffer
+# grows past TEXT_FLUSH_CHARS, or TEXT_FLUSH_INTERVAL seconds after it became non-empty.
+# The interval is the longest a tail without a newline stays hidden: one 60 Hz frame.
+TEXT_FLUSH_INTERVAL = 0.016
+TEXT_FLUSH_CHARS = 512
+
+# Agent events forwarded to the trajectory recorder
+TRAJECTORY_EVENT_TYPES = (
+    "agent_turn_start",
+    "agent_turn_end",
+    "agent_tool_call_start",
+    "agent_tool_call_end",
+    "agent_complete",
+    "agent_error",
+)
+
 
 def setup_event_handlers(agent: Any) -> None:
     """Setup event handlers for agent events."""
+    out_buf: List[str] = []
+    buffered = 0
+    # Pending timed flush for text left in the buffer
+    flush_timer: Optional[asyncio.TimerHandle] = None
+
+    def flush_text() -> None:
+        nonlocal buffered, flush_timer
+        if flush_timer is not None:
+            flush_timer.cancel()
+            flush_timer = None
+        if out_buf:
+            sys.stdout.write("".join(out_buf))
+            sys.stdout.flush()
+            out_buf.clear()
+            buffered = 0
 
     def on_text_delta(event):
+        nonlocal buffered, flush_timer
         delta = event.get("delta", "")
-        if delta:
-            print(delta, end="", flush=True)
+        if not delta:
+            return
+        out_buf.append(delta)
+        buffered += len(delta)
+        if "\n" in delta or buffered > TEXT_FLUSH_CHARS:
+            flush_text()
+        elif flush_timer is None:
+            # Text without a newline must not wait for the next delta or turn end
+            try:
+                flush_timer = asyncio.get_running_loop().call_later(
+                    TEXT_FLUSH_INTERVAL, flush_text
+                )
+            except RuntimeError:  # no running loop: write it now
+                flush_text()
+
+    def on_turn_end(event):
+        flush_text()
 
     async def on_tool_call_start(event):
+        flush_text()
         tool_name = event.get("tool_name", "unknown")
         logger.info("Tool call start: %s", tool_name)
         args = event.get("arguments", {})
@@ -101,9 +153,15 @@ def setup_event_handlers(agent: Any) -> None:
                 print(f"\n[Todo: {len(agent._current_todos)} items]", flush=True)
                 logger.debug("[Todo: %d items]", len(agent._current_todos))
 
-    agent.agent.on("text_delta", on_text_delta)
-    agent.agent.on("agent_tool_call_start", on_tool_call_start)
-    agent.agent.on("agent_tool_call_end", on_tool_call_end)
+    agent.agent.on_many(
+        {
+            "text_delta": on_text_delta,
+            "agent_turn_end": on_turn_end,
+            "agent_error": on_turn_end,
+            "agent_tool_call_start": on_tool_call_start,
+            "agent_tool_call_end": on_tool_call_end,
+        }
+    )
 
 
 async def emit_assistant_event(agent: Any, event_name: str, payload: dict) -> None:
@@ -174,39 +232,88 @@ def get_trajectory_dir(agent: Any) -> Optional[str]:
 
 def on_trajectory_event(agent: Any, event: dict) -> None:
     """Forward agent event to current trajectory recorder (if any)."""
-    recorder = getattr(agent, "_trajectory_recorder", None)
+    # Runs for every agent event: read the instance dict directly (no getattr default path)
+    recorder = agent.__dict__.get("_trajectory_recorder")
     if recorder is not None:
         recorder.on_event(event)
+        event_log = agent.__dict__.get("_trajectory_event_log")
+        if event_log is not None:
+            event_log.write(event)
 
 
 def ensure_trajectory_handlers(agent: Any) -> None:
     """Register trajectory event handlers once (no-op when trajectory disabled)."""
     if getattr(agent, "_trajectory_handlers_registered", False):
         return
-    for event_type in (
-        "agent_turn_start",
-        "agent_turn_end",
-        "agent_tool_call_start",
-        "agent_tool_call_end",
-        "agent_complete",
-        "agent_error",
-    ):
-        agent.agent.on(event_type, lambda e, ag=agent: on_trajectory_event(ag, e))
+    handler = functools.partial(on_trajectory_event, agent)
+    agent.agent.on_many(dict.fromkeys(TRAJECTORY_EVENT_TYPES, handler))
     agent._trajectory_handlers_registered = True
 
 
+def _last_user_text(messages: List[Any]) -> str:
+    """Content of the last user message; checks the tail first, then scans back."""
+    if not messages:
+        return ""
+    msg = messages[-1]
+    if msg.role != "user":
+        msg = next((m for m in reversed(messages) if m.role == "user"), None)
+        if msg is None:
+            return ""
+    content = msg.content
+    return content if isinstance(content, str) else str(content)
+
+
+@functools.cache
+def _trajectory_api():
+    """(TrajectoryRecorder, write_trajectory, EventLogWriter), imported on first use only."""
+    from basket_trajectory import EventLogWriter, TrajectoryRecorder, write_trajectory
+
+    return TrajectoryRecorder, write_trajectory, EventLogWriter
+
+
+def _write_trajectory_sync(
+    recorder: Any, state: Any, trajectory_dir: str, event_log: Any = None
+) -> None:
+    """
+    Finalize the recorder and write task_<id>.json under trajectory_dir; logs on failure.
+    event_log (if any) is closed first so all streamed events are on disk.
+    """
+    _, write_trajectory, _ = _trajectory_api()
+    if event_log is not None:
+        try:
+            event_log.close()
+        except Exception as e:
+            logger.warning("Failed to close trajectory event log: %s", e)
+    try:
+        recorder.finalize(state)
+        path = Path(trajectory_dir).expanduser()
+        path.mkdir(parents=True, exist_ok=True)
+        write_trajectory(
+            recorder.get_trajectory(), path / f"task_{recorder.task_id}.json"
+        )
+    except Exception as e:
+        logger.warning("Failed to write trajectory: %s", e)
+
+
 async def run_with_trajectory_if_enabled(
     agent: Any,
     stream_llm_events: bool = True,
     invoked_skill_id: Optional[str] = None,
+    last_user_text: Optional[str] = None,
 ):
-    """Run agent; if trajectory_dir is set, record trajectory and write to disk."""
+    """
+    Run agent; if trajectory_dir is set, record trajectory and write to disk.
+    last_user_text: the user input just appended by the caller, used as the task
+    input so the message list need not be scanned.
+    """
     from . import prompts
 
     old_system = agent.context.system_prompt
-    agent.context.system_prompt = prompts.get_system_prompt_for_run(
-        agent, invoked_skill_id
-    )
+    new_system = prompts.get_system_prompt_for_run(agent, invoked_skill_id)
+    # The composed prompt is cached, so an unchanged prompt is usually the same object
+    swap = new_system is not old_system and new_system != old_system
+    if swap:
+        agent.context.system_prompt = new_system
     try:
         await emit_assistant_event(
             agent,
@@ -217,19 +324,23 @@ async def run_with_trajectory_if_enabled(
         if not trajectory_dir:
             return await agent.agent.run(stream_llm_events=stream_llm_events)
 
-        from basket_trajectory import TrajectoryRecorder, write_trajectory
-
+        recorder_cls, _, event_log_cls = _trajectory_api()
         ensure_trajectory_handlers(agent)
-        recorder = TrajectoryRecorder()
+        recorder = recorder_cls()
+        event_log = None
+        if agent.settings.trajectory_events:
+            try:
+                event_log = event_log_cls(
+                    Path(trajectory_dir) / f"task_{recorder.task_id}.events.jsonl"
+                )
+            except OSError as e:
+                logger.warning("Failed to open trajectory event log: %s", e)
+        agent._trajectory_event_log = event_log
         agent._trajectory_recorder = recorder
 
-        user_input = ""
-        for msg in reversed(agent.context.messages):
-            if getattr(msg, "role", None) == "user":
-                content = getattr(msg, "content", "")
-                user_input = content if isinstance(content, str) else str(content)
-                break
-        recorder.start_task(user_input)
+        if last_user_text is None:
+            last_user_text = _last_user_text(agent.context.messages)
+        recorder.start_task(last_user_text)
 
         state = None
         try:
@@ -238,16 +349,15 @@ async def run_with_trajectory_if_enabled(
             raise
         finally:
             agent._trajectory_recorder = None
-            try:
-                recorder.finalize(state)
-                path = Path(trajectory_dir).expanduser()
-                path.mkdir(parents=True, exist_ok=True)
-                write_trajectory(
-                    recorder.get_trajectory(), path / f"task_{recorder.task_id}.json"
-                )
-            except Exception as e:
-                logger.warning("Failed to write trajectory: %s", e)
+            agent._trajectory_event_log = None
+            # Serialize off the event loop; run_in_executor skips to_thread's context copy
+            await asyncio.get_running_loop().run_in_executor(
+                None, _write_trajectory_sync, recorder, state, trajectory_dir, event_log
+            )
 
         return state
     finally:
-        agent.context.system_prompt = old_system
+        if swap:
+            agent.context.system_prompt = old_system
+        # todo_write saves in the background; make them durable before the turn is reported done
+        await flush_todo_saves(agent)
@@ -1,45 +1,83 @@
 """System prompts, plan mode suffix, and skills/agents directory resolution."""
 
+import functools
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from ..core import SubAgentConfig, get_skill_full_content, load_agents_from_dirs
 
 
+# Default search locations: "~" is the home directory, "." the working directory
+_DEFAULT_AGENTS_DIRS = (
+    ("~", (".basket", "agents")),
+    (".", (".basket", "agents")),
+)
+_DEFAULT_SKILLS_DIRS = (
+    ("~", (".basket", "skills")),
+    (".", (".basket", "skills")),
+    ("~", (".config", "opencode", "skills")),
+    (".", (".opencode", "skills")),
+    ("~", (".claude", "skills")),
+    (".", (".claude", "skills")),
+    ("~", (".agents", "skills")),
+    (".", (".agents", "skills")),
+)
+
+
+def _resolve_dirs(configured: Optional[List[str]], defaults: tuple) -> List[Path]:
+    """
+    Configured dirs (expanded, resolved) or the defaults under home/cwd, each looked
+    up once. Duplicates are dropped in order, e.g. when running from the home directory.
+    """
+    if configured:
+        dirs = (Path(d).expanduser().resolve() for d in configured)
+    else:
+        roots = {"~": Path.home(), ".": Path.cwd()}
+        dirs = (roots[root].joinpath(*parts) for root, parts in defaults)
+    return list(dict.fromkeys(dirs))
+
+
 def get_agents_dirs(settings: Any) -> List[Path]:
     """Resolve agents directories; default ~/.basket/agents and ./.basket/agents."""
-    if getattr(settings, "agents_dirs", None):
-        return [Path(d).expanduser().resolve() for d in settings.agents_dirs]
-    return [
-        Path.home() / ".basket" / "agents",
-        Path.cwd() / ".basket" / "agents",
-    ]
+    return _resolve_dirs(getattr(settings, "agents_dirs", None), _DEFAULT_AGENTS_DIRS)
+
+
+def _cached_dirs(
+    agent: Any, field: str, resolve: Callable[[Any], List[Path]]
+) -> Tuple[Path, ...]:
+    """resolve(settings) cached until agent.settings or settings.<field> is replaced."""
+    settings = agent.settings
+    source = getattr(settings, field, None)
+    cached = agent._dirs_cache.get(field)
+    if cached is None or cached[0] is not settings or cached[1] is not source:
+        cached = (settings, source, tuple(resolve(settings)))
+        agent._dirs_cache[field] = cached
+    return cached[2]
+
+
+def agents_dirs_for(agent: Any) -> Tuple[Path, ...]:
+    """get_agents_dirs(agent.settings), resolved once per settings.agents_dirs value."""
+    return _cached_dirs(agent, "agents_dirs", get_agents_dirs)
+
+
+def skills_dirs_for(agent: Any) -> Tuple[Path, ...]:
+    """get_skills_dirs(agent.settings), resolved once per settings.skills_dirs value."""
+    return _cached_dirs(agent, "skills_dirs", get_skills_dirs)
 
 
 def get_subagent_configs(agent: Any) -> Dict[str, SubAgentConfig]:
-    """Merge settings.agents with agents loaded from .basket/agents/*.md; later overrides."""
-    out: Dict[str, SubAgentConfig] = {}
-    for k, v in agent.settings.agents.items():
-        out[k] = v
-    for k, v in load_agents_from_dirs(get_agents_dirs(agent.settings)).items():
-        out[k] = v
+    """
+    Merge settings.agents with agents loaded from .basket/agents/*.md; later overrides.
+    The loader keeps parsed files by mtime and size, so unchanged files are not re-read.
+    """
+    out: Dict[str, SubAgentConfig] = dict(agent.settings.agents)
+    out.update(load_agents_from_dirs(list(agents_dirs_for(agent))))
     return out
 
 
 def get_skills_dirs(settings: Any) -> List[Path]:
     """Resolve skills directories; default includes Basket, OpenCode, Claude, Agents paths."""
-    if getattr(settings, "skills_dirs", None):
-        return [Path(d).expanduser().resolve() for d in settings.skills_dirs]
-    return [
-        Path.home() / ".basket" / "skills",
-        Path.cwd() / ".basket" / "skills",
-        Path.home() / ".config" / "opencode" / "skills",
-        Path.cwd() / ".opencode" / "skills",
-        Path.home() / ".claude" / "skills",
-        Path.cwd() / ".claude" / "skills",
-        Path.home() / ".agents" / "skills",
-        Path.cwd() / ".agents" / "skills",
-    ]
+    return _resolve_dirs(getattr(settings, "skills_dirs", None), _DEFAULT_SKILLS_DIRS)
 
 
 def get_system_prompt_base() -> str:
@@ -81,16 +119,31 @@ Your response must include:
 """
 
 
+@functools.lru_cache(maxsize=32)
+def _compose_system_prompt(
+    base: str, skill_id: Optional[str], full: str, plan_mode: bool
+) -> str:
+    """Base prompt plus active-skill section and plan-mode suffix.
+
+    Cached so repeated runs with the same skill reuse one string; the base and
+    skill content are themselves cached objects, so the key hashes are precomputed.
+    """
+    prompt = base
+    if skill_id and full:
+        prompt = prompt + "\n\n---\n\n## Active skill: " + skill_id + "\n\n" + full
+    if plan_mode:
+        prompt = prompt + get_plan_mode_prompt_suffix()
+    return prompt
+
+
 def get_system_prompt_for_run(
     agent: Any, invoked_skill_id: Optional[str] = None
 ) -> str:
     """System prompt for this run; if invoked_skill_id set, append that skill's full content."""
-    prompt = agent._default_system_prompt
+    full = ""
     if invoked_skill_id:
-        dirs = get_skills_dirs(agent.settings)
-        full = get_skill_full_content(invoked_skill_id, dirs)
-        if full:
-            prompt = prompt + "\n\n---\n\n## Active skill: " + invoked_skill_id + "\n\n" + full
-    if agent._plan_mode:
-        prompt = prompt + get_plan_mode_prompt_suffix()
-    return prompt
+        # Probes <dir>/<id>/SKILL.md; the loader re-reads it only when mtime or size changed
+        full = get_skill_full_content(invoked_skill_id, list(skills_dirs_for(agent)))
+    return _compose_system_prompt(
+        agent._default_system_prompt, invoked_skill_id, full, bool(agent._plan_mode)
+    )
@@ -1,15 +1,145 @@
 """Interactive REPL, run_once, todo block format, help/settings print."""
 
-import copy
+import asyncio
 import logging
-import time
+import signal
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Optional
 
 from basket_ai.types import UserMessage
 
+from ..core.messages_io import now_ms
+
 logger = logging.getLogger(__name__)
 
+# Sentinel returned by a built-in command handler to leave the REPL loop
+_BREAK = object()
+
+# Static help text and settings layout, built once; written with a single stdout write
+_HELP_TEXT = """
+Available commands:
+  help      - Show this help message
+  settings  - Show current settings
+  /todos    - Toggle full/compact todo list above prompt
+  /plan     - Toggle plan mode (read-only analysis and planning); /plan on, /plan off
+  /sessions - List all sessions (id, created_at, model, message count)
+  /open <session_id> - Switch to a session and load its history
+  exit/quit - Exit the program
+  /skill <id> - Load full instructions for a skill for this turn (e.g. /skill refactor)
+
+Available tools:
+  read      - Read files
+  write     - Write files
+  edit      - Edit files with exact string replacement
+  bash      - Execute shell commands
+  grep      - Search for patterns in files
+
+Example prompts:
+  "Read the README.md file"
+  "Create a new file hello.py with a hello world function"
+  "Search for 'TODO' in all Python files"
+  "Run the tests using pytest"
+
+"""
+
+_SETTINGS_TEMPLATE = """
+Current settings:
+  Model: {provider} / {model_id}
+  Temperature: {temperature}
+  Max tokens: {max_tokens}
+  Max turns: {max_turns}
+  Verbose: {verbose}
+  Sessions dir: {sessions_dir}
+
+"""
+
+
+async def _cmd_exit(agent, lowered: str):
+    print("Goodbye!")
+    return _BREAK
+
+
+async def _cmd_help(agent, lowered: str):
+    print_help(agent)
+
+
+async def _cmd_settings(agent, lowered: str):
+    print_settings(agent)
+
+
+async def _cmd_todos(agent, lowered: str):
+    agent._todo_show_full = not agent._todo_show_full
+    print(
+        f"Todo list: {'full' if agent._todo_show_full else 'compact'}",
+        flush=True,
+    )
+
+
+async def _cmd_plan(agent, lowered: str):
+    on = lowered != "/plan off"
+    agent.set_plan_mode(on)
+    print(f"Plan mode {'on' if on else 'off'}", flush=True)
+
+
+async def _cmd_sessions(agent, lowered: str):
+    sessions = await agent.session_manager.list_sessions()
+    if not sessions:
+        print("No sessions yet.")
+    else:
+        for m in sessions:
+            print(
+                f"  {m.session_id}  created={m.created_at}  model={m.model_id}  messages={m.total_messages}"
+            )
+
+
+# Exact-match built-in commands, keyed by the lowercased (stripped) input line.
+# Prefix commands (/open, /skill, extension /xxx) are handled in the loop.
+_COMMANDS = {
+    "exit": _cmd_exit,
+    "quit": _cmd_exit,
+    "help": _cmd_help,
+    "settings": _cmd_settings,
+    "/todos": _cmd_todos,
+    "/plan": _cmd_plan,
+    "/plan on": _cmd_plan,
+    "/plan off": _cmd_plan,
+    "/sessions": _cmd_sessions,
+}
+
+
+async def _await_input(pending: asyncio.Future) -> str:
+    """
+    Wait for a pending input() call with the REPL's own SIGINT handler installed.
+
+    Ctrl+C raises KeyboardInterrupt here and leaves the read pending, so the next
+    wait picks up the same line. The previous SIGINT handler (asyncio.run's, which
+    cancels the main task) is restored before returning, so Ctrl+C during a turn
+    behaves as before. Where loop signal handlers are unsupported the wait is plain.
+    """
+    loop = asyncio.get_running_loop()
+    interrupted = loop.create_future()
+
+    def on_sigint() -> None:
+        if not interrupted.done():
+            interrupted.set_result(None)
+
+    previous = signal.getsignal(signal.SIGINT)
+    try:
+        loop.add_signal_handler(signal.SIGINT, on_sigint)
+    except (NotImplementedError, RuntimeError, ValueError):
+        return await pending
+    try:
+        await asyncio.wait((pending, interrupted), return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        loop.remove_signal_handler(signal.SIGINT)
+        if previous is not None:
+            signal.signal(signal.SIGINT, previous)
+    if not pending.done():
+        raise KeyboardInterrupt
+    return pending.result()
+
 
 async def run_interactive(agent) -> None:
     """
@@ -24,59 +154,57 @@ async def run_interactive(agent) -> None:
     print("Type 'exit' or 'quit' to quit, 'help' for help")
     print("-" * 50)
 
-    while True:
-        try:
-            if agent._current_todos:
-                block = format_todo_block(agent)
-                if block:
-                    print(block, flush=True)
-            user_input = input("\n> ").strip()
+    # input() runs on one worker thread so the loop keeps serving background tasks
+    # while the user types
+    input_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="basket-input")
+    try:
+        await _repl_loop(agent, input_executor)
+    finally:
+        input_executor.shutdown(wait=False, cancel_futures=True)
 
-            if not user_input:
-                continue
 
-            if user_input.lower() in ["exit", "quit"]:
-                print("Goodbye!")
+async def _repl_loop(agent, input_executor: ThreadPoolExecutor) -> None:
+    """Prompt, dispatch and run turns until exit/quit or EOF."""
+    loop = asyncio.get_running_loop()
+    # Read in flight; kept across a Ctrl+C so no second reader competes for stdin
+    pending: Optional[asyncio.Future] = None
+    while True:
+        try:
+            if pending is None:
+                if agent._current_todos:
+                    block = format_todo_block(agent)
+                    if block:
+                        print(block, flush=True)
+                pending = loop.run_in_executor(input_executor, input, "\n> ")
+            try:
+                line = await _await_input(pending)
+            except EOFError:
+                print("\nGoodbye!")
                 break
+            finally:
+                if pending.done():
+                    pending = None
+            user_input = line.strip()
 
-            if user_input.lower() == "help":
-                print_help(agent)
-                continue
-
-            if user_input.lower() == "settings":
-                print_settings(agent)
-                continue
-
-            if user_input.lower() == "/todos":
-                agent._todo_show_full = not agent._todo_show_full
-                print(
-                    f"Todo list: {'full' if agent._todo_show_full else 'compact'}",
-                    flush=True,
-                )
+            if not user_input:
                 continue
 
-            if user_input.strip().lower() in ("/plan", "/plan on", "/plan off"):
-                on = user_input.strip().lower() != "/plan off"
-                agent.set_plan_mode(on)
-                print(f"Plan mode {'on' if on else 'off'}", flush=True)
+            lowered = user_input.lower()
+            handler = _COMMANDS.get(lowered)
+            if handler is not None:
+                if await handler(agent, lowered) is _BREAK:
+                    break
                 continue
 
-            if user_input.strip().lower() == "/sessions":
-                sessions = await agent.session_manager.list_sessions()
-                if not sessions:
-                    print("No sessions yet.")
-                else:
-                    for m in sessions:
-                        print(
-                            f"  {m.session_id}  created={m.created_at}  model={m.model_id}  messages={m.total_messages}"
-                        )
-                continue
+            # Slash input: split into command and args once for /open, /skill and extensions
+            command = args = command_key = ""
+            if user_input[:1] == "/":
+                command, *rest = user_input.split(maxsplit=1)
+                args = rest[0] if rest else ""
+                command_key = command.lower()
 
-            if user_input.strip().lower().startswith("/open "):
-                session_id = user_input.split(maxsplit=1)[1].strip()
-                if not session_id:
-                    print("Usage: /open <session_id>")
-                    continue
+            if command_key == "/open" and args:
+                session_id = args
                 sessions = await agent.session_manager.list_sessions()
                 if not any(s.session_id == session_id for s in sessions):
                     print(f"Session not found: {session_id}")
@@ -106,21 +234,16 @@ async def run_interactive(agent) -> None:
             invoked_skill_id = None
             message_content = user_input
 
-            if user_input.strip().lower().startswith("/skill "):
-                parts = user_input.split(maxsplit=2)
-                if len(parts) < 2:
+            if command_key == "/skill":
+                if not args:
                     print("Usage: /skill <id> [your message]")
                     continue
-                invoked_skill_id = parts[1].strip()
-                message_content = parts[2].strip() if len(parts) > 2 else ""
+                invoked_skill_id, *rest = args.split(maxsplit=1)
+                message_content = rest[0] if rest else ""
                 if not message_content:
                     message_content = "Please help according to the active skill instructions."
 
-            elif user_input.startswith("/"):
-                command_parts = user_input.split(maxsplit=1)
-                command = command_parts[0]
-                args = command_parts[1] if len(command_parts) > 1 else ""
-
+            elif command:
                 if agent.extension_loader.extension_api.execute_command(command, args):
                     continue
                 else:
@@ -132,20 +255,24 @@ async def run_interactive(agent) -> None:
 
             n_before = len(agent.context.messages)
 
+            # Content is a plain str from the prompt: skip pydantic validation
             agent.context.messages.append(
-                UserMessage(
+                UserMessage.model_construct(
                     role="user",
                     content=message_content,
-                    timestamp=int(time.time() * 1000),
+                    timestamp=now_ms(),
                 )
             )
 
-            messages_snapshot = copy.deepcopy(agent.context.messages)
+            # Roll back by truncation: a failed run only appends after this point
+            n_kept = len(agent.context.messages)
 
             print()
             try:
                 await agent._run_with_trajectory_if_enabled(
-                    stream_llm_events=True, invoked_skill_id=invoked_skill_id
+                    stream_llm_events=True,
+                    invoked_skill_id=invoked_skill_id,
+                    last_user_text=message_content,
                 )
                 if agent._session_id:
                     new_messages = agent.context.messages[n_before:]
@@ -176,7 +303,7 @@ async def run_interactive(agent) -> None:
                             )
             except Exception as agent_error:
                 logger.exception("Agent run failed")
-                agent.context.messages = messages_snapshot
+                del agent.context.messages[n_kept:]
                 raise agent_error
             print()
 
@@ -201,13 +328,13 @@ async def run_once(
     Returns agent response text.
     """
     agent.context.messages.append(
-        UserMessage(
-            role="user", content=message, timestamp=int(time.time() * 1000)
-        )
+        UserMessage.model_construct(role="user", content=message, timestamp=now_ms())
     )
 
     state = await agent._run_with_trajectory_if_enabled(
-        stream_llm_events=False, invoked_skill_id=invoked_skill_id
+        stream_llm_events=False,
+        invoked_skill_id=invoked_skill_id,
+        last_user_text=message,
     )
 
     last_message = state.context.messages[-1]
@@ -252,44 +379,20 @@ def format_todo_block(agent) -> str:
 
 def print_help(agent) -> None:
     """Print help information."""
-    print(
-        """
-Available commands:
-  help      - Show this help message
-  settings  - Show current settings
-  /todos    - Toggle full/compact todo list above prompt
-  /plan     - Toggle plan mode (read-only analysis and planning); /plan on, /plan off
-  /sessions - List all sessions (id, created_at, model, message count)
-  /open <session_id> - Switch to a session and load its history
-  exit/quit - Exit the program
-  /skill <id> - Load full instructions for a skill for this turn (e.g. /skill refactor)
-
-Available tools:
-  read      - Read files
-  write     - Write files
-  edit      - Edit files with exact string replacement
-  bash      - Execute shell commands
-  grep      - Search for patterns in files
-
-Example prompts:
-  "Read the README.md file"
-  "Create a new file hello.py with a hello world function"
-  "Search for 'TODO' in all Python files"
-  "Run the tests using pytest"
-"""
-    )
+    sys.stdout.write(_HELP_TEXT)
 
 
 def print_settings(agent) -> None:
     """Print current settings."""
-    print(
-        f"""
-Current settings:
-  Model: {agent.settings.model.provider} / {agent.settings.model.model_id}
-  Temperature: {agent.settings.model.temperature}
-  Max tokens: {agent.settings.model.max_tokens}
-  Max turns: {agent.settings.agent.max_turns}
-  Verbose: {agent.settings.agent.verbose}
-  Sessions dir: {agent.settings.sessions_dir}
-"""
+    settings = agent.settings
+    sys.stdout.write(
+        _SETTINGS_TEMPLATE.format(
+            provider=settings.model.provider,
+            model_id=settings.model.model_id,
+            temperature=settings.model.temperature,
+            max_tokens=settings.model.max_tokens,
+            max_turns=settings.agent.max_turns,
+            verbose=settings.agent.verbose,
+            sessions_dir=settings.sessions_dir,
+        )
     )
@@ -6,6 +6,8 @@ from typing import Any, Optional
 
 from basket_ai.types import TextContent
 
+from ..tools import flush_todo_saves
+
 logger = logging.getLogger(__name__)
 
 
@@ -17,6 +19,7 @@ async def set_session_id(
     When session_id is non-empty and load_history is True, load messages into context.messages.
     When session_id is None, clear _session_id, _current_todos, _pending_asks, and context.messages.
     """
+    await flush_todo_saves(agent)
     agent._session_id = session_id
     if session_id:
         agent._current_todos = await agent.session_manager.load_todos(session_id)
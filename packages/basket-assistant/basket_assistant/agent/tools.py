@@ -1,14 +1,14 @@
 """Tool list, subagent filter/run, hook wrapper, and tool registration."""
 
-import time
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Tuple
 
 from basket_agent import Agent
 from basket_ai.api import get_model
 from basket_ai.types import Context, UserMessage
 
-from ..core import SubAgentConfig
+from ..core import SubAgentConfig, get_skills_fingerprint
+from ..core.messages_io import now_ms
 from ..extensions.api import _wrap_tool_execute_with_hooks
 from ..tools import (
     BUILT_IN_TOOLS,
@@ -44,60 +44,116 @@ def get_registerable_tools(agent: Any) -> List[dict]:
     if include is not None and len(agent.settings.skills_include) == 0:
         include = None
     skill_tool = create_skill_tool(
-        lambda: prompts.get_skills_dirs(agent.settings), include
+        lambda: list(prompts.skills_dirs_for(agent)), include
     )
     return list(BUILT_IN_TOOLS) + [skill_tool]
 
 
-def filter_tools_for_subagent(agent: Any, cfg: SubAgentConfig) -> List[dict]:
+def _registerable_tools_cached(agent: Any) -> Tuple[dict, ...]:
+    """
+    Registerable tools shared by every subagent spawn. Rebuilt (re-reading the skills
+    index for the skill tool description) only when a SKILL.md file changes.
+    """
+    key = get_skills_fingerprint(list(prompts.skills_dirs_for(agent)))
+    tools = agent._registerable_tools
+    if tools is None or agent._registerable_tools_key != key:
+        tools = agent._registerable_tools = tuple(get_registerable_tools(agent))
+        agent._registerable_tools_key = key
+        agent._subagent_tools_cache.clear()
+    return tools
+
+
+def filter_tools_for_subagent(agent: Any, cfg: SubAgentConfig) -> Tuple[dict, ...]:
     """Return tool dicts allowed for this subagent; cfg.tools None = all."""
-    tools = get_registerable_tools(agent)
+    tools = _registerable_tools_cached(agent)
     if cfg.tools is None:
         return tools
-    return [t for t in tools if cfg.tools.get(t["name"], False)]
+    allowed = frozenset(name for name, enabled in cfg.tools.items() if enabled)
+    filtered = agent._subagent_tools_cache.get(allowed)
+    if filtered is None:
+        filtered = tuple(t for t in tools if t["name"] in allowed)
+        agent._subagent_tools_cache[allowed] = filtered
+    return filtered
+
+
+def subagent_model(agent: Any, provider: str, model_id: str) -> Any:
+    """Model for a subagent, created once per (provider, model_id) and then reused."""
+    key = (provider, model_id)
+    model = agent._subagent_models.get(key)
+    if model is None:
+        model = agent._subagent_models[key] = get_model(
+            provider, model_id, **agent._base_model_kwargs
+        )
+    return model
 
 
-async def run_subagent(agent: Any, subagent_name: str, user_prompt: str) -> str:
-    """Run a subagent with the given prompt; returns last assistant text."""
-    configs = prompts.get_subagent_configs(agent)
-    cfg = configs.get(subagent_name)
-    if not cfg:
-        available = ", ".join(configs) if configs else "none"
-        return f'SubAgent "{subagent_name}" not found. Available: {available}'
-
+def _build_subagent(agent: Any, cfg: SubAgentConfig, tools: Tuple[dict, ...]) -> Agent:
+    """Create a subagent Agent for cfg with its model and allowed tools registered."""
     if cfg.model and isinstance(cfg.model, dict):
-        model_kwargs: dict = {}
-        if agent.settings.model.base_url:
-            model_kwargs["base_url"] = agent.settings.model.base_url
-        model = get_model(
+        model = subagent_model(
+            agent,
             cfg.model.get("provider", agent.settings.model.provider),
             cfg.model.get("model_id", agent.settings.model.model_id),
-            **model_kwargs,
         )
     else:
         model = agent.model
 
-    context = Context(
-        systemPrompt=cfg.prompt,
-        messages=[
-            UserMessage(
-                role="user",
-                content=user_prompt,
-                timestamp=int(time.time() * 1000),
-            )
-        ],
-    )
-    sub_agent = Agent(model, context)
-    sub_agent.max_turns = agent.settings.agent.max_turns
-    for t in filter_tools_for_subagent(agent, cfg):
+    sub_agent = Agent(model, Context(systemPrompt=cfg.prompt, messages=[]))
+    for t in tools:
         sub_agent.register_tool(
             name=t["name"],
             description=t["description"],
             parameters=t["parameters"],
             execute_fn=t["execute_fn"],
         )
+    return sub_agent
+
+
+def _acquire_subagent(agent: Any, subagent_name: str, cfg: SubAgentConfig) -> Agent:
+    """
+    Return the pooled Agent for subagent_name, building (and pooling) it when missing
+    or when its config / tool list changed. A subagent that is already running gets a
+    fresh unpooled Agent so concurrent task calls do not share a context.
+    """
+    tools = filter_tools_for_subagent(agent, cfg)
+    if subagent_name in agent._subagents_running:
+        return _build_subagent(agent, cfg, tools)
+    pooled = agent._subagent_pool.get(subagent_name)
+    if pooled is not None and pooled[1] is tools and pooled[0] == cfg:
+        return pooled[2]
+    sub_agent = _build_subagent(agent, cfg, tools)
+    agent._subagent_pool[subagent_name] = (cfg, tools, sub_agent)
+    return sub_agent
+
+
+async def run_subagent(agent: Any, subagent_name: str, user_prompt: str) -> str:
+    """Run a subagent with the given prompt; returns last assistant text."""
+    configs = prompts.get_subagent_configs(agent)
+    cfg = configs.get(subagent_name)
+    if not cfg:
+        available = ", ".join(configs) if configs else "none"
+        return f'SubAgent "{subagent_name}" not found. Available: {available}'
+
+    sub_agent = _acquire_subagent(agent, subagent_name, cfg)
+    sub_agent.context.system_prompt = cfg.prompt
+    sub_agent.context.messages = [
+        UserMessage(
+            role="user",
+            content=user_prompt,
+            timestamp=now_ms(),
+        )
+    ]
+    sub_agent.max_turns = agent.settings.agent.max_turns
 
-    state = await sub_agent.run(stream_llm_events=False)
+    pooled = agent._subagent_pool.get(subagent_name)
+    owns_pool_entry = pooled is not None and pooled[2] is sub_agent
+    if owns_pool_entry:
+        agent._subagents_running.add(subagent_name)
+    try:
+        state = await sub_agent.run(stream_llm_events=False)
+    finally:
+        if owns_pool_entry:
+            agent._subagents_running.discard(subagent_name)
 
     for msg in reversed(state.context.messages):
         if getattr(msg, "role", None) == "assistant" and hasattr(msg, "content"):
@@ -143,7 +199,7 @@ def register_tools(agent: Any) -> None:
     if include is not None and len(agent.settings.skills_include) == 0:
         include = None
     skill_tool = create_skill_tool(
-        lambda: prompts.get_skills_dirs(agent.settings), include
+        lambda: list(prompts.skills_dirs_for(agent)), include
     )
     fn = wrap_tool_with_hooks(agent, skill_tool["name"], skill_tool["execute_fn"])
     agent.agent.register_tool(
@@ -6,7 +6,12 @@ from .messages import MessageTree, MessageTreeNode
 from .session_manager import SessionEntry, SessionManager, SessionMetadata
 from .agents_loader import load_agents_from_dirs
 from .settings import AgentSettings, ModelSettings, Settings, SettingsManager, SubAgentConfig
-from .skills_loader import get_skill_base_dir, get_skill_full_content, get_skills_index
+from .skills_loader import (
+    get_skill_base_dir,
+    get_skill_full_content,
+    get_skills_fingerprint,
+    get_skills_index,
+)
 from .theme import Theme, ThemeColors, ThemeManager
 
 __all__ = [
@@ -32,5 +37,6 @@ __all__ = [
     # Skills
     "get_skill_base_dir",
     "get_skill_full_content",
+    "get_skills_fingerprint",
     "get_skills_index",
 ]
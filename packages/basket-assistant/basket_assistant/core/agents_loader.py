@@ -3,32 +3,37 @@ Load subagent configs from .basket/agents/*.md (YAML frontmatter + body).
 """
 
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from .settings import SubAgentConfig
 
 logger = logging.getLogger(__name__)
 
+# "key: value" frontmatter line (compiled once)
+_FM_KEY_RE = re.compile(r"(\w+)\s*:\s*(.*)")
+
 
 def _parse_frontmatter_and_body(text: str) -> tuple[Dict[str, Any], str]:
     """Parse YAML-like frontmatter and body. Returns (frontmatter_dict, body)."""
     text = text.strip()
     if not text.startswith("---"):
         return {}, text
-    parts = text.split("---", 2)
-    if len(parts) < 3:
+    end = text.find("---", 3)
+    if end == -1:
         return {}, text
-    fm_block = parts[1].strip()
-    body = parts[2].strip()
+    fm_block = text[3:end].strip()
+    body = text[end + 3 :].strip()
 
     fm: Dict[str, Any] = {}
     current_key: Optional[str] = None
     current_value: List[str] = []
 
     for line in fm_block.splitlines():
-        m = re.match(r"^(\w+)\s*:\s*(.*)$", line)
+        m = _FM_KEY_RE.match(line)
         if m:
             if current_key:
                 fm[current_key] = "\n".join(current_value).strip().strip("'\"").strip()
@@ -80,39 +85,111 @@ def _parse_frontmatter_and_body(text: str) -> tuple[Dict[str, Any], str]:
     return fm, body
 
 
+# Worker threads for parsing changed agent files
+_READ_WORKERS = 8
+# Agent file path -> (st_mtime_ns, st_size, config or None when the file is skipped).
+# Bounded, oldest evicted first.
+_FILE_CACHE_MAX = 256
+_file_cache: Dict[Path, Tuple[int, int, Optional[SubAgentConfig]]] = {}
+
+
+def _agent_files(directory: Path) -> List[Tuple[str, Path, int, int]]:
+    """
+    (name, path, st_mtime_ns, st_size) for each *.md file in directory not starting
+    with '_'; one scandir, no glob.
+    """
+    try:
+        it = os.scandir(directory)
+    except OSError:  # missing or not a directory
+        return []
+    found: List[Tuple[str, Path, int, int]] = []
+    with it:
+        for entry in it:
+            entry_name = entry.name
+            if not entry_name.endswith(".md") or entry_name.startswith("_"):
+                continue
+            try:
+                if not entry.is_file():
+                    continue
+                st = entry.stat()
+            except OSError:
+                continue
+            found.append((entry_name[:-3], Path(entry.path), st.st_mtime_ns, st.st_size))
+    return found
+
+
+def _parse_agent_file(path: Path) -> Optional[SubAgentConfig]:
+    """SubAgentConfig for one agent file, or None if it cannot be read or has no prompt."""
+    try:
+        raw = path.read_text(encoding="utf-8")
+    except Exception as e:
+        logger.warning("Failed to read agent file %s: %s", path, e)
+        return None
+    fm, body = _parse_frontmatter_and_body(raw)
+    description = fm.get("description") or (body.split("\n\n")[0][:200] if body else "(no description)")
+    prompt = fm.get("prompt") or body.strip() or ""
+    if not prompt:
+        logger.warning("Agent %s: missing prompt and empty body, skipping", path)
+        return None
+    model = fm.get("model") if isinstance(fm.get("model"), dict) else None
+    tools = fm.get("tools") if isinstance(fm.get("tools"), dict) else None
+    return SubAgentConfig(
+        description=description,
+        prompt=prompt,
+        model=model,
+        tools=tools,
+    )
+
+
+def _cached_agent_file(
+    path: Path, mtime_ns: int, size: int
+) -> Tuple[bool, Optional[SubAgentConfig]]:
+    """(True, config) when path is cached for this mtime/size, else (False, None)."""
+    cached = _file_cache.get(path)
+    if cached is not None and cached[0] == mtime_ns and cached[1] == size:
+        return True, cached[2]
+    return False, None
+
+
+def _remember_agent_file(
+    path: Path, mtime_ns: int, size: int, config: Optional[SubAgentConfig]
+) -> None:
+    if path not in _file_cache and len(_file_cache) >= _FILE_CACHE_MAX:
+        del _file_cache[next(iter(_file_cache))]  # evict the oldest entry
+    _file_cache[path] = (mtime_ns, size, config)
+
+
 def load_agents_from_dirs(dirs: List[Path]) -> Dict[str, SubAgentConfig]:
     """
     Scan dirs for *.md files; filename stem = agent name.
     Parse frontmatter (description required, prompt/model/tools optional) + body.
     Body is used as prompt when frontmatter has no 'prompt'.
     Later dirs override earlier for same name.
+    Unchanged files (same mtime and size) are not re-read; changed ones are read on a
+    small thread pool when there are several.
     """
+    files = [f for d in dirs for f in _agent_files(d.expanduser().resolve())]
+    configs: List[Optional[SubAgentConfig]] = []
+    misses: List[int] = []
+    for i, (_, path, mtime_ns, size) in enumerate(files):
+        hit, config = _cached_agent_file(path, mtime_ns, size)
+        configs.append(config)
+        if not hit:
+            misses.append(i)
+    if len(misses) > 1:
+        # Parse on worker threads; the cache is only updated on this thread
+        with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(misses))) as pool:
+            parsed = list(pool.map(lambda i: _parse_agent_file(files[i][1]), misses))
+    else:
+        parsed = [_parse_agent_file(files[i][1]) for i in misses]
+    for i, config in zip(misses, parsed):
+        _, path, mtime_ns, size = files[i]
+        _remember_agent_file(path, mtime_ns, size, config)
+        configs[i] = config
+
+    # Applied in dir order, so later dirs still override earlier ones
     result: Dict[str, SubAgentConfig] = {}
-    for d in dirs:
-        expanded = d.expanduser().resolve()
-        if not expanded.exists() or not expanded.is_dir():
-            continue
-        for path in expanded.glob("*.md"):
-            if path.name.startswith("_"):
-                continue
-            name = path.stem
-            try:
-                raw = path.read_text(encoding="utf-8")
-            except Exception as e:
-                logger.warning("Failed to read agent file %s: %s", path, e)
-                continue
-            fm, body = _parse_frontmatter_and_body(raw)
-            description = fm.get("description") or (body.split("\n\n")[0][:200] if body else "(no description)")
-            prompt = fm.get("prompt") or body.strip() or ""
-            if not prompt:
-                logger.warning("Agent %s: missing prompt and empty body, skipping", path)
-                continue
-            model = fm.get("model") if isinstance(fm.get("model"), dict) else None
-            tools = fm.get("tools") if isinstance(fm.get("tools"), dict) else None
-            result[name] = SubAgentConfig(
-                description=description,
-                prompt=prompt,
-                model=model,
-                tools=tools,
-            )
+    for (name, _, _, _), config in zip(files, configs):
+        if config is not None:
+            result[name] = config
     return result
@@ -5,6 +5,7 @@ SessionEntry.data format: {"role": "user"|"assistant"|"toolResult", "payload": <
 Payload uses model_dump(mode="json") so aliases (toolCallId, toolName, etc.) round-trip.
 """
 
+import time
 from typing import Any, Dict, List, Union
 
 from basket_ai.types import (
@@ -15,6 +16,11 @@ from basket_ai.types import (
 )
 
 
+def now_ms() -> int:
+    """Current time as integer Unix milliseconds (message and entry timestamps)."""
+    return time.time_ns() // 1_000_000
+
+
 def message_to_entry_data(message: Message) -> Dict[str, Any]:
     """
     Convert a Message to SessionEntry.data dict.
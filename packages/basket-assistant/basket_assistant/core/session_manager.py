@@ -9,7 +9,6 @@ import asyncio
 import json
 import logging
 import uuid
-import time
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -18,7 +17,7 @@ from pydantic import BaseModel, Field
 
 from basket_ai.types import Message
 
-from .messages_io import entry_data_to_message_safe, message_to_entry_data
+from .messages_io import entry_data_to_message_safe, message_to_entry_data, now_ms
 
 logger = logging.getLogger(__name__)
 
@@ -162,7 +161,7 @@ class SessionManager:
             Session ID
         """
         session_id = str(uuid.uuid4())
-        timestamp = int(time.time() * 1000)
+        timestamp = now_ms()
 
         # Create initial metadata entry
         metadata = SessionMetadata(
@@ -196,7 +195,7 @@ class SessionManager:
         path = self._get_session_path(session_id)
         if path.exists():
             return
-        timestamp = int(time.time() * 1000)
+        timestamp = now_ms()
         metadata = SessionMetadata(
             session_id=session_id,
             created_at=timestamp,
@@ -260,7 +259,7 @@ class SessionManager:
         for msg in messages:
             ts = getattr(msg, "timestamp", None)
             if ts is None:
-                ts = int(time.time() * 1000)
+                ts = now_ms()
             data = message_to_entry_data(msg)
             entry = SessionEntry(
                 timestamp=ts,
@@ -366,7 +365,7 @@ class SessionManager:
         for key, value in updates.items():
             setattr(metadata, key, value)
 
-        metadata.updated_at = int(time.time() * 1000)
+        metadata.updated_at = now_ms()
 
         # Append new metadata entry
         entry = SessionEntry(
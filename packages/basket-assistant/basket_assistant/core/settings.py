@@ -62,6 +62,7 @@ class Settings(BaseModel):
     api_keys: Dict[str, str] = Field(default_factory=dict)
     sessions_dir: str = "~/.basket/sessions"
     trajectory_dir: Optional[str] = "~/.basket/trajectories"  # Record task trajectories for RL/tuning; set to null/empty to disable
+    trajectory_events: bool = False  # Also stream raw agent events to task_<id>.events.jsonl under trajectory_dir
     skills_dirs: List[str] = Field(default_factory=list)  # Empty => use ~/.basket/skills and ./.basket/skills
     skills_include: List[str] = Field(default_factory=list)  # Empty => load all; else only these skill ids
     agents: Dict[str, SubAgentConfig] = Field(default_factory=dict)  # Subagents for Task tool
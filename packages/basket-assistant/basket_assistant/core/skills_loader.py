@@ -3,9 +3,12 @@ Skill loader: scan directories for OpenCode-style skills (one dir per skill with
 """
 
 import logging
+import os
 import re
+import stat
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +16,9 @@ logger = logging.getLogger(__name__)
 _NAME_RE = re.compile(r"^[a-z0-9]+(-[a-z0-9]+)*$")
 _NAME_MAX_LEN = 64
 _DESCRIPTION_MAX_LEN = 1024
+# Frontmatter keys (compiled once; lines are prefix-checked before matching)
+_FM_NAME_RE = re.compile(r"name\s*:\s*(.+)", re.IGNORECASE)
+_FM_DESCRIPTION_RE = re.compile(r"description\s*:\s*(.+)", re.IGNORECASE)
 
 
 def _parse_frontmatter_and_body(text: str) -> Tuple[Optional[str], Optional[str], str]:
@@ -20,80 +26,262 @@ def _parse_frontmatter_and_body(text: str) -> Tuple[Optional[str], Optional[str]
     text = text.strip()
     if not text.startswith("---"):
         return None, None, text
-    parts = text.split("---", 2)
-    if len(parts) < 3:
+    end = text.find("---", 3)
+    if end == -1:
         return None, None, text
-    fm, body = parts[1].strip(), parts[2].strip()
+    fm, body = text[3:end].strip(), text[end + 3 :].strip()
     name_val: Optional[str] = None
     desc_val: Optional[str] = None
     for line in fm.splitlines():
-        m = re.match(r"name\s*:\s*(.+)", line, re.IGNORECASE)
-        if m:
-            name_val = m.group(1).strip().strip("'\"").strip()
-            continue
-        m = re.match(r"description\s*:\s*(.+)", line, re.IGNORECASE)
-        if m:
-            desc_val = m.group(1).strip().strip("'\"").strip()
+        # Cheap prefix check first: most frontmatter lines are neither key
+        if line[:4].lower() == "name":
+            m = _FM_NAME_RE.match(line)
+            if m:
+                name_val = m.group(1).strip().strip("'\"").strip()
+        elif line[:11].lower() == "description":
+            m = _FM_DESCRIPTION_RE.match(line)
+            if m:
+                desc_val = m.group(1).strip().strip("'\"").strip()
     return name_val, desc_val, body
 
 
-def _collect_skill_entries(dirs: List[Path], include_ids: Optional[List[str]] = None) -> List[Tuple[str, str, Path]]:
+# (subdir name, path to SKILL.md, st_mtime_ns, st_size)
+_SkillFile = Tuple[str, Path, int, int]
+
+# (dirs, include_ids) -> (files fingerprint, entries); entries are rebuilt when any SKILL.md
+# is added, removed or modified
+_entries_cache: Dict[Tuple, Tuple[Tuple[_SkillFile, ...], List[Tuple[str, str, Path]]]] = {}
+
+# SKILL.md path -> (st_mtime_ns, st_size, (name, description, body)); body is None until
+# the full file has been read. Bounded, oldest evicted first.
+_FILE_CACHE_MAX = 256
+_file_cache: Dict[Path, Tuple[int, int, Tuple[Optional[str], Optional[str], Optional[str]]]] = {}
+# Index builds read this many bytes first; the rest only if the frontmatter is longer
+_HEAD_BYTES = 4096
+# Worker threads for reading uncached skill files during an index build
+_READ_WORKERS = 8
+
+
+def _abs_dir(d: Path) -> Path:
     """
-    Scan dirs for OpenCode layout: each skills_dir has subdirs with SKILL.md.
-    Return [(skill_name, description, path_to_skill_md)], later dir overwrites earlier for same name.
+    d as an absolute path. Callers normally pass dirs already resolved once per settings
+    (agent.prompts.skills_dirs_for), so only relative or ~ paths pay for expanduser/resolve.
     """
-    seen: dict[str, Tuple[str, Path]] = {}  # name -> (description, path)
+    return d if d.is_absolute() else d.expanduser().resolve()
+
+
+def _scan_skill_files(dirs: List[Path]) -> Tuple[_SkillFile, ...]:
+    """Stat every */SKILL.md under dirs (one scandir per dir), in dir order."""
+    found: List[_SkillFile] = []
     for d in dirs:
-        expanded = d.expanduser().resolve()
-        if not expanded.exists() or not expanded.is_dir():
+        try:
+            it = os.scandir(_abs_dir(d))
+        except OSError:  # missing or not a directory
             continue
-        for subdir in expanded.iterdir():
-            if not subdir.is_dir():
-                continue
-            skill_md = subdir / "SKILL.md"
-            if not skill_md.is_file():
-                continue
-            try:
-                raw = skill_md.read_text(encoding="utf-8")
-            except Exception as e:
-                logger.warning("Failed to read skill file %s: %s", skill_md, e)
-                continue
-            name_fm, desc_fm, _ = _parse_frontmatter_and_body(raw)
-            if not name_fm or not desc_fm:
-                logger.warning(
-                    "Skill %s: missing required frontmatter 'name' or 'description', skipping",
-                    skill_md,
-                )
-                continue
-            if len(desc_fm) > _DESCRIPTION_MAX_LEN:
-                logger.warning(
-                    "Skill %s: description longer than %d chars, skipping",
-                    skill_md,
-                    _DESCRIPTION_MAX_LEN,
-                )
-                continue
-            if not _NAME_RE.match(name_fm) or len(name_fm) > _NAME_MAX_LEN:
-                logger.warning(
-                    "Skill %s: name must match ^[a-z0-9]+(-[a-z0-9]+)*$ and be 1-%d chars, got %r, skipping",
-                    skill_md,
-                    _NAME_MAX_LEN,
-                    name_fm,
-                )
-                continue
-            if name_fm != subdir.name:
-                logger.warning(
-                    "Skill %s: frontmatter name %r does not match directory name %r, skipping",
-                    skill_md,
-                    name_fm,
-                    subdir.name,
-                )
-                continue
-            if include_ids is not None and len(include_ids) > 0 and name_fm not in include_ids:
-                continue
-            seen[name_fm] = (desc_fm, skill_md)
+        with it:
+            for entry in it:
+                if not entry.is_dir():
+                    continue
+                skill_md = os.path.join(entry.path, "SKILL.md")
+                try:
+                    st = os.stat(skill_md)
+                except OSError:
+                    continue
+                if stat.S_ISREG(st.st_mode):
+                    found.append((entry.name, Path(skill_md), st.st_mtime_ns, st.st_size))
+    return tuple(found)
+
+
+def _read_frontmatter_text(skill_md: Path) -> Tuple[str, bool]:
+    """
+    Leading text of skill_md through the closing '---'; (text, True) if that is the whole file.
+    Works on bytes so only the frontmatter is decoded; a file without frontmatter yields ""
+    after reading its head.
+    """
+    with open(skill_md, "rb") as f:
+        head = f.read(_HEAD_BYTES)
+        if len(head) < _HEAD_BYTES:
+            return head.decode("utf-8"), True
+        start = len(head) - len(head.lstrip())
+        if not head.startswith(b"---", start):
+            return "", False  # no name/description to index; the body is read on demand
+        end = head.find(b"---", start + 3)
+        if end != -1:
+            return head[: end + 3].decode("utf-8"), False
+        return (head + f.read()).decode("utf-8"), True
+
+
+def _read_skill_file(
+    skill_md: Path, with_body: bool
+) -> Optional[Tuple[Optional[str], Optional[str], Optional[str]]]:
+    """Read and parse skill_md (no caching; safe to run in a worker thread)."""
+    try:
+        if with_body:
+            raw, complete = skill_md.read_text(encoding="utf-8"), True
+        else:
+            raw, complete = _read_frontmatter_text(skill_md)
+    except Exception as e:
+        logger.warning("Failed to read skill file %s: %s", skill_md, e)
+        return None
+    name, desc, body = _parse_frontmatter_and_body(raw)
+    return name, desc, body if complete else None
+
+
+def _cached_skill_file(
+    skill_md: Path, mtime_ns: int, size: int, with_body: bool
+) -> Optional[Tuple[Optional[str], Optional[str], Optional[str]]]:
+    cached = _file_cache.get(skill_md)
+    if (
+        cached is not None
+        and cached[0] == mtime_ns
+        and cached[1] == size
+        and (cached[2][2] is not None or not with_body)
+    ):
+        return cached[2]
+    return None
+
+
+def _remember_skill_file(
+    skill_md: Path,
+    mtime_ns: int,
+    size: int,
+    parsed: Tuple[Optional[str], Optional[str], Optional[str]],
+) -> None:
+    if skill_md not in _file_cache and len(_file_cache) >= _FILE_CACHE_MAX:
+        del _file_cache[next(iter(_file_cache))]  # evict the oldest entry
+    _file_cache[skill_md] = (mtime_ns, size, parsed)
+
+
+def _load_skill_file(
+    skill_md: Path, mtime_ns: int, size: int, with_body: bool = False
+) -> Optional[Tuple[Optional[str], Optional[str], Optional[str]]]:
+    """
+    (name, description, body) of skill_md, re-read only when its mtime or size changed.
+    Without with_body only the frontmatter is read, so body may be None for long files.
+    """
+    parsed = _cached_skill_file(skill_md, mtime_ns, size, with_body)
+    if parsed is None:
+        parsed = _read_skill_file(skill_md, with_body)
+        if parsed is not None:
+            _remember_skill_file(skill_md, mtime_ns, size, parsed)
+    return parsed
+
+
+def _load_skill_files(
+    files: Tuple[_SkillFile, ...],
+) -> List[Optional[Tuple[Optional[str], Optional[str], Optional[str]]]]:
+    """
+    Frontmatter of every file, in order. Cache misses are read on a small thread pool
+    (cold index builds are many small reads); the cache is only updated on this thread.
+    """
+    results = [
+        _cached_skill_file(skill_md, mtime_ns, size, False)
+        for _, skill_md, mtime_ns, size in files
+    ]
+    misses = [i for i, parsed in enumerate(results) if parsed is None]
+    if len(misses) < 2:
+        for i in misses:
+            _, skill_md, mtime_ns, size = files[i]
+            results[i] = _load_skill_file(skill_md, mtime_ns, size)
+        return results
+    with ThreadPoolExecutor(max_workers=min(_READ_WORKERS, len(misses))) as pool:
+        read = pool.map(lambda i: _read_skill_file(files[i][1], False), misses)
+        for i, parsed in zip(misses, read):
+            results[i] = parsed
+            if parsed is not None:
+                _, skill_md, mtime_ns, size = files[i]
+                _remember_skill_file(skill_md, mtime_ns, size, parsed)
+    return results
+
+
+def _check_skill(subdir_name: str, skill_md: Path, parsed: Tuple[Optional[str], ...]) -> bool:
+    """True if the parsed frontmatter is a valid OpenCode skill named after its directory."""
+    name_fm, desc_fm = parsed[0], parsed[1]
+    if not name_fm or not desc_fm:
+        logger.warning(
+            "Skill %s: missing required frontmatter 'name' or 'description', skipping",
+            skill_md,
+        )
+        return False
+    if len(desc_fm) > _DESCRIPTION_MAX_LEN:
+        logger.warning(
+            "Skill %s: description longer than %d chars, skipping",
+            skill_md,
+            _DESCRIPTION_MAX_LEN,
+        )
+        return False
+    if not _NAME_RE.match(name_fm) or len(name_fm) > _NAME_MAX_LEN:
+        logger.warning(
+            "Skill %s: name must match ^[a-z0-9]+(-[a-z0-9]+)*$ and be 1-%d chars, got %r, skipping",
+            skill_md,
+            _NAME_MAX_LEN,
+            name_fm,
+        )
+        return False
+    if name_fm != subdir_name:
+        logger.warning(
+            "Skill %s: frontmatter name %r does not match directory name %r, skipping",
+            skill_md,
+            name_fm,
+            subdir_name,
+        )
+        return False
+    return True
+
+
+def _build_skill_entries(
+    files: Tuple[_SkillFile, ...], include_ids: Optional[List[str]]
+) -> List[Tuple[str, str, Path]]:
+    seen: dict[str, Tuple[str, Path]] = {}  # name -> (description, path)
+    for (subdir_name, skill_md, _, _), parsed in zip(files, _load_skill_files(files)):
+        if parsed is None or not _check_skill(subdir_name, skill_md, parsed):
+            continue
+        name_fm, desc_fm, _ = parsed
+        if include_ids is not None and len(include_ids) > 0 and name_fm not in include_ids:
+            continue
+        seen[name_fm] = (desc_fm, skill_md)
     return [(name, desc, path) for name, (desc, path) in sorted(seen.items(), key=lambda x: x[0])]
 
 
+def _find_skill_file(
+    skill_id: str, dirs: List[Path], with_body: bool = False
+) -> Optional[Tuple[Path, Tuple[Optional[str], Optional[str], Optional[str]]]]:
+    """
+    Probe <dir>/<skill_id>/SKILL.md directly instead of scanning every skill dir.
+    Dirs are tried last to first so the same override order as the index applies.
+    Returns (path, (name, description, body)) or None.
+    """
+    if not _NAME_RE.match(skill_id) or len(skill_id) > _NAME_MAX_LEN:
+        return None  # also keeps ids like "../x" from escaping the skill dirs
+    for d in reversed(dirs):
+        skill_md = _abs_dir(d) / skill_id / "SKILL.md"
+        try:
+            st = skill_md.stat()
+        except OSError:
+            continue
+        if not stat.S_ISREG(st.st_mode):
+            continue
+        parsed = _load_skill_file(skill_md, st.st_mtime_ns, st.st_size, with_body=with_body)
+        if parsed is not None and _check_skill(skill_id, skill_md, parsed):
+            return skill_md, parsed
+    return None
+
+
+def _collect_skill_entries(dirs: List[Path], include_ids: Optional[List[str]] = None) -> List[Tuple[str, str, Path]]:
+    """
+    Scan dirs for OpenCode layout: each skills_dir has subdirs with SKILL.md.
+    Return [(skill_name, description, path_to_skill_md)], later dir overwrites earlier for same name.
+    Parsed entries are reused until a SKILL.md under dirs is added, removed or modified.
+    """
+    files = _scan_skill_files(dirs)
+    key = (tuple(dirs), tuple(include_ids) if include_ids else None)
+    cached = _entries_cache.get(key)
+    if cached is None or cached[0] != files:
+        cached = (files, _build_skill_entries(files, include_ids))
+        _entries_cache[key] = cached
+    return list(cached[1])
+
+
 def get_skills_index(
     dirs: List[Path],
     include_ids: Optional[List[str]] = None,
@@ -105,20 +293,23 @@ def get_skills_index(
     return [(name, desc) for name, desc, _ in entries]
 
 
+def get_skills_fingerprint(dirs: List[Path]) -> Tuple[_SkillFile, ...]:
+    """
+    (subdir, path, st_mtime_ns, st_size) of every SKILL.md under dirs, in dir order.
+    Changes when a skill is added, removed or modified; callers compare it to reuse
+    anything derived from the skills index.
+    """
+    return _scan_skill_files(dirs)
+
+
 def get_skill_full_content(skill_id: str, dirs: List[Path]) -> str:
     """
     Return full body content for the skill (no frontmatter). Empty string if not found.
     """
-    for _name, _desc, path in _collect_skill_entries(dirs, include_ids=None):
-        if _name != skill_id:
-            continue
-        try:
-            raw = path.read_text(encoding="utf-8")
-        except Exception:
-            return ""
-        _, _, body = _parse_frontmatter_and_body(raw)
-        return body
-    return ""
+    found = _find_skill_file(skill_id, dirs, with_body=True)
+    if found is None:
+        return ""
+    return found[1][2] or ""
 
 
 def get_skill_base_dir(skill_id: str, dirs: List[Path]) -> Optional[Path]:
@@ -126,8 +317,5 @@ def get_skill_base_dir(skill_id: str, dirs: List[Path]) -> Optional[Path]:
     Return the base directory (parent of SKILL.md) for the skill, or None if not found.
     Used by the skill tool to show "Base directory for this skill" in the output.
     """
-    for _name, _desc, path in _collect_skill_entries(dirs, include_ids=None):
-        if _name != skill_id:
-            continue
-        return path.parent
-    return None
+    found = _find_skill_file(skill_id, dirs)
+    return found[0].parent if found is not None else None
@@ -3,111 +3,40 @@ Main entry point for the Basket CLI.
 """
 
 import asyncio
-import json
+import atexit
+import functools
 import logging
+import logging.handlers
 import os
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple, Union
 
-from .agent import CodingAgent
-from .core import SettingsManager
+if TYPE_CHECKING:
+    from .core import Settings
 
-logger = logging.getLogger(__name__)
-
-
-async def main_async(args: Optional[list] = None) -> int:
-    """
-    Async main function.
-
-    Args:
-        args: Command line arguments (defaults to sys.argv[1:])
-
-    Returns:
-        Exit code
-    """
-    if args is None:
-        args = sys.argv[1:]
+# CodingAgent, SettingsManager and the serve/tui/remote modules are imported inside
+# the branches that use them so --help, --version and serve status start fast.
 
-    # Parse --debug early so we can enable DEBUG logging before other logic
-    use_debug = "--debug" in args
-    if use_debug:
-        args = [a for a in args if a != "--debug"]
+logger = logging.getLogger(__name__)
 
-    # Configure logging: default write to ~/.basket/logs/ (INFO); --debug or LOG_LEVEL overrides level
-    fmt = "%(asctime)s %(name)s: %(levelname)s: %(message)s"
-    log_level_name = (os.environ.get("LOG_LEVEL") or "").upper()
-    level = logging.INFO
-    if use_debug:
-        level = logging.DEBUG
-    elif log_level_name:
-        level = getattr(logging, log_level_name, level) or level
-    log_dir = Path.home() / ".basket" / "logs"
+def _safe_int(raw: Optional[str], default: int) -> int:
+    """int(raw), or default if raw is unset or not an integer."""
+    if not raw:
+        return default
     try:
-        log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / "basket.log"
-        file_handler = logging.FileHandler(log_file, encoding="utf-8")
-        file_handler.setLevel(level)
-        file_handler.setFormatter(logging.Formatter(fmt))
-        root = logging.getLogger()
-        root.setLevel(level)
-        root.addHandler(file_handler)
-        for name in ("basket_tui.app", "basket_assistant.modes.tui"):
-            logging.getLogger(name).setLevel(level)
-        logging.getLogger("anthropic._base_client").setLevel(logging.INFO)
-        logger.info("Log file: %s", log_file)
-    except OSError as e:
-        logger.debug("Could not create log file: %s", e)
-
-    # Parse simple arguments
-    use_tui = "--tui" in args
-    if use_tui:
-        args = [a for a in args if a != "--tui"]
-
-    use_plan_mode = "--plan" in args
-    if use_plan_mode:
-        args = [a for a in args if a != "--plan"]
-
-    session_id_arg: Optional[str] = None
-    if "--session" in args:
-        i = args.index("--session")
-        if i + 1 < len(args):
-            session_id_arg = args[i + 1]
-            args = args[:i] + args[i + 2:]
-        else:
-            args = [a for a in args if a != "--session"]
+        return int(raw)
+    except ValueError:
+        return default
 
-    if "--permission-mode" in args:
-        i = args.index("--permission-mode")
-        if i + 1 < len(args) and args[i + 1] == "plan":
-            use_plan_mode = True
-        args = args[:i] + args[i + 2:] if i + 1 < len(args) else args[:i]
 
-    use_remote = "--remote" in args
-    if use_remote:
-        args = [a for a in args if a != "--remote"]
-    remote_bind = os.environ.get("BASKET_REMOTE_BIND", "0.0.0.0")
-    remote_port = 7681
-    try:
-        remote_port = int(os.environ.get("BASKET_REMOTE_PORT", "7681"))
-    except ValueError:
-        pass
-    if "--bind" in args:
-        i = args.index("--bind")
-        if i + 1 < len(args):
-            remote_bind = args[i + 1]
-            args = args[:i] + args[i + 2:]
-    if "--port" in args:
-        i = args.index("--port")
-        if i + 1 < len(args):
-            try:
-                remote_port = int(args[i + 1])
-            except ValueError:
-                pass
-            args = args[:i] + args[i + 2:]
+# Environment defaults, read once per process
+_DEFAULT_REMOTE_BIND = os.environ.get("BASKET_REMOTE_BIND", "0.0.0.0")
+_DEFAULT_REMOTE_PORT = _safe_int(os.environ.get("BASKET_REMOTE_PORT"), 7681)
+_DEFAULT_SERVE_PORT = _safe_int(os.environ.get("BASKET_SERVE_PORT"), 7682)
 
-    if "--help" in args or "-h" in args:
-        print("""
+# Static `basket --help` text, written with a single stdout write
+_USAGE = """
 Basket - AI-powered personal assistant
 
 Usage:
@@ -136,152 +65,511 @@ Environment variables:
   ANTHROPIC_API_KEY     - Anthropic API key
   GOOGLE_API_KEY        - Google API key
   LOG_LEVEL             - Log level (e.g. DEBUG); overridden by --debug
+  BASKET_LOG_DIR        - Log directory (default: ~/.basket/logs)
   BASKET_REMOTE_BIND    - Bind address for --remote (default: 0.0.0.0)
   BASKET_REMOTE_PORT    - Port for --remote (default: 7681)
   BASKET_SERVE_PORT     - Port for resident assistant (default: 7682)
-""")
+
+"""
+
+_VERSION_LINE = "Basket v0.1.0\n"
+
+# Global CLI flags: flag -> (key in parsed dict, number of values it takes)
+_FLAGS: Dict[str, Tuple[str, int]] = {
+    "--help": ("help", 0),
+    "-h": ("help", 0),
+    "--version": ("version", 0),
+    "-v": ("version", 0),
+    "--debug": ("debug", 0),
+    "--tui": ("tui", 0),
+    "--plan": ("plan", 0),
+    "--remote": ("remote", 0),
+    "--session": ("session", 1),
+    "--permission-mode": ("permission_mode", 1),
+    "--bind": ("bind", 1),
+    "--port": ("port", 1),
+}
+
+
+def _parse_args(args: List[str]) -> Tuple[Dict[str, Union[bool, str]], List[str]]:
+    """
+    Split args into recognized global flags and the remaining positionals in one pass.
+
+    Boolean flags map to True; value flags map to their following argument (a value
+    flag at the end of args is dropped). Later occurrences override earlier ones.
+
+    Returns:
+        (flags, positional)
+    """
+    flags: Dict[str, Union[bool, str]] = {}
+    positional: List[str] = []
+    i = 0
+    n = len(args)
+    while i < n:
+        arg = args[i]
+        spec = _FLAGS.get(arg)
+        if spec is None:
+            positional.append(arg)
+        elif spec[1] == 0:
+            flags[spec[0]] = True
+        else:
+            if i + 1 < n:
+                flags[spec[0]] = args[i + 1]
+            i += 1
+        i += 1
+    return flags, positional
+
+
+def _print_info(flags: Dict[str, Union[bool, str]]) -> bool:
+    """Print usage for --help or the version for --version; True if either was printed."""
+    if flags.get("help") is True:
+        sys.stdout.write(_USAGE)
+        return True
+    if flags.get("version") is True:
+        sys.stdout.write(_VERSION_LINE)
+        return True
+    return False
+
+
+def _take_flag(args: List[str], name: str, has_value: bool = False) -> Optional[str]:
+    """
+    Remove the first occurrence of option name (and its value) from args in place.
+
+    Returns:
+        The option's value if has_value, name itself for a bare switch, or None if
+        absent. An option missing its value is left in args for usage checks.
+    """
+    try:
+        i = args.index(name)
+    except ValueError:
+        return None
+    if not has_value:
+        del args[i]
+        return name
+    if i + 1 >= len(args):
+        return None
+    value = args[i + 1]
+    del args[i : i + 2]
+    return value
+
+
+# Log directories already created in this process (skips the repeat mkdir syscall)
+_READY_LOG_DIRS: Set[Path] = set()
+
+
+def _log_dir() -> Path:
+    """BASKET_LOG_DIR if set, else ~/.basket/logs (HOME read directly, no expanduser)."""
+    override = os.environ.get("BASKET_LOG_DIR")
+    if override:
+        return Path(override)
+    home = os.environ.get("HOME")
+    return (Path(home) if home else Path.home()) / ".basket" / "logs"
+
+
+class _BufferedFileHandler(logging.FileHandler):
+    """
+    FileHandler writing through a 64 KiB buffer. Unlike StreamHandler it does not
+    flush after every record; the file is flushed by flush() (once per batch) and close().
+    """
+
+    def __init__(self, filename: Path, buffer_size: int = 64 * 1024):
+        self._buffer_size = buffer_size
+        super().__init__(filename, encoding="utf-8")
+
+    def _open(self):
+        return open(
+            self.baseFilename,
+            self.mode,
+            buffering=self._buffer_size,
+            encoding=self.encoding,
+            errors=self.errors,
+        )
+
+    def emit(self, record: logging.LogRecord) -> None:
+        try:
+            if self.stream is None:
+                self.stream = self._open()
+            self.stream.write(self.format(record) + self.terminator)
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+
+
+class _BatchQueueListener(logging.handlers.QueueListener):
+    """QueueListener that flushes its handlers each time it has drained the queue."""
+
+    def handle(self, record: logging.LogRecord) -> None:
+        super().handle(record)
+        if self.queue.empty():
+            for handler in self.handlers:
+                handler.flush()
+
+
+def _log_config(level: int, log_file: Path) -> Dict[str, Any]:
+    """
+    dictConfig schema for CLI logging. Built per call because dictConfig consumes the
+    handler entries it is given.
+    """
+    return {
+        "version": 1,
+        "disable_existing_loggers": False,
+        "formatters": {
+            "default": {"format": "%(asctime)s %(name)s: %(levelname)s: %(message)s"},
+        },
+        "handlers": {
+            "file": {
+                "class": _BufferedFileHandler,
+                "filename": log_file,
+                "level": level,
+                "formatter": "default",
+            },
+            "queue": {
+                "class": "logging.handlers.QueueHandler",
+                "handlers": ["file"],
+                "listener": _BatchQueueListener,
+            },
+        },
+        "loggers": {
+            "basket_tui.app": {"level": level},
+            "basket_assistant.modes.tui": {"level": level},
+            "anthropic._base_client": {"level": logging.INFO},
+        },
+        "root": {"level": level, "handlers": ["queue"]},
+    }
+
+
+# Listener started by the last _configure_logging call
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+def _stop_log_listener() -> None:
+    """Stop the running log listener, writing out queued records; no-op if none."""
+    global _log_listener
+    listener, _log_listener = _log_listener, None
+    if listener is not None:
+        listener.stop()
+
+
+atexit.register(_stop_log_listener)
+
+
+def _configure_logging(level: int) -> Optional[logging.handlers.QueueListener]:
+    """
+    Send log records to basket.log under _log_dir() without blocking the caller.
+
+    The root logger only enqueues records; a QueueListener thread writes them to the
+    buffered file handler and flushes it whenever the queue runs empty, so a burst
+    of records costs one write and nothing waits in memory once the burst is over.
+    A previous call's listener is stopped first; as with any non-incremental
+    dictConfig, all handlers configured so far are then closed and replaced.
+
+    Returns:
+        The started listener, or None if the log file could not be opened
+    """
+    import logging.config
+
+    global _log_listener
+    _stop_log_listener()
+    log_dir = _log_dir()
+    log_file = log_dir / "basket.log"
+    try:
+        if log_dir not in _READY_LOG_DIRS:
+            log_dir.mkdir(parents=True, exist_ok=True)
+            _READY_LOG_DIRS.add(log_dir)
+        logging.config.dictConfig(_log_config(level, log_file))
+    except (OSError, ValueError) as e:
+        logger.debug("Could not create log file: %s", e)
+        return None
+    listener = _log_listener = logging.getHandlerByName("queue").listener
+    listener.start()
+    logger.info("Log file: %s", log_file)
+    return listener
+
+
+@functools.lru_cache(maxsize=4)
+def _load_settings_at(config_dir: str, mtime_ns: int) -> "Settings":
+    from .core import SettingsManager
+
+    return SettingsManager(Path(config_dir)).load()
+
+
+def _load_settings() -> "Settings":
+    """
+    Load ~/.basket/settings.json, reusing the parsed Settings while the file's mtime is
+    unchanged. The result is shared between callers and must not be mutated.
+    """
+    config_dir = Path.home() / ".basket"
+    try:
+        mtime_ns = (config_dir / "settings.json").stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = -1
+    return _load_settings_at(str(config_dir), mtime_ns)
+
+
+def _build_serve_channel_config() -> Dict[str, Any]:
+    """Build channel_config from settings.json (serve). Assistant does not interpret channel schema; gateway/channels do."""
+    cfg: Dict[str, Any] = {"websocket": True, "feishu": None}
+    try:
+        settings = _load_settings()
+        if getattr(settings, "serve", None) and isinstance(settings.serve, dict):
+            cfg.update(settings.serve)
+    except Exception as e:
+        logger.debug("Loading serve channel config: %s", e)
+    return cfg
+
+
+async def _wait_for_exit(pid: int, timeout: float) -> Optional[bool]:
+    """
+    Wait until process pid exits using a pidfd (Linux), without polling.
+
+    Returns:
+        True if the process exited (or was already gone), False if it is still running
+        after timeout, None if pidfds are unavailable (callers fall back to polling).
+    """
+    if not hasattr(os, "pidfd_open"):
+        return None
+    try:
+        fd = os.pidfd_open(pid)
+    except ProcessLookupError:
+        return True
+    except OSError as e:
+        logger.debug("pidfd_open(%s) failed: %s", pid, e)
+        return None
+    loop = asyncio.get_running_loop()
+    exited = loop.create_future()
+    try:
+        # A pidfd becomes readable once the process terminates
+        loop.add_reader(fd, lambda: exited.done() or exited.set_result(None))
+        await asyncio.wait_for(exited, timeout)
+        return True
+    except asyncio.TimeoutError:
+        return False
+    finally:
+        loop.remove_reader(fd)
+        os.close(fd)
+
+
+@functools.cache
+def _json_loads() -> Callable[[bytes], Any]:
+    """orjson.loads when the optional orjson package is installed, else json.loads."""
+    try:
+        import orjson
+    except ImportError:
+        import json
+
+        return json.loads
+    return orjson.loads
+
+
+async def _fetch_serve_status(port: int, timeout: float) -> Optional[Dict[str, Any]]:
+    """
+    GET /status from the local gateway without blocking the event loop.
+
+    Returns:
+        Decoded JSON body, or None on connection error, timeout or non-200 response.
+    """
+
+    async def _get() -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        try:
+            writer.write(
+                b"GET /status HTTP/1.0\r\nHost: 127.0.0.1\r\nAccept: application/json\r\n\r\n"
+            )
+            await writer.drain()
+            # HTTP/1.0: the server closes the connection after the response
+            return await reader.read()
+        finally:
+            writer.close()
+
+    try:
+        raw = await asyncio.wait_for(_get(), timeout)
+    except (OSError, asyncio.TimeoutError) as e:
+        logger.debug("serve status request failed: %s", e)
+        return None
+    head, _, body = raw.partition(b"\r\n\r\n")
+    status_line = head.split(b"\r\n", 1)[0].split()
+    if len(status_line) < 2 or status_line[1] != b"200":
+        return None
+    try:
+        data = _json_loads()(body)
+    except ValueError:
+        return None
+    return data if isinstance(data, dict) else None
+
+
+async def _cmd_serve_start(rest: List[str]) -> int:
+    """basket serve start [--foreground]"""
+    foreground = _take_flag(rest, "--foreground") is not None
+    if rest:
+        print("Usage: basket serve start [--foreground]")
+        return 1
+    try:
+        from .serve import run_gateway, is_serve_running
+    except ImportError as e:
+        logger.warning("serve import failed: %s", e)
+        print("Error: basket serve requires starlette and uvicorn.")
+        print("Install with: poetry add starlette 'uvicorn[standard]'")
+        return 1
+    running, pid = is_serve_running()
+    if running:
+        print(f"Assistant is already running (pid {pid}). Use 'basket serve stop' first.")
+        return 1
+    port = _DEFAULT_SERVE_PORT
+    if not foreground:
+        print("Starting assistant in foreground. Use Ctrl+C to stop.")
+        print("Tip: run with 'nohup basket serve start &' or systemd for background.")
+    from .agent import CodingAgent
+
+    channel_config = _build_serve_channel_config()
+    await run_gateway(
+        host="127.0.0.1",
+        port=port,
+        agent_factory=CodingAgent,
+        channel_config=channel_config,
+    )
+    return 0
+
+
+async def _cmd_serve_stop(rest: List[str]) -> int:
+    """basket serve stop"""
+    try:
+        from .serve import clear_serve_state, get_serve_state, is_serve_running
+    except ImportError:
+        print("Error: basket serve requires the serve module.")
+        return 1
+    import signal
+    running, pid, _ = get_serve_state()
+    if pid is None:
+        print("Assistant is not running (no pid file).")
+        return 0
+    if not running:
+        print("Assistant is not running (stale pid file removed).")
+        clear_serve_state()
+        return 0
+    try:
+        os.kill(pid, signal.SIGTERM)
+    except OSError as e:
+        print(f"Error stopping assistant: {e}")
+        return 1
+    print(f"Sent SIGTERM to pid {pid}. Waiting for exit...")
+    if await _wait_for_exit(pid, 15.0) is None:
+        for _ in range(30):
+            await asyncio.sleep(0.5)
+            if not is_serve_running()[0]:
+                break
+    clear_serve_state()
+    print("Assistant stopped.")
+    return 0
+
+
+async def _cmd_serve_status(rest: List[str]) -> int:
+    """basket serve status"""
+    try:
+        from .serve import get_serve_state
+    except ImportError:
+        print("Error: basket serve requires the serve module.")
+        return 1
+    running, pid, port = get_serve_state()
+    if not running:
+        print("Assistant is not running.")
         return 0
+    print(f"Assistant is running (pid {pid}, port {port}).")
+    if port is not None:
+        data = await _fetch_serve_status(port, 2.0)
+        if data is not None:
+            if "uptime_seconds" in data:
+                print(f"Uptime: {data['uptime_seconds']}s")
+            if "version" in data:
+                print(f"Version: {data['version']}")
+    return 0
+
+
+async def _cmd_serve_attach(rest: List[str]) -> int:
+    """basket serve attach [--url WS_URL]"""
+    attach_url = _take_flag(rest, "--url", has_value=True)
+    if rest:
+        print("Usage: basket serve attach [--url WS_URL]")
+        return 1
+    try:
+        from .serve import get_serve_state
+        from .modes.attach import run_tui_mode_attach
+    except ImportError as e:
+        logger.warning("attach import failed: %s", e)
+        if "attach" in str(e):
+            print("Error: TUI attach requires 'basket-tui' package.")
+            print("Install with: poetry add basket-tui")
+        else:
+            print("Error: basket serve attach requires the serve and attach modules.")
+        return 1
+    if attach_url is None:
+        running, _, port = get_serve_state()
+        if not running:
+            print("Assistant is not running. Start it with: basket serve start")
+            return 1
+        if port is None:
+            print("Cannot determine port. Use: basket serve attach --url ws://127.0.0.1:7682/ws")
+            return 1
+        attach_url = f"ws://127.0.0.1:{port}/ws"
+    await run_tui_mode_attach(attach_url)
+    return 0
+
+
+# Serve subcommands: resident assistant gateway (start / stop / status / attach)
+_SERVE_COMMANDS: Dict[str, Callable[[List[str]], Awaitable[int]]] = {
+    "start": _cmd_serve_start,
+    "stop": _cmd_serve_stop,
+    "status": _cmd_serve_status,
+    "attach": _cmd_serve_attach,
+}
+
+
+async def main_async(args: Optional[List[str]] = None) -> int:
+    """
+    Async main function.
+
+    Args:
+        args: Command line arguments (defaults to sys.argv[1:])
 
-    if "--version" in args or "-v" in args:
-        print("Basket v0.1.0")
+    Returns:
+        Exit code
+    """
+    if args is None:
+        args = sys.argv[1:]
+
+    flags, args = _parse_args(args)
+    if _print_info(flags):
         return 0
+    use_debug = flags.get("debug") is True
 
-    # Serve subcommands: resident assistant gateway (start / stop / status / attach)
-    def _build_serve_channel_config():
-        """Build channel_config from settings.json (serve). Assistant does not interpret channel schema; gateway/channels do."""
-        cfg = {"websocket": True, "feishu": None}
+    # Configure logging: default write to ~/.basket/logs/ (INFO); --debug or LOG_LEVEL overrides level
+    log_level_name = (os.environ.get("LOG_LEVEL") or "").upper()
+    level = logging.INFO
+    if use_debug:
+        level = logging.DEBUG
+    elif log_level_name:
+        level = getattr(logging, log_level_name, level) or level
+    _configure_logging(level)
+
+    use_tui = flags.get("tui") is True
+    use_plan_mode = flags.get("plan") is True or flags.get("permission_mode") == "plan"
+    session_flag = flags.get("session")
+    session_id_arg: Optional[str] = session_flag if isinstance(session_flag, str) else None
+    use_remote = flags.get("remote") is True
+    bind_flag = flags.get("bind")
+    remote_bind: str = bind_flag if isinstance(bind_flag, str) else _DEFAULT_REMOTE_BIND
+    remote_port: int = _DEFAULT_REMOTE_PORT
+    port_flag = flags.get("port")
+    if isinstance(port_flag, str):
         try:
-            sm = SettingsManager()
-            settings = sm.load()
-            if getattr(settings, "serve", None) and isinstance(settings.serve, dict):
-                cfg.update(settings.serve)
-        except Exception as e:
-            logger.debug("Loading serve channel config: %s", e)
-        return cfg
-
-    if len(args) >= 2 and args[0] == "serve" and args[1] in ("start", "stop", "status", "attach"):
-        sub = args[1]
-        rest = args[2:]
-        if sub == "start":
-            foreground = "--foreground" in rest
-            rest = [a for a in rest if a != "--foreground"]
-            if rest:
-                print("Usage: basket serve start [--foreground]")
-                return 1
-            try:
-                from .serve import run_gateway, is_serve_running
-            except ImportError as e:
-                logger.warning("serve import failed: %s", e)
-                print("Error: basket serve requires starlette and uvicorn.")
-                print("Install with: poetry add starlette 'uvicorn[standard]'")
-                return 1
-            running, pid = is_serve_running()
-            if running:
-                print(f"Assistant is already running (pid {pid}). Use 'basket serve stop' first.")
-                return 1
-            port = 7682
-            try:
-                port = int(os.environ.get("BASKET_SERVE_PORT", "7682"))
-            except ValueError:
-                pass
-            if not foreground:
-                print("Starting assistant in foreground. Use Ctrl+C to stop.")
-                print("Tip: run with 'nohup basket serve start &' or systemd for background.")
-            channel_config = _build_serve_channel_config()
-            await run_gateway(
-                host="127.0.0.1",
-                port=port,
-                agent_factory=CodingAgent,
-                channel_config=channel_config,
-            )
-            return 0
-        if sub == "stop":
-            try:
-                from .serve import read_serve_state, clear_serve_state, is_serve_running
-            except ImportError:
-                print("Error: basket serve requires the serve module.")
-                return 1
-            import signal
-            pid, _ = read_serve_state()
-            if pid is None:
-                print("Assistant is not running (no pid file).")
-                return 0
-            running, _ = is_serve_running()
-            if not running:
-                print("Assistant is not running (stale pid file removed).")
-                clear_serve_state()
-                return 0
-            try:
-                os.kill(pid, signal.SIGTERM)
-            except OSError as e:
-                print(f"Error stopping assistant: {e}")
-                return 1
-            print(f"Sent SIGTERM to pid {pid}. Waiting for exit...")
-            for _ in range(30):
-                await asyncio.sleep(0.5)
-                if not is_serve_running()[0]:
-                    break
-            clear_serve_state()
-            print("Assistant stopped.")
-            return 0
-        if sub == "status":
-            try:
-                from .serve import read_serve_state, is_serve_running
-            except ImportError:
-                print("Error: basket serve requires the serve module.")
-                return 1
-            running, pid = is_serve_running()
-            _, port = read_serve_state()
-            if not running:
-                print("Assistant is not running.")
-                return 0
-            print(f"Assistant is running (pid {pid}, port {port}).")
-            if port is not None:
-                try:
-                    import urllib.request
-                    req = urllib.request.Request(f"http://127.0.0.1:{port}/status")
-                    with urllib.request.urlopen(req, timeout=2) as resp:
-                        data = json.load(resp)
-                        if "uptime_seconds" in data:
-                            print(f"Uptime: {data['uptime_seconds']}s")
-                        if "version" in data:
-                            print(f"Version: {data['version']}")
-                except Exception:
-                    pass
-            return 0
-        if sub == "attach":
-            attach_url = None
-            if "--url" in rest:
-                i = rest.index("--url")
-                if i + 1 < len(rest):
-                    attach_url = rest[i + 1]
-                    rest = rest[:i] + rest[i + 2:]
-            if rest:
-                print("Usage: basket serve attach [--url WS_URL]")
-                return 1
-            try:
-                from .serve import get_serve_port, is_serve_running
-                from .modes.attach import run_tui_mode_attach
-            except ImportError as e:
-                logger.warning("attach import failed: %s", e)
-                if "attach" in str(e):
-                    print("Error: TUI attach requires 'basket-tui' package.")
-                    print("Install with: poetry add basket-tui")
-                else:
-                    print("Error: basket serve attach requires the serve and attach modules.")
-                return 1
-            if attach_url is None:
-                running, _ = is_serve_running()
-                if not running:
-                    print("Assistant is not running. Start it with: basket serve start")
-                    return 1
-                port = get_serve_port()
-                if port is None:
-                    print("Cannot determine port. Use: basket serve attach --url ws://127.0.0.1:7682/ws")
-                    return 1
-                attach_url = f"ws://127.0.0.1:{port}/ws"
-            await run_tui_mode_attach(attach_url)
-            return 0
+            remote_port = int(port_flag)
+        except ValueError:
+            pass
+
+    if len(args) >= 2 and args[0] == "serve":
+        serve_handler = _SERVE_COMMANDS.get(args[1])
+        if serve_handler is not None:
+            return await serve_handler(args[2:])
 
     # Remote mode: run ttyd with basket --tui, no agent in this process
     if use_remote:
@@ -307,7 +595,7 @@ Environment variables:
     if len(args) >= 1 and args[0] == "relay":
         relay_url = args[1] if len(args) >= 2 else None
         if not relay_url:
-            _settings = SettingsManager().load()
+            _settings = _load_settings()
             relay_url = getattr(_settings, "relay_url", None) or (
                 (_settings.serve or {}).get("relay_url") if _settings.serve else None
             )
@@ -326,6 +614,8 @@ Environment variables:
         return 0
 
     # Create agent
+    from .agent import CodingAgent
+
     try:
         agent = CodingAgent()
     except Exception as e:
@@ -368,6 +658,17 @@ Environment variables:
     return 0
 
 
+def _loop_factory(positional: List[str]) -> Optional[Callable[[], asyncio.AbstractEventLoop]]:
+    """uvloop for the resident gateway (`serve start`) when installed; None means asyncio's default."""
+    if positional[:2] != ["serve", "start"]:
+        return None
+    try:
+        import uvloop  # ships with uvicorn[standard] on Linux/macOS
+    except ImportError:
+        return None
+    return uvloop.new_event_loop
+
+
 def main() -> int:
     """
     Main entry point.
@@ -375,7 +676,12 @@ def main() -> int:
     Returns:
         Exit code
     """
-    return asyncio.run(main_async())
+    args = sys.argv[1:]
+    flags, positional = _parse_args(args)
+    # --help / --version need no event loop, logging or agent: answer them synchronously
+    if _print_info(flags):
+        return 0
+    return asyncio.run(main_async(args), loop_factory=_loop_factory(positional))
 
 
 if __name__ == "__main__":
@@ -6,10 +6,10 @@ URL (e.g. wss://relay-host/relay/client?session_id=xxx from `basket relay <url>`
 """
 
 import asyncio
-import json
 import logging
 from typing import Optional
 
+from basket_gateway.codec import dumps, loads
 from basket_tui import PiCodingAgentApp
 from basket_tui.app import ProcessPendingInputs
 
@@ -51,7 +51,7 @@ async def run_tui_mode_attach(ws_url: str) -> None:
         agent_placeholder_task = asyncio.create_task(_placeholder_agent_task(agent_done_future))
         app.set_agent_task(agent_placeholder_task)
         try:
-            await ws.send(json.dumps({"type": "message", "content": user_input}))
+            await ws.send(dumps({"type": "message", "content": user_input}))
         except Exception as e:
             logger.exception("Failed to send message to gateway")
             app.append_message("system", f"Send error: {e}")
@@ -59,87 +59,104 @@ async def run_tui_mode_attach(ws_url: str) -> None:
                 agent_done_future.set_result(None)
             app.set_agent_task(None)
 
-    def dispatch(msg: dict) -> None:
-        nonlocal agent_done_future, agent_placeholder_task
-        typ = msg.get("type")
-        if typ == "text_delta":
-            app.append_text(msg.get("delta", ""))
-        elif typ == "thinking_delta":
-            delta = msg.get("delta", "")
-            if not getattr(dispatch, "_in_thinking", False):
-                dispatch._in_thinking = True
-                app.append_message("system", "Thinking...")
-            app.append_thinking(delta)
-        elif typ == "tool_call_start":
-            dispatch._in_thinking = False
-            if msg.get("tool_name") in ("ask_user_question", "todo_write"):
-                pass
-            else:
-                app.show_tool_call(
-                    msg.get("tool_name", "unknown"),
-                    msg.get("arguments") or {},
-                )
-        elif typ == "tool_call_end":
-            tool_name = msg.get("tool_name", "unknown")
-            if tool_name in ("ask_user_question", "todo_write"):
-                pass
-            elif "error" in msg:
-                app.show_tool_result(msg["error"], success=False)
-            else:
-                app.show_tool_result(msg.get("result", ""), success=True)
-        elif typ == "todos":
-            app.update_todo_panel(msg.get("todos", []))
-        elif typ == "ask_user_question":
-            question = msg.get("question", "")
-            options = msg.get("options") or []
-            app.show_ask_question(question, options)
-        elif typ == "plan_mode":
-            app.update_plan_mode(msg.get("value", False))
-            dispatch._in_thinking = False
-            app.finalize_assistant_block()
-            if agent_done_future and not agent_done_future.done():
-                agent_done_future.set_result(None)
-            app.set_agent_task(None)
-            agent_done_future = None
-            agent_placeholder_task = None
-            app.post_message(ProcessPendingInputs())
-        elif typ == "agent_complete":
-            dispatch._in_thinking = False
-            app.finalize_assistant_block()
-            if agent_done_future and not agent_done_future.done():
-                agent_done_future.set_result(None)
-            app.set_agent_task(None)
-            agent_done_future = None
-            agent_placeholder_task = None
-            app.post_message(ProcessPendingInputs())
-        elif typ == "ready":
-            pass
-        elif typ == "agent_disconnected":
-            app.append_message("system", "Agent disconnected from relay.")
-        elif typ == "error":
-            app.append_message("system", msg.get("error", "Relay error"))
-        elif typ == "agent_error":
-            dispatch._in_thinking = False
-            app.append_message("system", f"Error: {msg.get('error', 'Unknown error')}")
-            if agent_done_future and not agent_done_future.done():
-                agent_done_future.set_result(None)
-            app.set_agent_task(None)
+    # Per-frame dispatch: bound methods and handlers are looked up once here.
+    append_text = app.append_text
+    append_thinking = app.append_thinking
+    append_message = app.append_message
+    show_tool_call = app.show_tool_call
+    show_tool_result = app.show_tool_result
+    silent_tools = frozenset(("ask_user_question", "todo_write"))
+    in_thinking = False
+
+    def _finish_turn() -> None:
+        nonlocal agent_done_future, agent_placeholder_task, in_thinking
+        in_thinking = False
+        app.finalize_assistant_block()
+        if agent_done_future and not agent_done_future.done():
+            agent_done_future.set_result(None)
+        app.set_agent_task(None)
+        agent_done_future = None
+        agent_placeholder_task = None
+        app.post_message(ProcessPendingInputs())
+
+    def _on_thinking_delta(msg: dict) -> None:
+        nonlocal in_thinking
+        if not in_thinking:
+            in_thinking = True
+            append_message("system", "Thinking...")
+        append_thinking(msg.get("delta", ""))
+
+    def _on_tool_call_start(msg: dict) -> None:
+        nonlocal in_thinking
+        in_thinking = False
+        if msg.get("tool_name") not in silent_tools:
+            show_tool_call(msg.get("tool_name", "unknown"), msg.get("arguments") or {})
+
+    def _on_tool_call_end(msg: dict) -> None:
+        if msg.get("tool_name", "unknown") in silent_tools:
+            return
+        if "error" in msg:
+            show_tool_result(msg["error"], success=False)
+        else:
+            show_tool_result(msg.get("result", ""), success=True)
+
+    def _on_plan_mode(msg: dict) -> None:
+        app.update_plan_mode(msg.get("value", False))
+        _finish_turn()
+
+    def _on_agent_error(msg: dict) -> None:
+        nonlocal in_thinking
+        in_thinking = False
+        append_message("system", f"Error: {msg.get('error', 'Unknown error')}")
+        if agent_done_future and not agent_done_future.done():
+            agent_done_future.set_result(None)
+        app.set_agent_task(None)
+
+    handlers = {
+        "text_delta": lambda msg: append_text(msg.get("delta", "")),
+        "thinking_delta": _on_thinking_delta,
+        "tool_call_start": _on_tool_call_start,
+        "tool_call_end": _on_tool_call_end,
+        "todos": lambda msg: app.update_todo_panel(msg.get("todos", [])),
+        "ask_user_question": lambda msg: app.show_ask_question(
+            msg.get("question", ""), msg.get("options") or []
+        ),
+        "plan_mode": _on_plan_mode,
+        "agent_complete": lambda msg: _finish_turn(),
+        "agent_disconnected": lambda msg: append_message(
+            "system", "Agent disconnected from relay."
+        ),
+        "error": lambda msg: append_message("system", msg.get("error", "Relay error")),
+        "agent_error": _on_agent_error,
+    }
+    get_handler = handlers.get
 
-    dispatch._in_thinking = False
+    def dispatch(msg: dict) -> None:
+        handler = get_handler(msg.get("type"))
+        if handler is not None:
+            handler(msg)
 
     async def reader() -> None:
         nonlocal agent_done_future
         try:
-            async with websockets.connect(ws_url) as ws:
+            # No compression for small event frames; fail fast if the gateway is down
+            async with websockets.connect(
+                ws_url,
+                compression=None,
+                max_size=2**23,  # tool results can exceed the 1 MiB default
+                open_timeout=5,
+                ping_interval=20,
+                ping_timeout=20,
+            ) as ws:
                 ws_ref.append(ws)
                 connected.set()
                 try:
                     async for raw in ws:
                         try:
-                            data = json.loads(raw)
-                            dispatch(data)
-                        except json.JSONDecodeError:
-                            pass
+                            data = loads(raw)
+                        except ValueError:  # JSONDecodeError from either codec
+                            continue
+                        dispatch(data)
                 finally:
                     ws_ref.clear()
         except asyncio.CancelledError:
@@ -23,6 +23,7 @@ async def run_relay_client(relay_url: str) -> None:
             "basket_assistant.modes.relay_client requires 'websockets' package"
         )
 
+    from basket_gateway.codec import encode_event
     from basket_gateway.gateway import AgentGateway
 
     from ..agent import CodingAgent
@@ -33,7 +34,7 @@ async def run_relay_client(relay_url: str) -> None:
 
     async def event_sink(ws, payload: dict):
         try:
-            await ws.send(json.dumps(payload))
+            await ws.send(encode_event(payload))
         except Exception as e:
             logger.debug("Relay client send event failed: %s", e)
 
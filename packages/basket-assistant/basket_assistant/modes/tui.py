@@ -5,21 +5,24 @@ Runs the coding agent with an interactive TUI interface.
 """
 
 import asyncio
-import copy
 import logging
-import time
 from pathlib import Path
-from typing import Optional, Tuple
+from typing import TYPE_CHECKING, Optional, Tuple
 
-from basket_agent import Agent
-from basket_ai.types import Message
+from basket_gateway.tool_format import format_tool_result as _format_tool_result
 from basket_tui import PiCodingAgentApp
 from basket_tui.app import ProcessPendingInputs
 
+from ..core.messages_io import now_ms
+
+if TYPE_CHECKING:
+    from basket_agent import Agent
+    from basket_ai.types import Message
+
 logger = logging.getLogger(__name__)
 
 
-def _message_to_display(msg: Message) -> Tuple[str, str]:
+def _message_to_display(msg: "Message") -> Tuple[str, str]:
     """
     Convert a Message to (role, display_text) for TUI output.
     user: content as string; assistant: text blocks joined; toolResult: "[tool: name] result".
@@ -58,117 +61,7 @@ def _message_to_display(msg: Message) -> Tuple[str, str]:
     return "system", str(msg)
 
 
-def _format_tool_result(tool_name: str, result: any) -> str:
-    """
-    Format tool result for display in TUI (Claude Code minimal style).
-
-    Args:
-        tool_name: Name of the tool that was executed
-        result: Result object from the tool
-
-    Returns:
-        Formatted string representation of the result
-    """
-    if result is None:
-        return "Tool executed successfully (no output)"
-
-    # Handle dict results (Pydantic models are converted to dicts)
-    if isinstance(result, dict):
-        if tool_name == "bash":
-            stdout = result.get("stdout", "").strip()
-            stderr = result.get("stderr", "").strip()
-            exit_code = result.get("exit_code", 0)
-            timeout = result.get("timeout", False)
-
-            parts = []
-            if timeout:
-                parts.append("Command timed out")
-
-            # Simple status line
-            if exit_code == 0:
-                parts.append(f"exit {exit_code}")
-            else:
-                parts.append(f"exit {exit_code} (error)")
-
-            # Output with reasonable truncation
-            if stdout:
-                if len(stdout) > 1000:
-                    parts.append(f"\n{stdout[:1000]}\n... ({len(stdout)} chars total, truncated)")
-                else:
-                    parts.append(f"\n{stdout}")
-
-            if stderr:
-                parts.append(f"\nErrors:\n{stderr[:500]}")
-
-            return "\n".join(parts)
-
-        elif tool_name == "read":
-            lines = result.get("lines", 0)
-            file_path = result.get("file_path", "")
-            content = result.get("content", "")
-
-            # Show first few lines as preview
-            content_lines = content.split("\n")
-            preview_lines = content_lines[:5]
-            preview = "\n".join(preview_lines)
-
-            parts = [f"Read {lines} lines from {file_path}"]
-            if len(content_lines) > 5:
-                parts.append(f"\nFirst 5 lines:\n{preview}\n... ({lines} total lines)")
-            else:
-                parts.append(f"\n{preview}")
-
-            return "\n".join(parts)
-
-        elif tool_name == "write":
-            file_path = result.get("file_path", "")
-            success = result.get("success", False)
-
-            if success:
-                return f"Wrote file: {file_path}"
-            else:
-                error = result.get("error", "Unknown error")
-                return f"Write failed: {error}"
-
-        elif tool_name == "edit":
-            success = result.get("success", False)
-            replacements = result.get("replacements_made", 0)
-            file_path = result.get("file_path", "")
-
-            if success:
-                return f"Made {replacements} replacement(s) in {file_path}"
-            else:
-                error = result.get("error", "Unknown error")
-                return f"Edit failed: {error}"
-
-        elif tool_name == "grep":
-            total_matches = result.get("total_matches", 0)
-            truncated = result.get("truncated", False)
-            matches = result.get("matches", [])
-
-            parts = [f"Found {total_matches} match(es)"]
-
-            if matches:
-                sample_count = min(5, len(matches))
-                parts.append(f"\nShowing {sample_count} of {total_matches}:")
-                for match in matches[:sample_count]:
-                    file_path = match.get("file_path", "")
-                    line_number = match.get("line_number", 0)
-                    parts.append(f"  {file_path}:{line_number}")
-
-                if total_matches > sample_count:
-                    parts.append(f"... and {total_matches - sample_count} more")
-
-            return "\n".join(parts)
-
-    # Fallback for other result types
-    result_str = str(result)
-    if len(result_str) > 500:
-        return result_str[:500] + f"\n... ({len(result_str)} chars total, truncated)"
-    return result_str
-
-
-def _connect_agent_handlers(app, agent: Agent, current_response: dict, coding_agent=None) -> None:
+def _connect_agent_handlers(app, agent: "Agent", current_response: dict, coding_agent=None) -> None:
     """
     Connect agent event handlers to app display methods (same-thread direct calls).
 
@@ -299,7 +192,6 @@ async def run_tui_mode(coding_agent) -> None:
                 return
             except Exception as e:
                 logger.exception("Resume pending ask failed")
-                coding_agent.context.messages = coding_agent.context.messages  # no-op, keep context
                 app.append_message("system", f"Error: {e}")
                 return
             finally:
@@ -307,17 +199,17 @@ async def run_tui_mode(coding_agent) -> None:
             # If not resumed, fall through to normal append + run
 
         n_before = len(coding_agent.context.messages)
-        # Add user message to context
+        # Add user message to context (plain str input: skip pydantic validation)
         coding_agent.context.messages.append(
-            UserMessage(
+            UserMessage.model_construct(
                 role="user",
                 content=user_input,
-                timestamp=int(time.time() * 1000),
+                timestamp=now_ms(),
             )
         )
 
-        # Snapshot context for error recovery (restore on exception)
-        messages_snapshot = copy.deepcopy(coding_agent.context.messages)
+        # Messages are only appended during a run: on error, truncate back to this length
+        n_kept = len(coding_agent.context.messages)
 
         # Create assistant block so streaming updates go to one block (must be before run)
         await app.ensure_assistant_block()
@@ -366,7 +258,7 @@ async def run_tui_mode(coding_agent) -> None:
             app.append_message("system", "Stopped by user.")
         except Exception as e:
             logger.exception("Agent run failed in TUI")
-            coding_agent.context.messages = messages_snapshot
+            del coding_agent.context.messages[n_kept:]
             app.append_message("system", f"Error: {e}")
             app.append_message("system", "Context restored to previous state.")
         finally:
@@ -10,6 +10,8 @@ from basket_gateway import (
     clear_serve_state,
     is_serve_running,
     get_serve_port,
+    get_serve_state,
+    ServeState,
 )
 
 __all__ = [
@@ -20,4 +22,6 @@ __all__ = [
     "clear_serve_state",
     "is_serve_running",
     "get_serve_port",
+    "get_serve_state",
+    "ServeState",
 ]
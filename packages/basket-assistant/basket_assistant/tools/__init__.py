@@ -15,7 +15,7 @@ from .ask_user_question import (
     AskUserQuestionParams,
     create_ask_user_question_tool,
 )
-from .todo_write import TodoItem, TodoWriteParams, create_todo_write_tool
+from .todo_write import TodoItem, TodoWriteParams, create_todo_write_tool, flush_todo_saves
 from .web_search import WebSearchParams, create_web_search_tool
 from .write import WRITE_TOOL, WriteParams, WriteResult, write_file
 
@@ -75,6 +75,7 @@ __all__ = [
     "TodoItem",
     "TodoWriteParams",
     "create_todo_write_tool",
+    "flush_todo_saves",
     # Web Search
     "WebSearchParams",
     "create_web_search_tool",
@@ -0,0 +1,58 @@
+"""
+Pooled httpx client shared by the web tools (web_fetch, web_search).
+
+Keep-alive connections (and HTTP/2 when h2 is installed) are reused across tool calls.
+Per-tool settings (timeouts, redirects, headers) are passed with each request.
+"""
+
+import asyncio
+import importlib.util
+import logging
+from typing import Optional, Set
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+MAX_KEEPALIVE_CONNECTIONS = 10
+
+# Connections belong to the loop that opened them, so a new loop gets a new client
+_CLIENT: Optional[httpx.AsyncClient] = None
+_CLIENT_LOOP: Optional[asyncio.AbstractEventLoop] = None
+
+# Close tasks for replaced clients, referenced until they finish
+_closing: Set["asyncio.Future[None]"] = set()
+
+
+async def _aclose_quietly(client: httpx.AsyncClient) -> None:
+    try:
+        await client.aclose()
+    except Exception as e:
+        logger.debug("Closing replaced HTTP client failed: %s", e)
+
+
+def _close_replaced(
+    client: httpx.AsyncClient, owner: Optional[asyncio.AbstractEventLoop]
+) -> None:
+    """Close a replaced client on the loop that owns it if that loop still runs, else here."""
+    if owner is not None and owner.is_running():
+        asyncio.run_coroutine_threadsafe(_aclose_quietly(client), owner)
+        return
+    task = asyncio.ensure_future(_aclose_quietly(client))
+    _closing.add(task)
+    task.add_done_callback(_closing.discard)
+
+
+def get_client() -> httpx.AsyncClient:
+    """Return the pooled client for the running event loop, building it on first use."""
+    global _CLIENT, _CLIENT_LOOP
+    loop = asyncio.get_running_loop()
+    if _CLIENT is None or _CLIENT.is_closed or _CLIENT_LOOP is not loop:
+        if _CLIENT is not None and not _CLIENT.is_closed:
+            _close_replaced(_CLIENT, _CLIENT_LOOP)
+        _CLIENT = httpx.AsyncClient(
+            limits=httpx.Limits(max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS),
+            http2=importlib.util.find_spec("h2") is not None,
+        )
+        _CLIENT_LOOP = loop
+    return _CLIENT
@@ -2,8 +2,10 @@
 Skill tool - Load a skill by name (OpenCode-style). Returns skill content as tool result.
 """
 
+import functools
+import io
 from pathlib import Path
-from typing import Callable, List, Optional
+from typing import Callable, List, Optional, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -16,25 +18,37 @@ class SkillParams(BaseModel):
     name: str = Field(..., description="The name of the skill to load (from available_skills)")
 
 
-def _build_skill_description(dirs: List[Path], include_ids: Optional[List[str]] = None) -> str:
-    """Build tool description including <available_skills> XML block."""
-    index = get_skills_index(dirs, include_ids=include_ids)
+@functools.lru_cache(maxsize=32)
+def _describe_skills(index: Tuple[Tuple[str, str], ...]) -> str:
+    """Tool description for an index; cached so agents and subagents share one string."""
     if not index:
         return (
             "Load a specialized skill that provides domain-specific instructions and workflows. "
             "No skills are currently available."
         )
-    lines = [
-        "Load a specialized skill that provides domain-specific instructions and workflows.",
-        "When you recognize that a task matches one of the available skills listed below, use this tool to load the full skill instructions.",
-        "The tool output includes the loaded skill content. Invoke this tool when a task matches one of the available skills:",
-        "",
-        "<available_skills>",
-    ]
+    buf = io.StringIO()
+    w = buf.write
+    w(
+        "Load a specialized skill that provides domain-specific instructions and workflows.\n"
+        "When you recognize that a task matches one of the available skills listed below, use this tool to load the full skill instructions.\n"
+        "The tool output includes the loaded skill content. Invoke this tool when a task matches one of the available skills:\n"
+        "\n"
+        "<available_skills>\n"
+    )
     for skill_name, skill_desc in index:
-        lines.append(f"  <skill><name>{skill_name}</name><description>{skill_desc}</description></skill>")
-    lines.append("</available_skills>")
-    return "\n".join(lines)
+        w("  <skill><name>")
+        w(skill_name)
+        w("</name><description>")
+        w(skill_desc)
+        w("</description></skill>\n")
+    w("</available_skills>")
+    return buf.getvalue()
+
+
+def _build_skill_description(dirs: List[Path], include_ids: Optional[List[str]] = None) -> str:
+    """Build tool description including <available_skills> XML block."""
+    # The index is itself cached until a SKILL.md under dirs changes
+    return _describe_skills(tuple(get_skills_index(dirs, include_ids=include_ids)))
 
 
 def create_skill_tool(
@@ -57,12 +71,13 @@ def create_skill_tool(
             available = ", ".join(n for n, _ in index) if index else "none"
             return f'Skill "{name}" not found. Available skills: {available}'
         base_dir = get_skill_base_dir(name, dirs_inner)
-        lines = [f"# Skill: {name}", "", content.strip()]
-        if base_dir is not None:
-            lines.append("")
-            lines.append(f"Base directory for this skill: {base_dir}")
-            lines.append("Relative paths in this skill (e.g., scripts/, reference/) are relative to this base directory.")
-        return "\n".join(lines)
+        text = f"# Skill: {name}\n\n{content.strip()}"
+        if base_dir is None:
+            return text
+        return (
+            f"{text}\n\nBase directory for this skill: {base_dir}\n"
+            "Relative paths in this skill (e.g., scripts/, reference/) are relative to this base directory."
+        )
 
     return {
         "name": "skill",
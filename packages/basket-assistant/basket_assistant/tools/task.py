@@ -2,7 +2,8 @@
 Task tool - Delegate work to a subagent by name (OpenCode-style).
 """
 
-from typing import Any
+import functools
+from typing import Any, Tuple
 
 from pydantic import BaseModel, Field
 
@@ -15,6 +16,24 @@ class TaskParams(BaseModel):
     subagent_type: str = Field(..., description="The name of the subagent to use (from available list)")
 
 
+@functools.lru_cache(maxsize=32)
+def _describe_subagents(entries: Tuple[Tuple[str, str], ...]) -> str:
+    """Tool description for sorted (name, description) pairs; cached so rebuilds reuse one string."""
+    if not entries:
+        return "Delegate a task to a specialized subagent. No subagents configured."
+    lines = [
+        "Delegate a complex or multi-step task to a specialized subagent. The subagent runs with its own instructions and tools, then returns a single result.",
+        "",
+        "When to use: research, codebase exploration, or tasks that fit a subagent's description.",
+        "When NOT to use: simple file read/write or single command; use read/write/bash instead.",
+        "",
+        "Available subagents (pass subagent_type when calling this tool):",
+    ]
+    for name, desc in entries:
+        lines.append(f"  - {name}: {desc}")
+    return "\n".join(lines)
+
+
 def create_task_tool(agent_ref: Any) -> dict:
     """
     Create the task tool with dynamic description. Call from main when registering tools.
@@ -24,31 +43,13 @@ def create_task_tool(agent_ref: Any) -> dict:
     Returns a dict with name, description, parameters, execute_fn for agent.register_tool().
     """
     configs = agent_ref._get_subagent_configs()
-    if not configs:
-        description = "Delegate a task to a specialized subagent. No subagents configured."
-    else:
-        lines = [
-            "Delegate a complex or multi-step task to a specialized subagent. The subagent runs with its own instructions and tools, then returns a single result.",
-            "",
-            "When to use: research, codebase exploration, or tasks that fit a subagent's description.",
-            "When NOT to use: simple file read/write or single command; use read/write/bash instead.",
-            "",
-            "Available subagents (pass subagent_type when calling this tool):",
-        ]
-        for name, cfg in sorted(configs.items()):
-            lines.append(f"  - {name}: {cfg.description}")
-        description = "\n".join(lines)
+    description = _describe_subagents(
+        tuple(sorted((name, cfg.description) for name, cfg in configs.items())) if configs else ()
+    )
 
     async def execute_task(description: str, prompt: str, subagent_type: str) -> str:
         result = await agent_ref.run_subagent(subagent_type, prompt)
-        lines = [
-            "task_id: none",
-            "",
-            "<task_result>",
-            result,
-            "</task_result>",
-        ]
-        return "\n".join(lines)
+        return f"task_id: none\n\n<task_result>\n{result}\n</task_result>"
 
     return {
         "name": "task",
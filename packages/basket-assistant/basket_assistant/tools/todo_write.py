@@ -4,10 +4,14 @@ TodoWrite tool - Manage a structured task list for the current session (OpenCode
 Replaces the entire todo list on each call. Used for multi-step task tracking.
 """
 
-from typing import Any, List, Literal
+import asyncio
+import logging
+from typing import Any, List, Literal, Optional
 
 from pydantic import BaseModel, Field
 
+logger = logging.getLogger(__name__)
+
 TodoStatus = Literal["pending", "in_progress", "completed", "cancelled"]
 
 
@@ -31,11 +35,45 @@ class TodoWriteParams(BaseModel):
     )
 
 
+def _serialize_item(item: Any) -> dict:
+    """Todo as {"id", "content", "status"}; attributes are read directly, without model_dump()."""
+    if isinstance(item, dict):  # the usual case: arguments decoded from a tool call
+        return {
+            "id": item.get("id"),
+            "content": item.get("content", ""),
+            "status": item.get("status", "pending"),
+        }
+    if isinstance(item, TodoItem):
+        return {"id": item.id, "content": item.content, "status": item.status}
+    return {"id": None, "content": str(item), "status": "pending"}
+
+
+async def _save_todos_after(
+    previous: Optional[asyncio.Task], session_manager: Any, session_id: str, todos: List[dict]
+) -> None:
+    """Persist todos once the previous save is done, so saves land in call order."""
+    if previous is not None:
+        await asyncio.wait([previous])
+    try:
+        await session_manager.save_todos(session_id, todos)
+    except Exception as e:
+        logger.warning("Failed to save todos for session %s: %s", session_id, e)
+
+
+async def flush_todo_saves(agent_ref: Any) -> None:
+    """Wait for todo saves started by todo_write; call before reloading or leaving a session."""
+    task = getattr(agent_ref, "_todo_save_task", None)
+    if isinstance(task, asyncio.Task):
+        await asyncio.wait([task])
+
+
 def create_todo_write_tool(agent_ref: Any) -> dict:
     """
     Create the todo_write tool. Call from main when registering tools.
 
-    agent_ref must have: _current_todos (list) to store the latest list.
+    agent_ref must have: _current_todos (list) to store the latest list. With _session_id
+    and session_manager set, the list is saved in the background (_todo_save_task);
+    see flush_todo_saves.
 
     Returns a dict with name, description, parameters, execute_fn for agent.register_tool().
     """
@@ -52,24 +90,20 @@ def create_todo_write_tool(agent_ref: Any) -> dict:
     async def execute_todo_write(todos: List[Any]) -> str:
         if not isinstance(todos, list):
             return "Error: todos must be a list."
-        serialized = []
-        for item in todos:
-            if isinstance(item, TodoItem):
-                serialized.append(item.model_dump())
-            elif isinstance(item, dict):
-                serialized.append(
-                    {
-                        "id": item.get("id"),
-                        "content": item.get("content", ""),
-                        "status": item.get("status", "pending"),
-                    }
-                )
-            else:
-                serialized.append({"id": None, "content": str(item), "status": "pending"})
+        serialized = [_serialize_item(item) for item in todos]
         agent_ref._current_todos = serialized
         session_id = getattr(agent_ref, "_session_id", None)
         if session_id and getattr(agent_ref, "session_manager", None):
-            await agent_ref.session_manager.save_todos(session_id, serialized)
+            # The reply does not depend on the write: keep it off the tool call's path
+            previous = getattr(agent_ref, "_todo_save_task", None)
+            agent_ref._todo_save_task = asyncio.create_task(
+                _save_todos_after(
+                    previous if isinstance(previous, asyncio.Task) else None,
+                    agent_ref.session_manager,
+                    session_id,
+                    serialized,
+                )
+            )
         n = len(serialized)
         return f"Todo list updated ({n} item{'s' if n != 1 else ''})."
 
@@ -81,4 +115,10 @@ def create_todo_write_tool(agent_ref: Any) -> dict:
     }
 
 
-__all__ = ["TodoItem", "TodoStatus", "TodoWriteParams", "create_todo_write_tool"]
+__all__ = [
+    "TodoItem",
+    "TodoStatus",
+    "TodoWriteParams",
+    "create_todo_write_tool",
+    "flush_todo_saves",
+]
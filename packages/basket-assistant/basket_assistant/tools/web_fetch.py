@@ -4,12 +4,16 @@ Web Fetch tool - Fetch content from a URL (GET only, read-only).
 Returns readable text; HTML is converted to Markdown.
 """
 
+import asyncio
 import logging
-from typing import Optional
+import re
+from typing import Dict, List, Optional, Tuple
 
 import httpx
 from pydantic import BaseModel, Field
 
+from .http_client import get_client
+
 logger = logging.getLogger(__name__)
 
 # Optional html2text; use only when content is HTML
@@ -18,10 +22,38 @@ try:
 except ImportError:
     html2text = None  # type: ignore
 
+# Optional C-backed HTML parser (extra: fast-html); preferred over html2text when installed
+try:
+    from selectolax.lexbor import LexborHTMLParser as _HTMLParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as _HTMLParser
+    except ImportError:
+        _HTMLParser = None  # type: ignore
+
 DEFAULT_TIMEOUT = 15.0
 DEFAULT_MAX_CHARS = 100_000
+# HTML shrinks a lot when converted to Markdown: read up to this many times max_chars of it
+HTML_READ_FACTOR = 10
+READ_CHUNK_SIZE = 65536
 USER_AGENT = "Basket-Assistant/1.0 (read-only; no auth)"
 
+# (url, max_chars) -> (ETag, Last-Modified, result text) for responses that carry a
+# validator; revalidated with a conditional GET, a 304 reuses the text. Oldest evicted first.
+_CACHE_MAX = 64
+_cache: Dict[Tuple[str, int], Tuple[Optional[str], Optional[str], str]] = {}
+
+
+def _remember(key: Tuple[str, int], response: httpx.Response, text: str) -> None:
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if etag is None and last_modified is None:
+        _cache.pop(key, None)
+        return
+    if key not in _cache and len(_cache) >= _CACHE_MAX:
+        del _cache[next(iter(_cache))]
+    _cache[key] = (etag, last_modified, text)
+
 
 class WebFetchParams(BaseModel):
     """Parameters for the Web Fetch tool."""
@@ -57,13 +89,26 @@ async def web_fetch(
     if max_chars <= 0:
         max_chars = DEFAULT_MAX_CHARS
 
+    key = (url, max_chars)
+    cached = _cache.get(key)
+    headers = {"User-Agent": USER_AGENT}
+    if cached is not None:
+        if cached[0] is not None:
+            headers["If-None-Match"] = cached[0]
+        if cached[1] is not None:
+            headers["If-Modified-Since"] = cached[1]
+
     try:
-        async with httpx.AsyncClient(
-            follow_redirects=True,
-            timeout=DEFAULT_TIMEOUT,
-            headers={"User-Agent": USER_AGENT},
-        ) as client:
-            response = await client.get(url)
+        async with get_client().stream(
+            "GET", url, headers=headers, follow_redirects=True, timeout=DEFAULT_TIMEOUT
+        ) as response:
+            if response.status_code == 304 and cached is not None:
+                return cached[2]
+            if response.status_code >= 400:
+                return f"Error: HTTP {response.status_code} for {url}."
+            is_html = "text/html" in (response.headers.get("content-type") or "").lower()
+            limit = max_chars * HTML_READ_FACTOR if is_html else max_chars
+            text, cut = await _read_text(response, limit)
     except httpx.TimeoutException:
         logger.debug("Web fetch timeout: %s", url)
         return f"Error: Request timed out after {DEFAULT_TIMEOUT}s."
@@ -72,28 +117,116 @@ async def web_fetch(
     except httpx.RequestError as e:
         return f"Error: Request failed ({type(e).__name__}): {e!s}."
 
-    if response.status_code >= 400:
-        return f"Error: HTTP {response.status_code} for {url}."
-
-    content_type = (response.headers.get("content-type") or "").lower()
-    raw = response.content
+    if is_html and (_HTMLParser is not None or html2text is not None):
+        # HTML conversion is CPU-bound: keep it off the event loop
+        text = await asyncio.to_thread(_html_to_markdown, text)
 
-    if "text/html" in content_type:
-        if html2text is None:
-            text = raw.decode("utf-8", errors="replace")
-        else:
-            h2t = html2text.HTML2Text()
-            h2t.ignore_links = False
-            h2t.ignore_images = True
-            text = h2t.handle(raw.decode("utf-8", errors="replace"))
-    else:
-        text = raw.decode("utf-8", errors="replace")
-
-    if len(text) > max_chars:
+    if cut or len(text) > max_chars:
         text = text[:max_chars] + "\n\n[Content truncated due to max_chars limit.]"
+    _remember(key, response, text)
     return text
 
 
+async def _read_text(response: httpx.Response, limit: int) -> tuple[str, bool]:
+    """Decode the streamed body, stopping once more than limit chars arrived; (text, cut)."""
+    parts = []
+    size = 0
+    async for chunk in response.aiter_text(chunk_size=READ_CHUNK_SIZE):
+        parts.append(chunk)
+        size += len(chunk)
+        if size > limit:
+            return "".join(parts), True
+    return "".join(parts), False
+
+
+# Not rendered: non-content elements, images (as with html2text) and comments (both backends)
+_SKIP_TAGS = frozenset(
+    ("script", "style", "noscript", "template", "svg", "head", "img", "-comment", "_comment")
+)
+_BLOCK_TAGS = frozenset(
+    ("p", "div", "section", "article", "main", "header", "footer", "nav", "aside",
+     "blockquote", "table", "tr", "ul", "ol", "dl", "form", "figure", "hr")
+)
+_HEADINGS = {"h1": "# ", "h2": "## ", "h3": "### ", "h4": "#### ", "h5": "##### ", "h6": "###### "}
+_WS_RE = re.compile(r"\s+")
+_BLANK_LINES_RE = re.compile(r"\n[ \t]*(?:\n[ \t]*)+")
+
+
+def _render_node(node, out: List[str]) -> None:
+    """Append Markdown-ish text for node's children (selectolax Node) to out."""
+    for child in node.iter(include_text=True):
+        tag = child.tag
+        if tag == "-text":
+            out.append(_WS_RE.sub(" ", child.text(deep=False)))
+        elif tag in _SKIP_TAGS:
+            continue
+        elif tag in _HEADINGS:
+            out.append("\n\n" + _HEADINGS[tag])
+            _render_node(child, out)
+            out.append("\n\n")
+        elif tag in _BLOCK_TAGS:
+            out.append("\n\n")
+            _render_node(child, out)
+            out.append("\n\n")
+        elif tag == "br":
+            out.append("\n")
+        elif tag in ("td", "th"):
+            out.append(" ")
+            _render_node(child, out)
+            out.append(" ")
+        elif tag == "li":
+            out.append("\n* ")
+            _render_node(child, out)
+        elif tag == "pre":
+            out.append("\n\n```\n" + child.text(deep=True).strip("\n") + "\n```\n\n")
+        elif tag == "code":
+            out.append("`" + child.text(deep=True) + "`")
+        elif tag in ("strong", "b"):
+            out.append("**")
+            _render_node(child, out)
+            out.append("**")
+        elif tag in ("em", "i"):
+            out.append("_")
+            _render_node(child, out)
+            out.append("_")
+        elif tag == "a" and child.attributes.get("href"):
+            out.append("[")
+            _render_node(child, out)
+            out.append("](" + child.attributes["href"] + ")")
+        else:
+            _render_node(child, out)
+
+
+def _selectolax_to_markdown(html: str) -> str:
+    tree = _HTMLParser(html)
+    out: List[str] = []
+    _render_node(tree.body or tree.root, out)
+    lines: List[str] = []
+    in_fence = False
+    for line in _BLANK_LINES_RE.sub("\n\n", "".join(out)).split("\n"):
+        if line.strip() == "```":
+            in_fence = not in_fence
+            lines.append("```")
+        else:
+            # Keep indentation inside code blocks; elsewhere it is collapsed whitespace
+            lines.append(line.rstrip() if in_fence else line.strip())
+    return "\n".join(lines).strip() + "\n"
+
+
+def _html_to_markdown(html: str) -> str:
+    if _HTMLParser is not None:
+        try:
+            return _selectolax_to_markdown(html)
+        except RecursionError:  # pathologically nested markup
+            logger.debug("HTML too deeply nested for selectolax conversion; falling back")
+    if html2text is None:
+        return html
+    h2t = html2text.HTML2Text()
+    h2t.ignore_links = False
+    h2t.ignore_images = True
+    return h2t.handle(html)
+
+
 # Tool definition for pi-agent
 WEB_FETCH_TOOL = {
     "name": "web_fetch",
@@ -11,10 +11,13 @@ from typing import Any, Optional
 import httpx
 from pydantic import BaseModel, Field
 
+from .http_client import get_client
+
 logger = logging.getLogger(__name__)
 
 SERPER_URL = "https://google.serper.dev/search"
 DEFAULT_NUM_RESULTS = 5
+SERPER_TIMEOUT = 15.0
 
 
 class WebSearchParams(BaseModel):
@@ -60,12 +63,12 @@ async def _search_duckduckgo(search_term: str, num_results: int) -> str:
 
 async def _search_serper(search_term: str, num_results: int, api_key: str) -> str:
     try:
-        async with httpx.AsyncClient(timeout=15.0) as client:
-            response = await client.post(
-                SERPER_URL,
-                json={"q": search_term, "num": min(num_results, 10)},
-                headers={"X-API-KEY": api_key, "Content-Type": "application/json"},
-            )
+        response = await get_client().post(
+            SERPER_URL,
+            json={"q": search_term, "num": min(num_results, 10)},
+            headers={"X-API-KEY": api_key, "Content-Type": "application/json"},
+            timeout=SERPER_TIMEOUT,
+        )
     except httpx.RequestError as e:
         logger.debug("Serper request failed: %s", e)
         return f"Error: Serper request failed ({type(e).__name__}): {e!s}."
@@ -4,7 +4,10 @@ Example Extension: Git Helper
 Adds convenient git operations as tools and commands.
 """
 
+import asyncio
+import os
 import subprocess
+import time
 from pydantic import BaseModel, Field
 
 
@@ -22,6 +25,56 @@ class GitBranchParams(BaseModel):
     create: bool = Field(default=False, description="Create the branch if it doesn't exist")
 
 
+# Stage everything and commit in one spawn; the message is passed as $1, never parsed by sh
+_ADD_AND_COMMIT = 'git add -A && git commit -m "$1"'
+
+
+async def _run(*argv: str, timeout: float = 10) -> subprocess.CompletedProcess:
+    """Run argv without blocking the event loop; raises asyncio.TimeoutError after timeout."""
+    proc = await asyncio.create_subprocess_exec(
+        *argv,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=timeout)
+    except asyncio.TimeoutError:
+        proc.kill()
+        await proc.wait()
+        raise
+    return subprocess.CompletedProcess(
+        list(argv),
+        proc.returncode,
+        stdout.decode(errors="replace"),
+        stderr.decode(errors="replace"),
+    )
+
+
+async def _run_git(*args: str, timeout: float = 10) -> subprocess.CompletedProcess:
+    return await _run("git", *args, timeout=timeout)
+
+
+# (cwd, argv) -> (time.monotonic() when run, result) for /git-status and /git-log.
+# Entries expire after _CACHE_TTL seconds and are dropped whenever a tool that can change
+# the worktree or history runs.
+_CACHE_TTL = 5.0
+_git_cache: dict = {}
+_MUTATING_TOOLS = frozenset({"write", "edit", "bash"})
+
+
+def _run_cached(argv: list, timeout: float = 5) -> subprocess.CompletedProcess:
+    """subprocess.run(argv) with recent successful results reused."""
+    key = (os.getcwd(), tuple(argv))
+    cached = _git_cache.get(key)
+    now = time.monotonic()
+    if cached is not None and now - cached[0] < _CACHE_TTL:
+        return cached[1]
+    result = subprocess.run(argv, capture_output=True, text=True, timeout=timeout)
+    if result.returncode == 0:
+        _git_cache[key] = (now, result)
+    return result
+
+
 def setup(basket):
     """
     Extension setup function.
@@ -38,31 +91,20 @@ def setup(basket):
     async def git_commit_tool(message: str, add_all: bool = True) -> str:
         """Create a git commit."""
         try:
-            # Stage changes
             if add_all:
-                result = subprocess.run(
-                    ["git", "add", "-A"],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                )
-                if result.returncode != 0:
-                    return f"❌ Git add failed: {result.stderr}"
-
-            # Commit
-            result = subprocess.run(
-                ["git", "commit", "-m", message],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
+                # Stage changes and commit
+                result = await _run("sh", "-c", _ADD_AND_COMMIT, "sh", message)
+            else:
+                result = await _run_git("commit", "-m", message)
+            _git_cache.clear()
 
             if result.returncode == 0:
                 return f"✅ Committed: {message}\n{result.stdout}"
             else:
-                return f"❌ Commit failed: {result.stderr}"
+                # git reports "nothing to commit" on stdout
+                return f"❌ Commit failed: {result.stderr or result.stdout}"
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return "❌ Git operation timed out"
         except Exception as e:
             return f"❌ Git error: {e}"
@@ -77,27 +119,18 @@ def setup(basket):
         try:
             if create:
                 # Create and switch
-                result = subprocess.run(
-                    ["git", "checkout", "-b", branch_name],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                )
+                result = await _run_git("checkout", "-b", branch_name)
             else:
                 # Just switch
-                result = subprocess.run(
-                    ["git", "checkout", branch_name],
-                    capture_output=True,
-                    text=True,
-                    timeout=10,
-                )
+                result = await _run_git("checkout", branch_name)
+            _git_cache.clear()
 
             if result.returncode == 0:
                 return f"✅ Switched to branch: {branch_name}\n{result.stdout}"
             else:
                 return f"❌ Branch switch failed: {result.stderr}"
 
-        except subprocess.TimeoutExpired:
+        except asyncio.TimeoutError:
             return "❌ Git operation timed out"
         except Exception as e:
             return f"❌ Git error: {e}"
@@ -106,12 +139,7 @@ def setup(basket):
     def git_status_command(args: str):
         """Show git status."""
         try:
-            result = subprocess.run(
-                ["git", "status", "--short"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
+            result = _run_cached(["git", "status", "--short"])
             if result.returncode == 0:
                 print("📊 Git Status:")
                 print(result.stdout if result.stdout else "  (no changes)")
@@ -125,12 +153,7 @@ def setup(basket):
         """Show recent git log."""
         count = args.strip() or "5"
         try:
-            result = subprocess.run(
-                ["git", "log", f"-{count}", "--oneline"],
-                capture_output=True,
-                text=True,
-                timeout=5,
-            )
+            result = _run_cached(["git", "log", f"-{count}", "--oneline"])
             if result.returncode == 0:
                 print(f"📜 Recent {count} commits:")
                 print(result.stdout)
@@ -139,14 +162,23 @@ def setup(basket):
         except Exception as e:
             print(f"❌ Git error: {e}")
 
+    @basket.register_command("/git-cache-clear")
+    def git_cache_clear_command(args: str):
+        """Forget cached /git-status and /git-log output."""
+        _git_cache.clear()
+        print("🧹 Git cache cleared")
+
     # Event handler to track git operations
     @basket.on("agent_tool_call_start")
     async def on_git_tool(event, ctx=None):
-        """Log git tool usage."""
+        """Log git tool usage; drop cached status/log when a tool may change the repo."""
         tool_name = event.get("tool_name")
         if tool_name and tool_name.startswith("git_"):
+            _git_cache.clear()
             print(f"🔧 Git operation: {tool_name}")
+        elif tool_name in _MUTATING_TOOLS:
+            _git_cache.clear()
 
     print("✅ Git helper extension loaded!")
     print("   Tools: git_commit, git_branch")
-    print("   Commands: /git-status, /git-log")
+    print("   Commands: /git-status, /git-log, /git-cache-clear")
@@ -3,41 +3,52 @@ Shared pytest fixtures for pi-assistant tests.
 """
 
 import asyncio
-import tempfile
+import os
 from pathlib import Path
+from types import SimpleNamespace
 from typing import Any, Dict, List
-from unittest.mock import AsyncMock, MagicMock, Mock
 
 import pytest
-from basket_agent import Agent
-from basket_ai.types import AssistantMessage, Context, TextContent, ToolCall
 
-from basket_assistant.agent import CodingAgent
 from basket_assistant.core import SettingsManager
 
 
+# Sample project tree: path relative to the project root -> content
+_SAMPLE_PROJECT_FILES = {
+    "test.txt": "Hello, World!\nThis is a test file.",
+    "example.py": "def hello():\n    print('Hello')\n",
+    "README.md": "# Test Project\n\nThis is a test.",
+    "subdir/nested.txt": "Nested file content",
+}
+
+
+def _bulk_write(root: Path, files: Dict[str, str]) -> None:
+    """Write files (relative path -> text) under root in one pass with raw os calls."""
+    root_str = str(root)
+    made = set()
+    for rel, text in files.items():
+        path = os.path.join(root_str, rel)
+        parent = os.path.dirname(path)
+        if parent not in made:
+            os.makedirs(parent, exist_ok=True)
+            made.add(parent)
+        fd = os.open(path, os.O_CREAT | os.O_WRONLY | os.O_TRUNC, 0o644)
+        try:
+            os.write(fd, text.encode("utf-8"))
+        finally:
+            os.close(fd)
+
+
 @pytest.fixture
-def temp_project_dir():
+def temp_project_dir(tmp_path):
     """
     Create a temporary directory with sample files for testing.
 
-    Returns a Path object to the temporary directory.
-    The directory is automatically cleaned up after the test.
+    Returns tmp_path populated with the sample files; pytest removes old
+    tmp_path trees itself, keeping only the most recent runs.
     """
-    with tempfile.TemporaryDirectory() as tmpdir:
-        tmpdir_path = Path(tmpdir)
-
-        # Create sample files
-        (tmpdir_path / "test.txt").write_text("Hello, World!\nThis is a test file.")
-        (tmpdir_path / "example.py").write_text("def hello():\n    print('Hello')\n")
-        (tmpdir_path / "README.md").write_text("# Test Project\n\nThis is a test.")
-
-        # Create subdirectory with files
-        subdir = tmpdir_path / "subdir"
-        subdir.mkdir()
-        (subdir / "nested.txt").write_text("Nested file content")
-
-        yield tmpdir_path
+    _bulk_write(tmp_path, _SAMPLE_PROJECT_FILES)
+    return tmp_path
 
 
 @pytest.fixture
@@ -72,47 +83,57 @@ def create_mock_llm_stream(responses: List[Dict[str, Any]]):
     return mock_stream
 
 
+# Canned stream events; fixtures hand out fresh lists over these shared (read-only) events
+_TEXT_RESPONSE = (
+    {"type": "message_start"},
+    {"type": "content_block_start", "index": 0, "content_block": {"type": "text"}},
+    {"type": "text_delta", "delta": "Hello! "},
+    {"type": "text_delta", "delta": "I can help you."},
+    {"type": "content_block_end", "index": 0},
+    {"type": "message_end"},
+)
+
+_TOOL_CALL_RESPONSE = (
+    {"type": "message_start"},
+    # Text before tool call
+    {"type": "content_block_start", "index": 0, "content_block": {"type": "text"}},
+    {"type": "text_delta", "delta": "I'll read the file for you."},
+    {"type": "content_block_end", "index": 0},
+    # Tool use block
+    {
+        "type": "content_block_start",
+        "index": 1,
+        "content_block": {
+            "type": "tool_use",
+            "id": "tool_123",
+            "name": "read",
+            "input": {},
+        },
+    },
+    {"type": "tool_use_delta", "delta": {"file_path": "/test/file.txt"}},
+    {"type": "content_block_end", "index": 1},
+    {"type": "message_end"},
+)
+
+
 @pytest.fixture
 def mock_text_response():
     """
     Create a mock LLM response with just text (no tool calls).
+
+    The list is new per test; the event dicts are shared, so do not mutate them.
     """
-    return [
-        {"type": "message_start"},
-        {"type": "content_block_start", "index": 0, "content_block": {"type": "text"}},
-        {"type": "text_delta", "delta": "Hello! "},
-        {"type": "text_delta", "delta": "I can help you."},
-        {"type": "content_block_end", "index": 0},
-        {"type": "message_end"},
-    ]
+    return list(_TEXT_RESPONSE)
 
 
 @pytest.fixture
 def mock_tool_call_response():
     """
     Create a mock LLM response that includes a tool call.
+
+    The list is new per test; the event dicts are shared, so do not mutate them.
     """
-    return [
-        {"type": "message_start"},
-        # Text before tool call
-        {"type": "content_block_start", "index": 0, "content_block": {"type": "text"}},
-        {"type": "text_delta", "delta": "I'll read the file for you."},
-        {"type": "content_block_end", "index": 0},
-        # Tool use block
-        {
-            "type": "content_block_start",
-            "index": 1,
-            "content_block": {
-                "type": "tool_use",
-                "id": "tool_123",
-                "name": "read",
-                "input": {},
-            },
-        },
-        {"type": "tool_use_delta", "delta": {"file_path": "/test/file.txt"}},
-        {"type": "content_block_end", "index": 1},
-        {"type": "message_end"},
-    ]
+    return list(_TOOL_CALL_RESPONSE)
 
 
 @pytest.fixture
@@ -120,10 +141,7 @@ def mock_model():
     """
     Create a mock Model object for testing.
     """
-    model = MagicMock()
-    model.provider = "mock"
-    model.model_id = "mock-model"
-    return model
+    return SimpleNamespace(provider="mock", model_id="mock-model")
 
 
 @pytest.fixture
@@ -131,9 +149,16 @@ def mock_agent(mock_model):
     """
     Create a mock Agent instance.
     """
+    from basket_agent import Agent
+    from basket_ai.types import Context
+
     context = Context(systemPrompt="Test prompt", messages=[])
     agent = Agent(mock_model, context)
-    agent.run = AsyncMock(return_value=MagicMock(context=context))
+
+    async def run(*args, **kwargs):
+        return SimpleNamespace(context=context)
+
+    agent.run = run
     return agent
 
 
@@ -147,16 +172,17 @@ async def mock_coding_agent(tmp_path, mock_settings_manager, monkeypatch):
     - Mocks the LLM model to avoid API calls
     - Provides a fully initialized agent with all tools registered
     """
+    from basket_ai import api
+
+    from basket_assistant.agent import CodingAgent
+
     # Mock get_model to return a mock model
-    mock_model = MagicMock()
-    mock_model.provider = "mock"
-    mock_model.model_id = "mock-model"
+    mock_model = SimpleNamespace(provider="mock", model_id="mock-model")
 
     def mock_get_model(*args, **kwargs):
         return mock_model
 
     # Patch get_model at the import location
-    from basket_ai import api
     monkeypatch.setattr(api, "get_model", mock_get_model)
 
     # Create agent with test settings (persist sessions_dir so load() sees it)
@@ -173,7 +199,7 @@ def sample_context():
     """
     Create a sample Context with a few messages.
     """
-    from basket_ai.types import UserMessage
+    from basket_ai.types import AssistantMessage, Context, TextContent, UserMessage
 
     return Context(
         systemPrompt="You are a helpful assistant.",
@@ -210,12 +236,3 @@ def mock_stream_with_tool_call(monkeypatch):
         }
 
     monkeypatch.setattr(api, "stream", mock_stream)
-
-
-# Configure pytest markers
-def pytest_configure(config):
-    """Register custom markers."""
-    config.addinivalue_line("markers", "unit: Unit tests for individual components")
-    config.addinivalue_line("markers", "integration: Integration tests for component interaction")
-    config.addinivalue_line("markers", "e2e: End-to-end tests for complete workflows")
-    config.addinivalue_line("markers", "slow: Tests that take a long time to run")
@@ -5,6 +5,14 @@ from pathlib import Path
 
 from basket_assistant.core import load_agents_from_dirs, SubAgentConfig
 
+# Agent file payloads, written as-is with write_bytes
+_EXPLORE_MD = b"---\ndescription: Fast codebase exploration\n---\n\nYou explore codebases. Be concise."
+_GENERAL_MD = (
+    b"---\ndescription: General assistant\nprompt: Use this as system prompt.\n---\n\nBody text here."
+)
+_EXPLORE_FIRST_MD = b"---\ndescription: First\n---\n\nPrompt one."
+_EXPLORE_SECOND_MD = b"---\ndescription: Second\n---\n\nPrompt two."
+
 
 def test_load_agents_from_dirs_empty_dirs():
     """Empty dir list or non-existent dirs returns empty dict."""
@@ -14,10 +22,7 @@ def test_load_agents_from_dirs_empty_dirs():
 
 def test_load_agents_from_dirs_single_md(tmp_path):
     """Single .md file: stem = name, body as prompt when frontmatter has no prompt."""
-    (tmp_path / "explore.md").write_text(
-        "---\ndescription: Fast codebase exploration\n---\n\nYou explore codebases. Be concise.",
-        encoding="utf-8",
-    )
+    (tmp_path / "explore.md").write_bytes(_EXPLORE_MD)
     result = load_agents_from_dirs([tmp_path])
     assert "explore" in result
     cfg = result["explore"]
@@ -30,10 +35,7 @@ def test_load_agents_from_dirs_single_md(tmp_path):
 
 def test_load_agents_from_dirs_frontmatter_prompt(tmp_path):
     """When frontmatter has prompt, it overrides body for prompt."""
-    (tmp_path / "general.md").write_text(
-        "---\ndescription: General assistant\nprompt: Use this as system prompt.\n---\n\nBody text here.",
-        encoding="utf-8",
-    )
+    (tmp_path / "general.md").write_bytes(_GENERAL_MD)
     result = load_agents_from_dirs([tmp_path])
     assert result["general"].prompt == "Use this as system prompt."
 
@@ -44,14 +46,8 @@ def test_load_agents_from_dirs_same_name_later_overrides(tmp_path):
     d2 = tmp_path / "d2"
     d1.mkdir()
     d2.mkdir()
-    (d1 / "explore.md").write_text(
-        "---\ndescription: First\n---\n\nPrompt one.",
-        encoding="utf-8",
-    )
-    (d2 / "explore.md").write_text(
-        "---\ndescription: Second\n---\n\nPrompt two.",
-        encoding="utf-8",
-    )
+    (d1 / "explore.md").write_bytes(_EXPLORE_FIRST_MD)
+    (d2 / "explore.md").write_bytes(_EXPLORE_SECOND_MD)
     result = load_agents_from_dirs([d1, d2])
     assert result["explore"].description == "Second"
     assert "Prompt two" in result["explore"].prompt
@@ -66,3 +62,79 @@ def test_load_agents_skips_underscore_prefix(tmp_path):
     result = load_agents_from_dirs([tmp_path])
     assert "_private" not in result
     assert len(result) == 0
+
+
+def test_load_agents_skips_directories_and_other_suffixes(tmp_path):
+    """Only regular *.md files are loaded; a directory named *.md or a .txt file is ignored."""
+    (tmp_path / "nested.md").mkdir()
+    (tmp_path / "notes.txt").write_text("---\ndescription: no\n---\n\nNot an agent.", encoding="utf-8")
+    (tmp_path / "review.md").write_text("---\ndescription: Review\n---\n\nReview code.", encoding="utf-8")
+    assert list(load_agents_from_dirs([tmp_path])) == ["review"]
+
+
+def test_load_agents_reuses_unchanged_files(tmp_path, monkeypatch):
+    """Agent files are parsed once; an edited file (new mtime/size) is parsed again."""
+    import os
+
+    from basket_assistant.core import agents_loader
+
+    parsed = []
+    real_parse = agents_loader._parse_agent_file
+
+    def counting_parse(path):
+        parsed.append(path.name)
+        return real_parse(path)
+
+    monkeypatch.setattr(agents_loader, "_parse_agent_file", counting_parse)
+    monkeypatch.setattr(agents_loader, "_file_cache", {})
+    agent_file = tmp_path / "review.md"
+    agent_file.write_text("---\ndescription: Review\n---\n\nReview code.", encoding="utf-8")
+    (tmp_path / "empty.md").write_text("---\ndescription: Nothing\n---\n", encoding="utf-8")
+
+    first = load_agents_from_dirs([tmp_path])
+    assert list(first) == ["review"]
+    assert load_agents_from_dirs([tmp_path])["review"] is first["review"]
+    assert sorted(parsed) == ["empty.md", "review.md"]
+
+    agent_file.write_text("---\ndescription: Review\n---\n\nReview all code.", encoding="utf-8")
+    stat = agent_file.stat()
+    os.utime(agent_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert load_agents_from_dirs([tmp_path])["review"].prompt == "Review all code."
+    assert sorted(parsed) == ["empty.md", "review.md", "review.md"]
+
+
+def test_load_agents_parses_many_files_in_dir_order(tmp_path, monkeypatch):
+    """Several uncached files are parsed together; later dirs still override earlier ones."""
+    from basket_assistant.core import agents_loader
+
+    monkeypatch.setattr(agents_loader, "_file_cache", {})
+    d1 = tmp_path / "d1"
+    d2 = tmp_path / "d2"
+    d1.mkdir()
+    d2.mkdir()
+    for i in range(5):
+        (d1 / f"agent{i}.md").write_bytes(b"---\ndescription: D1\n---\n\nFrom d1.")
+    (d2 / "agent3.md").write_bytes(_EXPLORE_SECOND_MD)
+    result = load_agents_from_dirs([d1, d2])
+    assert sorted(result) == [f"agent{i}" for i in range(5)]
+    assert result["agent3"].description == "Second"
+    assert result["agent0"].description == "D1"
+    assert len(agents_loader._file_cache) == 6
+
+
+def test_parse_agent_frontmatter_keys_continuations_and_body():
+    """Frontmatter keys, indented continuation lines and model/tools maps are parsed."""
+    from basket_assistant.core.agents_loader import _parse_frontmatter_and_body
+
+    fm, body = _parse_frontmatter_and_body(
+        "---\nDescription: 'Reviewer'\nprompt:\n  Line one\n  line two\n"
+        "model: provider: openai, model_id: gpt-4o\ntools: read:true, bash:no\n---\n\nBody --- text"
+    )
+    assert fm == {
+        "description": "Reviewer",
+        "prompt": "Line one\nline two",
+        "model": {"provider": "openai", "model_id": "gpt-4o"},
+        "tools": {"read": True, "bash": False},
+    }
+    assert body == "Body --- text"
+    assert _parse_frontmatter_and_body("---\nno closing") == ({}, "---\nno closing")
@@ -6,6 +6,7 @@ with the pi-agent and pi-ai packages to provide full functionality.
 """
 
 import asyncio
+import sys
 from pathlib import Path
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -96,6 +97,134 @@ class TestCodingAgentIntegration:
         names = [t["name"] for t in filtered]
         assert set(names) == {"read", "grep"}, "Only whitelisted read and grep should be enabled"
 
+    @pytest.mark.asyncio
+    async def test_filter_tools_for_subagent_reuses_cached_tuples(self, mock_coding_agent):
+        """Repeated filtering for the same allow-set returns the same cached tuple."""
+        cfg = SubAgentConfig(description="A", prompt="p", tools={"read": True, "bash": False})
+        same = SubAgentConfig(description="B", prompt="q", tools={"read": True})
+        first = mock_coding_agent._filter_tools_for_subagent(cfg)
+        assert [t["name"] for t in first] == ["read"]
+        assert mock_coding_agent._filter_tools_for_subagent(same) is first
+        all_tools = mock_coding_agent._filter_tools_for_subagent(
+            SubAgentConfig(description="C", prompt="r")
+        )
+        assert all_tools is mock_coding_agent._filter_tools_for_subagent(
+            SubAgentConfig(description="D", prompt="s")
+        )
+        assert {"read", "bash", "skill"}.issubset({t["name"] for t in all_tools})
+
+    @pytest.mark.asyncio
+    async def test_subagent_skill_tool_description_follows_skill_changes(
+        self, mock_coding_agent, tmp_path
+    ):
+        """Cached subagent tools are rebuilt when a skill is added."""
+        mock_coding_agent.settings.skills_dirs = [str(tmp_path)]
+        cfg = SubAgentConfig(description="A", prompt="p")
+        before = mock_coding_agent._filter_tools_for_subagent(cfg)
+        assert mock_coding_agent._filter_tools_for_subagent(cfg) is before
+
+        (tmp_path / "refactor").mkdir()
+        (tmp_path / "refactor" / "SKILL.md").write_text(
+            "---\nname: refactor\ndescription: Refactor code\n---\n\nSteps.",
+            encoding="utf-8",
+        )
+        after = mock_coding_agent._filter_tools_for_subagent(cfg)
+        assert after is not before
+        skill = next(t for t in after if t["name"] == "skill")
+        assert "<name>refactor</name>" in skill["description"]
+
+    @pytest.mark.asyncio
+    async def test_run_subagent_reuses_pooled_agent(self, mock_coding_agent, monkeypatch):
+        """Repeated task calls for the same subagent reuse one Agent with a fresh context."""
+        from basket_agent import Agent
+
+        mock_coding_agent.settings.agents = {
+            "explore": SubAgentConfig(description="E", prompt="p", tools={"read": True}),
+        }
+        seen = []
+
+        async def fake_run(self, stream_llm_events=False):
+            seen.append((self, [m.content for m in self.context.messages]))
+            return MagicMock(context=self.context)
+
+        monkeypatch.setattr(Agent, "run", fake_run)
+        await mock_coding_agent.run_subagent("explore", "first")
+        await mock_coding_agent.run_subagent("explore", "second")
+        assert seen[0][0] is seen[1][0]
+        assert seen[1][1] == ["second"]
+        assert [t.name for t in seen[0][0].context.tools] == ["read"]
+
+    @pytest.mark.asyncio
+    async def test_subagents_share_model_per_provider_and_id(self, mock_coding_agent, monkeypatch):
+        """Subagents naming the same provider/model_id share one model instance."""
+        from basket_assistant.agent import tools as tools_module
+
+        created = []
+
+        def fake_get_model(provider, model_id, **kwargs):
+            created.append((provider, model_id))
+            return MagicMock()
+
+        monkeypatch.setattr(tools_module, "get_model", fake_get_model)
+        model_cfg = {"provider": "openai", "model_id": "small"}
+        mock_coding_agent.settings.agents = {
+            "a": SubAgentConfig(description="A", prompt="p", model=model_cfg),
+            "b": SubAgentConfig(description="B", prompt="p", model=dict(model_cfg)),
+        }
+        agents = mock_coding_agent.settings.agents
+        sub_a = tools_module._acquire_subagent(mock_coding_agent, "a", agents["a"])
+        sub_b = tools_module._acquire_subagent(mock_coding_agent, "b", agents["b"])
+        assert created == [("openai", "small")]
+        assert sub_a.model is sub_b.model
+
+    def test_default_skills_dirs_deduplicated_when_cwd_is_home(
+        self, mock_coding_agent, monkeypatch, tmp_path
+    ):
+        """Default dirs under home and cwd collapse to one entry each when they coincide."""
+        monkeypatch.setenv("HOME", str(tmp_path))
+        monkeypatch.chdir(tmp_path)
+        mock_coding_agent.settings.skills_dirs = []
+        dirs = mock_coding_agent._get_skills_dirs()
+        assert list(dirs) == [
+            tmp_path / ".basket" / "skills",
+            tmp_path / ".config" / "opencode" / "skills",
+            tmp_path / ".opencode" / "skills",
+            tmp_path / ".claude" / "skills",
+            tmp_path / ".agents" / "skills",
+        ]
+        assert mock_coding_agent._get_skills_dirs() is dirs
+
+    @pytest.mark.asyncio
+    async def test_subagent_configs_reparsed_only_when_agent_files_change(
+        self, mock_coding_agent, monkeypatch, tmp_path
+    ):
+        """Markdown agents are parsed once and re-parsed after an agent file changes."""
+        import os
+
+        from basket_assistant.core import agents_loader
+
+        calls = []
+        real_parse = agents_loader._parse_agent_file
+
+        def counting_parse(path):
+            calls.append(path)
+            return real_parse(path)
+
+        monkeypatch.setattr(agents_loader, "_parse_agent_file", counting_parse)
+        agent_file = tmp_path / "explore.md"
+        agent_file.write_text("---\ndescription: Explore\n---\n\nFirst prompt.", encoding="utf-8")
+        mock_coding_agent.settings.agents_dirs = [str(tmp_path)]
+
+        assert mock_coding_agent._get_subagent_configs()["explore"].prompt == "First prompt."
+        mock_coding_agent._get_subagent_configs()
+        assert len(calls) == 1
+
+        agent_file.write_text("---\ndescription: Explore\n---\n\nSecond prompt.", encoding="utf-8")
+        stat = agent_file.stat()
+        os.utime(agent_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert mock_coding_agent._get_subagent_configs()["explore"].prompt == "Second prompt."
+        assert len(calls) == 2
+
     @pytest.mark.asyncio
     async def test_task_tool_registered_when_agents_configured(self, tmp_path, mock_settings_manager, monkeypatch):
         """When settings contain agents, the task tool is registered."""
@@ -258,6 +387,88 @@ class TestCodingAgentIntegration:
         assert hasattr(mock_coding_agent.agent, "on")
         assert callable(mock_coding_agent.agent.on)
 
+    @pytest.mark.asyncio
+    async def test_text_deltas_flushed_by_turn_end(self, mock_coding_agent, capsys):
+        """Streamed text deltas are buffered and fully written, in order, by agent_turn_end."""
+        for delta in ("Hello", ", ", "world"):
+            await mock_coding_agent.agent._emit_event({"type": "text_delta", "delta": delta})
+        await mock_coding_agent.agent._emit_event({"type": "agent_turn_end"})
+        assert capsys.readouterr().out == "Hello, world"
+
+    @pytest.mark.asyncio
+    async def test_text_delta_tail_flushed_by_timer(self, mock_coding_agent, capsys):
+        """Text without a newline is written after TEXT_FLUSH_INTERVAL with no further events."""
+        from basket_assistant.agent.events import TEXT_FLUSH_INTERVAL
+
+        await mock_coding_agent.agent._emit_event({"type": "text_delta", "delta": "line\n"})
+        await mock_coding_agent.agent._emit_event({"type": "text_delta", "delta": "tail"})
+        assert capsys.readouterr().out == "line\n"
+        await asyncio.sleep(TEXT_FLUSH_INTERVAL * 3)
+        assert capsys.readouterr().out == "tail"
+
+    @pytest.mark.asyncio
+    async def test_trajectory_handlers_forward_to_recorder(self, mock_coding_agent):
+        """Trajectory handlers are registered once and forward events to the active recorder."""
+        mock_coding_agent._ensure_trajectory_handlers()
+        mock_coding_agent._ensure_trajectory_handlers()
+        assert len(mock_coding_agent.agent.event_handlers["agent_complete"]) == 1
+
+        recorder = MagicMock()
+        mock_coding_agent._trajectory_recorder = recorder
+        event = {"type": "agent_complete", "total_turns": 1}
+        await mock_coding_agent.agent._emit_event(event)
+        recorder.on_event.assert_called_once_with(event)
+
+        mock_coding_agent._trajectory_recorder = None
+        await mock_coding_agent.agent._emit_event(event)
+        recorder.on_event.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_trajectory_events_streamed_to_jsonl(self, mock_coding_agent, monkeypatch, tmp_path):
+        """With trajectory_events on, each agent event of the run is appended to a JSONL log."""
+        import json
+
+        monkeypatch.setenv("BASKET_TRAJECTORY_DIR", str(tmp_path))
+        mock_coding_agent.settings.trajectory_events = True
+        mock_coding_agent.context.messages.append(
+            UserMessage(role="user", content="go", timestamp=0)
+        )
+
+        async def mock_run(stream_llm_events=False):
+            await mock_coding_agent.agent._emit_event({"type": "agent_turn_start", "turn_number": 1})
+            await mock_coding_agent.agent._emit_event({"type": "agent_error", "error": "boom"})
+            return None
+
+        monkeypatch.setattr(mock_coding_agent.agent, "run", mock_run)
+        await mock_coding_agent._run_with_trajectory_if_enabled(stream_llm_events=False)
+
+        (log_file,) = tmp_path.glob("task_*.events.jsonl")
+        events = [json.loads(line) for line in log_file.read_text(encoding="utf-8").splitlines()]
+        assert [e["type"] for e in events] == ["agent_turn_start", "agent_error"]
+        assert mock_coding_agent._trajectory_event_log is None
+
+    @pytest.mark.asyncio
+    async def test_trajectory_task_input_from_last_user_message(
+        self, mock_coding_agent, monkeypatch, tmp_path
+    ):
+        """The recorded task input is the user message the run was started with."""
+        from basket_trajectory import TrajectoryRecorder
+
+        monkeypatch.setenv("BASKET_TRAJECTORY_DIR", str(tmp_path))
+        started = []
+        monkeypatch.setattr(
+            TrajectoryRecorder, "start_task", lambda self, text: started.append(text)
+        )
+        monkeypatch.setattr(TrajectoryRecorder, "finalize", lambda self, state: None)
+
+        async def mock_run(stream_llm_events=False):
+            return MagicMock(context=mock_coding_agent.context)
+
+        monkeypatch.setattr(mock_coding_agent.agent, "run", mock_run)
+        await mock_coding_agent.run_once("first")
+        await mock_coding_agent._run_with_trajectory_if_enabled(stream_llm_events=False)
+        assert started == ["first", "first"]
+
     @pytest.mark.asyncio
     async def test_extension_loader_integration(self, mock_coding_agent):
         """Test that extension loader is properly initialized."""
@@ -421,6 +632,159 @@ class TestCodingAgentIntegration:
         assert "read-only" in prompt.lower()
         assert "Analysis" in prompt and "Plan" in prompt
 
+    @pytest.mark.asyncio
+    async def test_system_prompt_for_run_appends_current_skill_content(
+        self, mock_coding_agent, tmp_path
+    ):
+        """Invoked skill content is appended, and edits to SKILL.md show up on the next run."""
+        import os
+
+        mock_coding_agent.settings.skills_dirs = [str(tmp_path)]
+        skill_md = tmp_path / "refactor" / "SKILL.md"
+        skill_md.parent.mkdir()
+        skill_md.write_text("---\nname: refactor\ndescription: R\n---\n\nVersion one.", encoding="utf-8")
+
+        prompt = mock_coding_agent.get_system_prompt_for_run("refactor")
+        assert "## Active skill: refactor" in prompt
+        assert prompt.endswith("Version one.")
+        assert mock_coding_agent.get_system_prompt_for_run("refactor") is prompt
+
+        skill_md.write_text("---\nname: refactor\ndescription: R\n---\n\nVersion two.", encoding="utf-8")
+        stat = skill_md.stat()
+        os.utime(skill_md, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        assert mock_coding_agent.get_system_prompt_for_run("refactor").endswith("Version two.")
+
+    @pytest.mark.asyncio
+    async def test_run_interactive_builtin_commands(self, mock_coding_agent, monkeypatch, capsys):
+        """Built-in commands are dispatched case-insensitively and never reach the agent."""
+        inputs = iter(["/PLAN on", "/todos", "/plan off", "Exit"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+        mock_coding_agent.agent.run = AsyncMock()
+
+        await mock_coding_agent.run_interactive()
+
+        out = capsys.readouterr().out
+        assert "Plan mode on" in out
+        assert "Todo list: full" in out
+        assert "Plan mode off" in out
+        assert "Goodbye!" in out
+        assert mock_coding_agent.get_plan_mode() is False
+        mock_coding_agent.agent.run.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_run_interactive_keeps_event_loop_running_while_waiting_for_input(
+        self, mock_coding_agent, monkeypatch, capsys
+    ):
+        """Input is read off the loop thread, so scheduled callbacks run during the wait."""
+        import asyncio
+        import threading
+
+        mock_coding_agent._session_id = "existing"
+        gate = threading.Event()
+
+        def blocking_input(prompt=""):
+            assert gate.wait(5), "event loop was blocked while waiting for input"
+            return "exit"
+
+        monkeypatch.setattr("builtins.input", blocking_input)
+        asyncio.get_running_loop().call_later(0.01, gate.set)
+
+        await mock_coding_agent.run_interactive()
+
+        assert "Goodbye!" in capsys.readouterr().out
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(sys.platform == "win32", reason="loop signal handlers need Unix")
+    async def test_run_interactive_survives_repeated_ctrl_c_at_prompt(
+        self, mock_coding_agent, monkeypatch, capsys
+    ):
+        """Each Ctrl+C at the prompt reports "Interrupted" and the same read carries on."""
+        import os
+        import signal
+        import threading
+
+        mock_coding_agent._session_id = "existing"
+        gate = threading.Event()
+        reads = []
+
+        def blocking_input(prompt=""):
+            reads.append(prompt)
+            assert gate.wait(5)
+            return "exit"
+
+        monkeypatch.setattr("builtins.input", blocking_input)
+        loop = asyncio.get_running_loop()
+        loop.call_later(0.05, os.kill, os.getpid(), signal.SIGINT)
+        loop.call_later(0.1, os.kill, os.getpid(), signal.SIGINT)
+        loop.call_later(0.15, gate.set)
+        handler_before = signal.getsignal(signal.SIGINT)
+
+        await mock_coding_agent.run_interactive()
+
+        out = capsys.readouterr().out
+        assert out.count("Interrupted. Type 'exit' to quit.") == 2
+        assert "Goodbye!" in out
+        assert reads == ["\n> "]
+        assert signal.getsignal(signal.SIGINT) is handler_before
+
+    @pytest.mark.asyncio
+    async def test_run_interactive_exits_on_eof(self, mock_coding_agent, monkeypatch, capsys):
+        """Ctrl+D (EOFError from input) ends the REPL instead of looping on the error."""
+        mock_coding_agent._session_id = "existing"
+
+        def eof_input(prompt=""):
+            raise EOFError
+
+        monkeypatch.setattr("builtins.input", eof_input)
+        await mock_coding_agent.run_interactive()
+        assert "Goodbye!" in capsys.readouterr().out
+
+    @pytest.mark.asyncio
+    async def test_run_interactive_slash_skill_and_extension_commands(
+        self, mock_coding_agent, monkeypatch, capsys
+    ):
+        """/skill splits id and message; other slash input goes to extension commands."""
+        mock_coding_agent._session_id = "existing"
+        inputs = iter(["/SKILL  refactor  tidy   this up", "/nope x", "exit"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+        runs = []
+
+        async def fake_run(stream_llm_events=True, invoked_skill_id=None, last_user_text=None):
+            runs.append((invoked_skill_id, last_user_text))
+
+        monkeypatch.setattr(mock_coding_agent, "_run_with_trajectory_if_enabled", fake_run)
+
+        await mock_coding_agent.run_interactive()
+
+        assert runs == [("refactor", "tidy   this up")]
+        assert "Unknown command: /nope" in capsys.readouterr().out
+
+    @pytest.mark.asyncio
+    async def test_run_interactive_failed_turn_drops_partial_messages(
+        self, mock_coding_agent, monkeypatch, capsys
+    ):
+        """A failing run keeps earlier history and the user message, dropping only what it appended."""
+        mock_coding_agent._session_id = "existing"
+        earlier = UserMessage(role="user", content="earlier", timestamp=0)
+        mock_coding_agent.context.messages.append(earlier)
+        inputs = iter(["do it", "exit"])
+        monkeypatch.setattr("builtins.input", lambda prompt="": next(inputs))
+
+        async def failing_run(stream_llm_events=False):
+            mock_coding_agent.context.messages.append(
+                UserMessage(role="user", content="partial", timestamp=1)
+            )
+            raise RuntimeError("boom")
+
+        mock_coding_agent.agent.run = failing_run
+
+        await mock_coding_agent.run_interactive()
+
+        messages = mock_coding_agent.context.messages
+        assert messages[0] is earlier
+        assert [m.content for m in messages] == ["earlier", "do it"]
+        assert "Context has been restored" in capsys.readouterr().out
+
 
 @pytest.mark.integration
 class TestGatewayPlanMode:
@@ -452,6 +816,135 @@ class TestGatewayPlanMode:
         assert any(p.get("type") == "plan_mode" and p.get("value") is False for p in events)
 
 
+    @pytest.mark.asyncio
+    async def test_gateway_coalesces_text_deltas_in_order(self, mock_coding_agent, monkeypatch):
+        """Consecutive deltas reach the sink as one event, all delivered before run() returns."""
+        from basket_gateway.gateway import AgentGateway
+
+        events = []
+
+        async def event_sink(payload: dict) -> None:
+            events.append(payload)
+
+        async def fake_run(stream_llm_events=True):
+            emit = mock_coding_agent.agent._emit_event
+            for delta in ("Hel", "lo", ", world"):
+                await emit({"type": "text_delta", "delta": delta})
+            await emit({"type": "agent_tool_call_start", "tool_name": "read", "arguments": {}})
+            await emit({"type": "text_delta", "delta": "done"})
+
+        monkeypatch.setattr(mock_coding_agent, "_run_with_trajectory_if_enabled", fake_run)
+        gateway = AgentGateway(agent_factory=lambda: mock_coding_agent)
+        await gateway.run("default", "hi", event_sink=event_sink)
+        await gateway.aclose()
+
+        assert events == [
+            {"type": "text_delta", "delta": "Hello, world"},
+            {"type": "tool_call_start", "tool_name": "read", "arguments": {}},
+            {"type": "text_delta", "delta": "done"},
+        ]
+
+    @pytest.mark.asyncio
+    async def test_gateway_delivers_every_event_to_a_slow_sink(
+        self, mock_coding_agent, monkeypatch
+    ):
+        """A backlog of events behind a slow client is delivered whole, ending with agent_complete."""
+        from basket_gateway.gateway import AgentGateway
+
+        events = []
+
+        async def slow_sink(payload: dict) -> None:
+            await asyncio.sleep(0)
+            events.append(payload["type"])
+
+        async def fake_run(stream_llm_events=True):
+            emit = mock_coding_agent.agent._emit_event
+            for _ in range(2000):
+                await emit({"type": "agent_tool_call_start", "tool_name": "read", "arguments": {}})
+            await emit({"type": "agent_complete"})
+
+        monkeypatch.setattr(mock_coding_agent, "_run_with_trajectory_if_enabled", fake_run)
+        gateway = AgentGateway(agent_factory=lambda: mock_coding_agent)
+        await gateway.run("default", "hi", event_sink=slow_sink)
+        await gateway.aclose()
+
+        assert len(events) == 2001
+        assert events[-1] == "agent_complete"
+
+    @pytest.mark.asyncio
+    async def test_gateway_handlers_idle_without_sink(self, mock_coding_agent, monkeypatch):
+        """After a streamed run, a run without a sink neither formats results nor queues events."""
+        import basket_gateway.gateway as gateway_mod
+        from basket_gateway.gateway import AgentGateway
+
+        events = []
+        formatted = []
+
+        async def event_sink(payload: dict) -> None:
+            events.append(payload)
+
+        def fake_format(tool_name, result):
+            formatted.append(tool_name)
+            return str(result)
+
+        async def fake_run(stream_llm_events=True):
+            emit = mock_coding_agent.agent._emit_event
+            await emit({"type": "text_delta", "delta": "hi"})
+            await emit({"type": "agent_tool_call_end", "tool_name": "read", "result": "x"})
+
+        monkeypatch.setattr(gateway_mod, "format_tool_result", fake_format)
+        monkeypatch.setattr(mock_coding_agent, "_run_with_trajectory_if_enabled", fake_run)
+        gateway = AgentGateway(agent_factory=lambda: mock_coding_agent)
+        await gateway.run("default", "first", event_sink=event_sink)
+        assert formatted == ["read"] and len(events) == 2
+
+        await gateway.run("default", "second")
+        assert formatted == ["read"] and len(events) == 2
+        assert mock_coding_agent._gateway_event_queue.empty()
+        assert not mock_coding_agent._gateway_delta_batcher._parts
+        await gateway.aclose()
+
+    def test_websocket_endpoint_accepts_text_and_binary_frames(self):
+        """The /ws channel parses text and binary JSON frames; undecodable frames get an error."""
+        from starlette.applications import Starlette
+        from starlette.routing import WebSocketRoute
+        from starlette.testclient import TestClient
+
+        from basket_gateway.channels.websocket import websocket_endpoint
+
+        runs = []
+
+        class FakeGateway:
+            async def run(self, session_id, content, event_sink):
+                runs.append(content)
+                await event_sink({"type": "agent_complete"})
+
+        app = Starlette(routes=[WebSocketRoute("/ws", websocket_endpoint)])
+        app.state.gateway = FakeGateway()
+        with TestClient(app) as client, client.websocket_connect("/ws") as ws:
+            ws.send_text('{"type": "message", "content": "text"}')
+            assert ws.receive_json() == {"type": "agent_complete"}
+            ws.send_bytes('{"type": "message", "content": "bin\u00e9"}'.encode())
+            assert ws.receive_json() == {"type": "agent_complete"}
+            ws.send_bytes(b"\xff\xfe")
+            assert ws.receive_json() == {"type": "agent_error", "error": "Invalid JSON"}
+        assert runs == ["text", "bin\u00e9"]
+
+    def test_encode_event_delta_template_round_trips(self):
+        """Delta events use the prebuilt prefix; every encoded event decodes to the original."""
+        from basket_gateway.codec import encode_event, loads
+
+        delta = {"type": "text_delta", "delta": 'say "hi"\n\u00e9'}
+        encoded = encode_event(delta)
+        assert encoded.startswith('{"type":"text_delta","delta":')
+        for payload in (
+            delta,
+            {"type": "thinking_delta", "delta": ""},
+            {"type": "text_delta", "delta": "x", "extra": 1},
+            {"type": "agent_complete"},
+        ):
+            assert loads(encode_event(payload)) == payload
+
 @pytest.mark.integration
 class TestAskUserQuestionAndResume:
     """ask_user_question tool and pending_asks resume flow."""
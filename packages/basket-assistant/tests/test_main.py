@@ -0,0 +1,254 @@
+"""Tests for the CLI entry point: argument parsing, logging setup and serve commands."""
+
+import asyncio
+import logging
+import logging.handlers
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from basket_assistant.main import (
+    _SERVE_COMMANDS,
+    _BufferedFileHandler,
+    _configure_logging,
+    _fetch_serve_status,
+    _load_settings,
+    _log_dir,
+    _loop_factory,
+    _parse_args,
+    main,
+    _safe_int,
+    _stop_log_listener,
+    _take_flag,
+    _wait_for_exit,
+)
+
+
+def test_parse_args_splits_flags_and_positionals():
+    """Global flags are consumed anywhere; everything else stays in order."""
+    flags, positional = _parse_args(
+        ["--tui", "hello", "--session", "abc", "world", "--debug", "--port", "9000"]
+    )
+    assert flags == {"tui": True, "session": "abc", "debug": True, "port": "9000"}
+    assert positional == ["hello", "world"]
+
+
+def test_parse_args_help_and_version_aliases():
+    """Short and long help/version spellings map to the same parsed key."""
+    assert _parse_args(["-h"]) == ({"help": True}, [])
+    assert _parse_args(["serve", "--version"]) == ({"version": True}, ["serve"])
+    assert _parse_args(["-v"])[0] == {"version": True}
+
+
+def test_main_answers_help_and_version_without_event_loop(monkeypatch, capsys):
+    """main() prints help/version synchronously and never starts asyncio.run."""
+
+    def fail_run(coro):
+        coro.close()
+        raise AssertionError("asyncio.run should not be called")
+
+    monkeypatch.setattr(asyncio, "run", fail_run)
+    monkeypatch.setattr(sys, "argv", ["basket", "--version"])
+    assert main() == 0
+    assert capsys.readouterr().out == "Basket v0.1.0\n"
+    monkeypatch.setattr(sys, "argv", ["basket", "serve", "-h"])
+    assert main() == 0
+    assert "Usage:" in capsys.readouterr().out
+
+
+def test_loop_factory_uses_uvloop_only_for_serve_start(monkeypatch):
+    """serve start runs on uvloop when importable; other commands keep the default loop."""
+    fake_uvloop = type(sys)("uvloop")
+    fake_uvloop.new_event_loop = asyncio.new_event_loop
+    monkeypatch.setitem(sys.modules, "uvloop", fake_uvloop)
+    assert _loop_factory(["serve", "start"]) is asyncio.new_event_loop
+    assert _loop_factory(["serve", "status"]) is None
+    assert _loop_factory([]) is None
+    monkeypatch.setitem(sys.modules, "uvloop", None)
+    assert _loop_factory(["serve", "start"]) is None
+
+
+def test_parse_args_value_flag_without_value_is_dropped():
+    """A value flag at the end of argv is removed without setting a value."""
+    flags, positional = _parse_args(["serve", "status", "--session"])
+    assert flags == {}
+    assert positional == ["serve", "status"]
+
+
+def test_parse_args_leaves_subcommand_options():
+    """Subcommand options such as --foreground and --url are left for the subcommand."""
+    flags, positional = _parse_args(["serve", "attach", "--url", "ws://x/ws", "--plan"])
+    assert flags == {"plan": True}
+    assert positional == ["serve", "attach", "--url", "ws://x/ws"]
+
+
+def test_safe_int_falls_back_on_missing_or_invalid():
+    """Port env values parse as int; unset or malformed values use the default."""
+    assert _safe_int("9000", 7681) == 9000
+    assert _safe_int(None, 7681) == 7681
+    assert _safe_int("", 7681) == 7681
+    assert _safe_int("abc", 7682) == 7682
+
+
+def test_take_flag_removes_option_in_place():
+    """_take_flag consumes a switch or option/value pair from the list it is given."""
+    rest = ["--url", "ws://x/ws", "--foreground"]
+    assert _take_flag(rest, "--url", has_value=True) == "ws://x/ws"
+    assert _take_flag(rest, "--foreground") == "--foreground"
+    assert rest == []
+    dangling = ["--url"]
+    assert _take_flag(dangling, "--url", has_value=True) is None
+    assert dangling == ["--url"]
+
+
+@pytest.mark.asyncio
+async def test_serve_commands_reject_unknown_options(capsys):
+    """Serve subcommands are dispatched by name and validate their own options."""
+    assert set(_SERVE_COMMANDS) == {"start", "stop", "status", "attach"}
+    assert await _SERVE_COMMANDS["start"](["--bogus"]) == 1
+    assert "Usage: basket serve start" in capsys.readouterr().out
+
+
+@pytest.mark.asyncio
+@pytest.mark.skipif(not hasattr(os, "pidfd_open"), reason="pidfd_open not available")
+async def test_wait_for_exit_returns_when_process_exits():
+    """_wait_for_exit resolves on process exit and times out while it is alive."""
+    proc = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(0.2)"])
+    try:
+        assert await _wait_for_exit(proc.pid, 0.01) is False
+        assert await _wait_for_exit(proc.pid, 5.0) is True
+    finally:
+        proc.wait()
+
+
+def test_configure_logging_batches_records_to_file(tmp_path, monkeypatch):
+    """Records go through the queue and reach basket.log once the queue drains."""
+    monkeypatch.delenv("BASKET_LOG_DIR", raising=False)
+    monkeypatch.setenv("HOME", str(tmp_path))
+    log_file = tmp_path / ".basket" / "logs" / "basket.log"
+    root = logging.getLogger()
+    old_level, old_handlers = root.level, list(root.handlers)
+    listener = _configure_logging(logging.INFO)
+    try:
+        assert listener is not None
+        logging.getLogger("basket_test").info("hello from test")
+        # Flushed by the listener without waiting for stop() or a full buffer
+        deadline = time.monotonic() + 5
+        while "hello from test" not in log_file.read_text(encoding="utf-8"):
+            assert time.monotonic() < deadline, "record was not flushed"
+            time.sleep(0.01)
+    finally:
+        _stop_log_listener()
+        for handler in listener.handlers:
+            handler.close()
+        root.handlers[:] = old_handlers
+        root.setLevel(old_level)
+    text = log_file.read_text(encoding="utf-8")
+    assert "basket_test: INFO: hello from test" in text
+
+
+def test_configure_logging_again_stops_previous_listener(tmp_path, monkeypatch):
+    """A second call stops the first listener and leaves only the new one running."""
+    monkeypatch.setenv("BASKET_LOG_DIR", str(tmp_path))
+    root = logging.getLogger()
+    old_level, old_handlers = root.level, list(root.handlers)
+    first = _configure_logging(logging.INFO)
+    second = _configure_logging(logging.INFO)
+    try:
+        assert first is not None and second is not None and first is not second
+        assert first._thread is None
+        assert second._thread is not None
+    finally:
+        _stop_log_listener()
+        for handler in second.handlers:
+            handler.close()
+        root.handlers[:] = old_handlers
+        root.setLevel(old_level)
+    assert second._thread is None
+    _stop_log_listener()
+
+
+def test_buffered_file_handler_writes_on_flush(tmp_path):
+    """Records stay in the handler's buffer until flush, then land in one write."""
+    log_file = tmp_path / "basket.log"
+    handler = _BufferedFileHandler(log_file)
+    try:
+        for i in range(3):
+            handler.handle(logging.makeLogRecord({"msg": f"line {i}", "levelno": logging.INFO}))
+        assert log_file.read_text(encoding="utf-8") == ""
+        handler.flush()
+        assert log_file.read_text(encoding="utf-8") == "line 0\nline 1\nline 2\n"
+    finally:
+        handler.close()
+
+
+def test_log_dir_honours_basket_log_dir(tmp_path, monkeypatch):
+    """BASKET_LOG_DIR overrides the default ~/.basket/logs location."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    monkeypatch.delenv("BASKET_LOG_DIR", raising=False)
+    assert _log_dir() == tmp_path / ".basket" / "logs"
+    monkeypatch.setenv("BASKET_LOG_DIR", str(tmp_path / "custom"))
+    assert _log_dir() == tmp_path / "custom"
+
+
+@pytest.mark.asyncio
+async def test_fetch_serve_status_reads_json_body():
+    """_fetch_serve_status parses a 200 JSON response and returns None on errors."""
+
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        body = b'{"status": "ok", "uptime_seconds": 5, "version": "0.1.0"}'
+        writer.write(
+            b"HTTP/1.0 200 OK\r\nContent-Type: application/json\r\n\r\n" + body
+        )
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    async with server:
+        data = await _fetch_serve_status(port, 2.0)
+    assert data == {"status": "ok", "uptime_seconds": 5, "version": "0.1.0"}
+    assert await _fetch_serve_status(port, 2.0) is None
+
+
+def test_load_settings_reuses_parse_until_file_changes(tmp_path, monkeypatch):
+    """Settings are parsed once per settings.json mtime."""
+    monkeypatch.setenv("HOME", str(tmp_path))
+    settings_file = tmp_path / ".basket" / "settings.json"
+    settings_file.parent.mkdir()
+    settings_file.write_text('{"relay_url": "wss://a/relay"}', encoding="utf-8")
+    first = _load_settings()
+    assert first.relay_url == "wss://a/relay"
+    assert _load_settings() is first
+
+    settings_file.write_text('{"relay_url": "wss://b/relay"}', encoding="utf-8")
+    stat = settings_file.stat()
+    os.utime(settings_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert _load_settings().relay_url == "wss://b/relay"
+
+
+def test_serve_state_roundtrip_and_invalid_files(tmp_path, monkeypatch):
+    """serve.json round-trips; legacy pid/port files are read when it is absent."""
+    from basket_gateway.state import clear_serve_state, read_serve_state, write_serve_state
+
+    monkeypatch.setenv("HOME", str(tmp_path))
+    config_dir = tmp_path / ".basket"
+    assert read_serve_state() == (None, None)
+    write_serve_state(1234, 7681)
+    assert read_serve_state() == (1234, 7681)
+    assert [p.name for p in config_dir.iterdir()] == ["serve.json"]
+
+    (config_dir / "serve.json").write_text("{not json")
+    assert read_serve_state() == (None, None)
+    clear_serve_state()
+
+    (config_dir / "serve.pid").write_text("99")
+    (config_dir / "serve.port").write_text("abc")
+    assert read_serve_state() == (99, None)
+    clear_serve_state()
+    clear_serve_state()
+    assert list(config_dir.iterdir()) == []
@@ -89,3 +89,16 @@ async def test_skill_tool_not_found_respects_include_ids(skill_dir):
     assert "not found" in result.lower()
     assert "refactor" in result
     assert "other" not in result
+
+
+@pytest.mark.asyncio
+async def test_skill_tool_description_shared_until_skills_change(skill_dir):
+    """Repeated registrations reuse one description string; a new skill rebuilds it."""
+    first = create_skill_tool(lambda: [skill_dir])["description"]
+    assert create_skill_tool(lambda: [skill_dir])["description"] is first
+    (skill_dir / "other-skill").mkdir()
+    (skill_dir / "other-skill" / "SKILL.md").write_text(
+        "---\nname: other-skill\ndescription: Another one\n---\n\nBody", encoding="utf-8"
+    )
+    updated = create_skill_tool(lambda: [skill_dir])["description"]
+    assert "<name>other-skill</name>" in updated
@@ -122,3 +122,148 @@ def test_single_file_md_not_discovered(tmp_path):
     index = get_skills_index([tmp_path])
     assert len(index) == 0
     assert get_skill_full_content("refactor", [tmp_path]) == ""
+
+
+def test_skills_index_reparsed_only_when_skill_file_changes(skills_dir, monkeypatch):
+    """Parsed entries are reused until a SKILL.md is edited, added or removed."""
+    from basket_assistant.core import skills_loader
+
+    parsed = []
+    real_parse = skills_loader._parse_frontmatter_and_body
+
+    def counting_parse(text):
+        parsed.append(text)
+        return real_parse(text)
+
+    monkeypatch.setattr(skills_loader, "_parse_frontmatter_and_body", counting_parse)
+    first = get_skills_index([skills_dir])
+    assert len(parsed) == 2
+    assert get_skills_index([skills_dir]) == first
+    assert len(parsed) == 2
+
+    (skills_dir / "git-release" / "SKILL.md").write_text(
+        "---\nname: git-release\ndescription: Cut releases faster than before\n---\n\nBody",
+        encoding="utf-8",
+    )
+    assert dict(get_skills_index([skills_dir]))["git-release"] == "Cut releases faster than before"
+
+    (skills_dir / "new-skill").mkdir()
+    (skills_dir / "new-skill" / "SKILL.md").write_text(
+        "---\nname: new-skill\ndescription: Added later\n---\n", encoding="utf-8"
+    )
+    assert [name for name, _ in get_skills_index([skills_dir])] == [
+        "git-release",
+        "new-skill",
+        "some-skill",
+    ]
+
+
+def test_skill_content_probes_path_without_scanning(skills_dir, tmp_path, monkeypatch):
+    """Content and base-dir lookups stat <dir>/<id>/SKILL.md directly; bad ids never touch disk."""
+    from basket_assistant.core import skills_loader
+
+    def no_scan(dirs):
+        raise AssertionError("skill dirs should not be scanned")
+
+    monkeypatch.setattr(skills_loader, "_scan_skill_files", no_scan)
+    assert "Step 1" in get_skill_full_content("some-skill", [tmp_path / "missing", skills_dir])
+    assert get_skill_base_dir("git-release", [skills_dir]) == skills_dir / "git-release"
+    assert get_skill_full_content("../some-skill", [skills_dir / "git-release"]) == ""
+    assert get_skill_base_dir("nope", [skills_dir]) is None
+
+
+def test_skill_files_parsed_once_across_index_and_content(skills_dir, monkeypatch):
+    """Index and full content share one parse per file; an edit re-reads only that file."""
+    from basket_assistant.core import skills_loader
+
+    parsed = []
+    real_parse = skills_loader._parse_frontmatter_and_body
+
+    def counting_parse(text):
+        parsed.append(text)
+        return real_parse(text)
+
+    monkeypatch.setattr(skills_loader, "_parse_frontmatter_and_body", counting_parse)
+    monkeypatch.setattr(skills_loader, "_file_cache", {})
+    get_skills_index([skills_dir])
+    assert "Step 1" in get_skill_full_content("some-skill", [skills_dir])
+    assert len(parsed) == 2
+
+    (skills_dir / "some-skill" / "SKILL.md").write_text(
+        "---\nname: some-skill\ndescription: Edited\n---\n\nNew body", encoding="utf-8"
+    )
+    assert get_skill_full_content("some-skill", [skills_dir]) == "New body"
+    assert len(parsed) == 3
+
+
+def test_cold_index_reads_files_on_pool_and_caches_them(tmp_path, monkeypatch):
+    """Uncached skill files are read in parallel; results keep dir order and fill the cache."""
+    from basket_assistant.core import skills_loader
+
+    monkeypatch.setattr(skills_loader, "_file_cache", {})
+    monkeypatch.setattr(skills_loader, "_entries_cache", {})
+    names = [f"skill-{i}" for i in range(6)]
+    for name in names:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "SKILL.md").write_text(
+            f"---\nname: {name}\ndescription: About {name}\n---\n\nBody", encoding="utf-8"
+        )
+    (tmp_path / "broken").mkdir()
+    (tmp_path / "broken" / "SKILL.md").write_bytes(b"\xff\xfe not utf-8")
+
+    index = get_skills_index([tmp_path])
+    assert index == [(name, f"About {name}") for name in names]
+    assert len(skills_loader._file_cache) == len(names)
+
+
+def test_index_decodes_only_frontmatter_bytes(tmp_path, monkeypatch):
+    """The index decodes the frontmatter slice only; files without frontmatter stop at the head."""
+    from basket_assistant.core import skills_loader
+
+    monkeypatch.setattr(skills_loader, "_HEAD_BYTES", 64)
+    monkeypatch.setattr(skills_loader, "_file_cache", {})
+    skill_md = tmp_path / "SKILL.md"
+    skill_md.write_bytes(b"---\nname: x\ndescription: y\n---\n" + b"\xe4\xbd\xa0" * 100)
+    assert skills_loader._read_frontmatter_text(skill_md) == (
+        "---\nname: x\ndescription: y\n---",
+        False,
+    )
+    skill_md.write_text("# Plain markdown\n" + "text " * 50, encoding="utf-8")
+    assert skills_loader._read_frontmatter_text(skill_md) == ("", False)
+    skill_md.write_text("short", encoding="utf-8")
+    assert skills_loader._read_frontmatter_text(skill_md) == ("short", True)
+
+
+def test_relative_skill_dir_is_resolved_against_cwd(skills_dir, monkeypatch):
+    """Absolute dirs are used as given; relative ones are resolved before scanning."""
+    monkeypatch.chdir(skills_dir.parent)
+    relative = Path(skills_dir.name)
+    assert [name for name, _ in get_skills_index([relative])] == ["git-release", "some-skill"]
+    assert get_skill_base_dir("some-skill", [relative]) == skills_dir.resolve() / "some-skill"
+
+
+def test_parse_frontmatter_keys_quotes_and_unclosed_block():
+    """Keys match case-insensitively with quotes stripped; an unclosed block is all body."""
+    from basket_assistant.core.skills_loader import _parse_frontmatter_and_body
+
+    text = "---\nName: 'my-skill'\nversion: 2\nDESCRIPTION : \"Does things\"\n---\n\nBody --- text\n"
+    assert _parse_frontmatter_and_body(text) == ("my-skill", "Does things", "Body --- text")
+    assert _parse_frontmatter_and_body("---\nname: x\n") == (None, None, "---\nname: x")
+    assert _parse_frontmatter_and_body("plain") == (None, None, "plain")
+
+
+def test_index_reads_only_frontmatter_of_long_skill(tmp_path, monkeypatch):
+    """Building the index reads a long SKILL.md only up to its frontmatter; content reads the rest."""
+    from basket_assistant.core import skills_loader
+
+    monkeypatch.setattr(skills_loader, "_HEAD_BYTES", 200)
+    monkeypatch.setattr(skills_loader, "_file_cache", {})
+    (tmp_path / "big-skill").mkdir()
+    body = "line\n" * 1000
+    (tmp_path / "big-skill" / "SKILL.md").write_text(
+        "---\nname: big-skill\ndescription: " + "d" * 80 + "\n---\n\n" + body, encoding="utf-8"
+    )
+    assert get_skills_index([tmp_path]) == [("big-skill", "d" * 80)]
+    cached = next(iter(skills_loader._file_cache.values()))
+    assert cached[2][2] is None
+    assert get_skill_full_content("big-skill", [tmp_path]) == body.strip()
@@ -54,6 +54,13 @@ async def test_task_tool_description_includes_subagent_list(agent_ref_with_agent
     assert "subagent_type" in desc or "Available subagents" in desc
 
 
+def test_task_tool_description_reused_for_same_subagents(agent_ref_with_agents):
+    """Rebuilding the tool for unchanged subagents returns the same description string."""
+    first = create_task_tool(agent_ref_with_agents)["description"]
+    assert create_task_tool(agent_ref_with_agents)["description"] is first
+    assert first.index("explore") < first.index("general")
+
+
 @pytest.mark.asyncio
 async def test_task_tool_execute_returns_task_result_wrapper(agent_ref_with_agents):
     """execute_fn calls run_subagent and returns task_id + <task_result> wrapper."""
@@ -2,7 +2,12 @@
 
 import pytest
 
-from basket_assistant.tools import TodoItem, TodoWriteParams, create_todo_write_tool
+from basket_assistant.tools import (
+    TodoItem,
+    TodoWriteParams,
+    create_todo_write_tool,
+    flush_todo_saves,
+)
 
 
 @pytest.fixture
@@ -118,9 +123,38 @@ async def test_todo_write_persists_to_file_when_session_id_set(tmp_path):
         TodoItem(id="1", content="Persisted task", status="in_progress"),
     ]
     await tool["execute_fn"](todos=todos)
+    await flush_todo_saves(agent_ref)
 
     loaded = await session_mgr.load_todos(session_id)
     assert len(loaded) == 1
     assert loaded[0]["content"] == "Persisted task"
     assert loaded[0]["status"] == "in_progress"
     assert (tmp_path / f"{session_id}.todos.json").exists()
+
+
+@pytest.mark.asyncio
+async def test_todo_write_returns_before_save_and_saves_in_order(tmp_path):
+    """The tool replies without waiting for the write; queued saves land in call order."""
+    import asyncio
+    from unittest.mock import MagicMock
+
+    gate = asyncio.Event()
+    saved = []
+
+    async def save_todos(session_id, todos):
+        await gate.wait()
+        saved.append([t["content"] for t in todos])
+
+    agent_ref = MagicMock()
+    agent_ref._current_todos = []
+    agent_ref._session_id = "s1"
+    agent_ref._todo_save_task = None
+    agent_ref.session_manager.save_todos = save_todos
+
+    tool = create_todo_write_tool(agent_ref)
+    assert "1 item" in await tool["execute_fn"](todos=[{"content": "a", "status": "pending"}])
+    await tool["execute_fn"](todos=[{"content": "b", "status": "pending"}])
+    assert saved == []
+    gate.set()
+    await flush_todo_saves(agent_ref)
+    assert saved == [["a"], ["b"]]
@@ -38,6 +38,34 @@ def test_format_tool_result_bash_truncation():
     assert "exit 0" in out
 
 
+
+def test_format_tool_result_bash_over_limit_truncated():
+    """Bash tool: stdout over 1000 chars keeps the first 1000 and reports the total."""
+    result = {"stdout": "y" * 1500 + "\n", "stderr": " oops \n", "exit_code": 1}
+    out = _format_tool_result("bash", result)
+    assert out == (
+        "exit 1 (error)\n\n" + "y" * 1000 + "\n... (1500 chars total, truncated)\n\nErrors:\noops"
+    )
+
+
+def test_format_tool_result_bash_whitespace_does_not_count_toward_limit():
+    """Bash tool: surrounding whitespace is stripped before deciding to truncate."""
+    trailing = _format_tool_result("bash", {"stdout": "ok" + "\n" * 1200, "exit_code": 0})
+    assert trailing == "exit 0\n\nok"
+    leading = _format_tool_result(
+        "bash", {"stdout": " " * 1500 + "result", "stderr": " " * 800 + "bad", "exit_code": 2}
+    )
+    assert leading == "exit 2 (error)\n\nresult\n\nErrors:\nbad"
+
+
+def test_format_tool_result_read_many_lines_preview():
+    """Read tool: only the first 5 of many lines are shown."""
+    content = "\n".join(f"line{i}" for i in range(1, 101))
+    out = _format_tool_result("read", {"file_path": "f", "lines": 100, "content": content})
+    assert out == (
+        "Read 100 lines from f\n\nFirst 5 lines:\nline1\nline2\nline3\nline4\nline5\n... (100 total lines)"
+    )
+
 def test_format_tool_result_read():
     """Read tool: file path, lines, content preview."""
     result = {
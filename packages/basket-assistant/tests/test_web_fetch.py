@@ -1,25 +1,35 @@
 """Tests for the web_fetch tool."""
 
-from unittest.mock import AsyncMock, MagicMock, patch
+import asyncio
+import sys
+from unittest.mock import patch
 
 import httpx
 import pytest
 
+from basket_assistant.tools import http_client
 from basket_assistant.tools.web_fetch import web_fetch
 
 
 @pytest.fixture
-def mock_httpx_client():
-    """Create a mock AsyncClient that yields a client with get() returning a response."""
-    async def fake_get(url, **kwargs):
-        if "timeout" in str(url) or "timeout.example" in url:
-            raise httpx.TimeoutException("timed out")
+def mock_async_client(monkeypatch):
+    """
+    Route web_fetch's AsyncClient through a MockTransport. Yields a dict of
+    url -> httpx.Response (or request -> Response callable) overrides that tests can fill in.
+    """
+    monkeypatch.setattr(http_client, "_CLIENT", None)
+    monkeypatch.setattr(sys.modules["basket_assistant.tools.web_fetch"], "_cache", {})
+    overrides = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        if url in overrides:
+            override = overrides[url]
+            return override(request) if callable(override) else override
+        if "timeout" in url:
+            raise httpx.TimeoutException("timed out", request=request)
         if "404" in url or "notfound" in url:
-            raise httpx.HTTPStatusError(
-                "404",
-                request=MagicMock(),
-                response=httpx.Response(404, content=b"Not Found"),
-            )
+            return httpx.Response(404, content=b"Not Found")
         if "html" in url.lower():
             return httpx.Response(
                 200,
@@ -32,24 +42,13 @@ def mock_httpx_client():
             headers={"content-type": "text/plain; charset=utf-8"},
         )
 
-    mock_client = MagicMock()
-    mock_client.get = AsyncMock(side_effect=fake_get)
-    return mock_client
-
-
-@pytest.fixture
-def mock_async_client(mock_httpx_client):
-    """Patch AsyncClient to return our mock client as context manager."""
-
-    class FakeClient:
-        async def __aenter__(self):
-            return mock_httpx_client
-
-        async def __aexit__(self, *args):
-            pass
-
-    with patch("basket_assistant.tools.web_fetch.httpx.AsyncClient", return_value=FakeClient()):
-        yield mock_httpx_client
+    real_client = httpx.AsyncClient
+    transport = httpx.MockTransport(handler)
+    with patch(
+        "basket_assistant.tools.http_client.httpx.AsyncClient",
+        side_effect=lambda **kwargs: real_client(transport=transport, **kwargs),
+    ):
+        yield overrides
 
 
 @pytest.mark.asyncio
@@ -104,13 +103,84 @@ async def test_web_fetch_timeout_returns_error_message(mock_async_client):
 @pytest.mark.asyncio
 async def test_web_fetch_truncates_when_over_max_chars(mock_async_client):
     """Response longer than max_chars is truncated with a note."""
-    mock_async_client.get = AsyncMock(
-        return_value=httpx.Response(
-            200,
-            content=b"x" * 200,
-            headers={"content-type": "text/plain"},
-        )
+    mock_async_client["https://example.com/big"] = httpx.Response(
+        200,
+        content=b"x" * 200,
+        headers={"content-type": "text/plain"},
     )
     result = await web_fetch(url="https://example.com/big", max_chars=50)
     assert len(result) <= 50 + 60  # content + truncation message
     assert "truncated" in result.lower()
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_stops_reading_large_body_and_notes_truncation(mock_async_client):
+    """A body far larger than max_chars is cut while streaming and marked as truncated."""
+    mock_async_client["https://example.com/huge"] = httpx.Response(
+        200,
+        content=b"y" * 1_000_000,
+        headers={"content-type": "text/plain"},
+    )
+    result = await web_fetch(url="https://example.com/huge", max_chars=100)
+    assert result == "y" * 100 + "\n\n[Content truncated due to max_chars limit.]"
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_reuses_pooled_client(mock_async_client):
+    """Fetches on the same event loop share one AsyncClient."""
+    await web_fetch(url="https://example.com/a")
+    client = http_client._CLIENT
+    await web_fetch(url="https://example.com/b")
+    assert http_client._CLIENT is client
+    assert not client.is_closed
+
+
+@pytest.mark.asyncio
+async def test_client_from_another_loop_is_closed_when_replaced(monkeypatch):
+    """A client left over from a finished loop is closed once a new loop replaces it."""
+    old_loop = asyncio.new_event_loop()
+    old_loop.close()
+    old = httpx.AsyncClient(transport=httpx.MockTransport(lambda request: httpx.Response(200)))
+    monkeypatch.setattr(http_client, "_CLIENT", old)
+    monkeypatch.setattr(http_client, "_CLIENT_LOOP", old_loop)
+
+    client = http_client.get_client()
+    try:
+        assert client is not old
+        await asyncio.gather(*http_client._closing)
+        assert old.is_closed
+    finally:
+        await client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_web_fetch_revalidates_cached_page_with_etag(mock_async_client):
+    """A page with an ETag is revalidated on the next fetch; 304 returns the cached text."""
+    seen = []
+
+    def page(request):
+        seen.append(request.headers.get("if-none-match"))
+        if request.headers.get("if-none-match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(
+            200, content=b"Docs v1", headers={"content-type": "text/plain", "etag": '"v1"'}
+        )
+
+    mock_async_client["https://example.com/docs"] = page
+    assert await web_fetch(url="https://example.com/docs") == "Docs v1"
+    assert await web_fetch(url="https://example.com/docs") == "Docs v1"
+    assert seen == [None, '"v1"']
+
+
+def test_html_to_markdown_with_selectolax():
+    """With selectolax installed, HTML converts to Markdown-ish text without scripts."""
+    pytest.importorskip("selectolax")
+    web_fetch_module = sys.modules["basket_assistant.tools.web_fetch"]
+    html = (
+        "<html><head><style>p{}</style></head><body><h2>Title</h2>"
+        "<p>Hello <strong>World</strong> <a href='https://x.test/'>link</a></p>"
+        "<script>alert(1)</script><ul><li>one</li></ul><pre>a\n    b</pre></body></html>"
+    )
+    assert web_fetch_module._html_to_markdown(html) == (
+        "## Title\n\nHello **World** [link](https://x.test/)\n\n* one\n\n```\na\n    b\n```\n"
+    )
@@ -64,11 +64,10 @@ async def test_search_serper_returns_formatted():
             {"title": "Serper", "snippet": "Search API.", "link": "https://serper.dev"},
         ],
     }
-    with patch("basket_assistant.tools.web_search.httpx.AsyncClient") as mock_client:
-        mock_client.return_value.__aenter__ = AsyncMock(return_value=MagicMock(
-            post=AsyncMock(return_value=mock_response),
-        ))
-        mock_client.return_value.__aexit__ = AsyncMock(return_value=None)
+    with patch("basket_assistant.tools.http_client._CLIENT", None), patch(
+        "basket_assistant.tools.http_client.httpx.AsyncClient"
+    ) as mock_client:
+        mock_client.return_value.post = AsyncMock(return_value=mock_response)
         result = await _search_serper("test", 5, "fake-key")
     assert "Serper" in result
     assert "Search API." in result
@@ -79,11 +78,10 @@ async def test_search_serper_returns_formatted():
 @pytest.mark.asyncio
 async def test_search_serper_http_error():
     """Serper HTTP 500 returns error message."""
-    with patch("basket_assistant.tools.web_search.httpx.AsyncClient") as mock_client:
-        mock_client.return_value.__aenter__ = AsyncMock(return_value=MagicMock(
-            post=AsyncMock(return_value=MagicMock(status_code=500)),
-        ))
-        mock_client.return_value.__aexit__ = AsyncMock(return_value=None)
+    with patch("basket_assistant.tools.http_client._CLIENT", None), patch(
+        "basket_assistant.tools.http_client.httpx.AsyncClient"
+    ) as mock_client:
+        mock_client.return_value.post = AsyncMock(return_value=MagicMock(status_code=500))
         result = await _search_serper("test", 5, "fake-key")
     assert "Error" in result
     assert "500" in result
@@ -4,8 +4,10 @@ Basket Gateway: HTTP/WebSocket gateway and channels (WebSocket, Feishu) for the
 
 from .gateway import AgentGateway, create_app, run_gateway
 from .state import (
+    ServeState,
     clear_serve_state,
     get_serve_port,
+    get_serve_state,
     is_serve_running,
     read_serve_state,
     write_serve_state,
@@ -20,4 +22,6 @@ __all__ = [
     "clear_serve_state",
     "is_serve_running",
     "get_serve_port",
+    "get_serve_state",
+    "ServeState",
 ]
@@ -5,6 +5,7 @@ DingTalk Stream channel: long connection via dingtalk-stream SDK; messages go to
 import asyncio
 import json
 import logging
+import os
 import threading
 from typing import Any, Optional
 
@@ -24,7 +25,6 @@ def start_dingtalk_client(app: Starlette, gateway: Any, config: dict) -> None:
     dt_cfg = config.get("dingtalk")
     if not dt_cfg or not isinstance(dt_cfg, dict):
         return
-    os = __import__("os")
     client_id = (dt_cfg.get("client_id") or "").strip() or os.environ.get("DINGTALK_CLIENT_ID", "")
     client_secret = (dt_cfg.get("client_secret") or "").strip() or os.environ.get("DINGTALK_CLIENT_SECRET", "")
     if not client_id or not client_secret:
@@ -3,6 +3,7 @@ Feishu long-connection channel: lark-oapi WebSocket client; messages go to gatew
 """
 
 import logging
+import os
 from typing import Any
 
 from starlette.applications import Starlette
@@ -19,7 +20,6 @@ def start_feishu_client(app: Starlette, gateway: Any, config: dict) -> None:
     feishu_cfg = config.get("feishu")
     if not feishu_cfg or not isinstance(feishu_cfg, dict):
         return
-    os = __import__("os")
     app_id = (feishu_cfg.get("app_id") or "").strip() or os.environ.get("FEISHU_APP_ID", "")
     app_secret = (feishu_cfg.get("app_secret") or "").strip() or os.environ.get("FEISHU_APP_SECRET", "")
     if not app_id or not app_secret:
@@ -2,22 +2,19 @@
 WebSocket channel: single session at /ws, stream agent events to client.
 """
 
-import json
 import logging
-from typing import Any
 
 from starlette.websockets import WebSocket
 
+from ..codec import encode_event, loads as _loads
+
 logger = logging.getLogger(__name__)
 
 
-async def _send_json_safe(app: Any, obj: dict) -> None:
-    """Send JSON to current_ws if set; ignore if closed."""
-    ws = getattr(app.state, "current_ws", None)
-    if ws is None:
-        return
+async def _send_json_safe(ws: WebSocket, obj: dict) -> None:
+    """Send JSON to ws; ignore if closed."""
     try:
-        await ws.send_json(obj)
+        await ws.send_text(encode_event(obj))
     except Exception:
         pass
 
@@ -43,14 +40,24 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
 
     app.state.current_ws = websocket
 
+    # The sink is bound to this connection; the gateway's per-agent sender task
+    # serialises calls, so no app.state lookup is needed per event.
     async def event_sink(payload: dict) -> None:
-        await _send_json_safe(app, payload)
+        await _send_json_safe(websocket, payload)
 
     try:
-        async for message in websocket.iter_text():
+        while True:
+            # Accept text and binary frames; both codecs parse str or bytes directly,
+            # so binary frames skip the UTF-8 decode to str.
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+            message = frame.get("bytes") or frame.get("text")
+            if not message:
+                continue
             try:
-                data = json.loads(message)
-            except json.JSONDecodeError:
+                data = _loads(message)
+            except ValueError:  # JSONDecodeError, or UnicodeDecodeError for bad bytes
                 await event_sink({"type": "agent_error", "error": "Invalid JSON"})
                 continue
             if data.get("type") != "message":
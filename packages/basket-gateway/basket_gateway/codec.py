@@ -0,0 +1,46 @@
+"""
+JSON codec for gateway event frames: orjson when installed (extra: fast-json), else stdlib json.
+
+orjson.JSONDecodeError subclasses json.JSONDecodeError (a ValueError), so callers
+catch the stdlib exception for either codec.
+"""
+
+import json
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional; stdlib fallback below
+    orjson = None
+
+if orjson is not None:
+    loads = orjson.loads
+
+    def dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+
+else:
+    loads = json.loads
+
+    def dumps(obj: Any) -> str:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False)
+
+
+# Streamed deltas are the bulk of outbound frames: only the delta string is encoded
+_DELTA_PREFIXES = {
+    event_type: f'{{"type":"{event_type}","delta":'
+    for event_type in ("text_delta", "thinking_delta")
+}
+
+
+def encode_event(payload: dict) -> str:
+    """Encode an outbound event; {"type": <delta type>, "delta": str} uses a prebuilt prefix."""
+    prefix = _DELTA_PREFIXES.get(payload.get("type"))
+    if prefix is not None and len(payload) == 2:
+        delta = payload.get("delta")
+        if isinstance(delta, str):
+            return prefix + dumps(delta) + "}"
+    return dumps(payload)
+
+
+__all__ = ["dumps", "encode_event", "loads"]
@@ -7,6 +7,7 @@ Agent is injected via agent_factory; channels are mounted per channel_config.
 import asyncio
 import json
 import logging
+import os
 import time
 from typing import Any, Awaitable, Callable, Optional
 
@@ -16,6 +17,7 @@ from starlette.responses import JSONResponse
 from starlette.routing import Route
 
 from .state import clear_serve_state, write_serve_state
+from .tool_format import format_tool_result
 
 logger = logging.getLogger(__name__)
 
@@ -23,64 +25,6 @@ VERSION = "0.1.0"
 _start_time: Optional[float] = None
 
 
-def format_tool_result(tool_name: str, result: Any) -> str:
-    """Format tool result for display (shared by all channels)."""
-    if result is None:
-        return "Tool executed successfully (no output)"
-    if isinstance(result, dict):
-        if tool_name == "bash":
-            stdout = result.get("stdout", "").strip()
-            stderr = result.get("stderr", "").strip()
-            exit_code = result.get("exit_code", 0)
-            timeout = result.get("timeout", False)
-            parts = []
-            if timeout:
-                parts.append("Command timed out")
-            parts.append(f"exit {exit_code}" if exit_code == 0 else f"exit {exit_code} (error)")
-            if stdout:
-                parts.append(
-                    f"\n{stdout[:1000]}\n... ({len(stdout)} chars total, truncated)"
-                    if len(stdout) > 1000
-                    else f"\n{stdout}"
-                )
-            if stderr:
-                parts.append(f"\nErrors:\n{stderr[:500]}")
-            return "\n".join(parts)
-        if tool_name == "read":
-            lines = result.get("lines", 0)
-            file_path = result.get("file_path", "")
-            content = result.get("content", "")
-            content_lines = content.split("\n")
-            preview = "\n".join(content_lines[:5])
-            if len(content_lines) > 5:
-                return f"Read {lines} lines from {file_path}\n\nFirst 5 lines:\n{preview}\n... ({lines} total lines)"
-            return f"Read {lines} lines from {file_path}\n\n{preview}"
-        if tool_name == "write":
-            file_path = result.get("file_path", "")
-            success = result.get("success", False)
-            return f"Wrote file: {file_path}" if success else f"Write failed: {result.get('error', 'Unknown error')}"
-        if tool_name == "edit":
-            success = result.get("success", False)
-            replacements = result.get("replacements_made", 0)
-            file_path = result.get("file_path", "")
-            if success:
-                return f"Made {replacements} replacement(s) in {file_path}"
-            return f"Edit failed: {result.get('error', 'Unknown error')}"
-        if tool_name == "grep":
-            total_matches = result.get("total_matches", 0)
-            matches = result.get("matches", [])
-            parts = [f"Found {total_matches} match(s)"]
-            for match in matches[:5]:
-                parts.append(f"  {match.get('file_path', '')}:{match.get('line_number', 0)}")
-            if total_matches > 5:
-                parts.append(f"... and {total_matches - 5} more")
-            return "\n".join(parts)
-    result_str = str(result)
-    if len(result_str) > 500:
-        return result_str[:500] + f"\n... ({len(result_str)} chars total, truncated)"
-    return result_str
-
-
 def _extract_last_assistant_text(agent: Any) -> str:
     """Get the last assistant message text from agent.context.messages."""
     from basket_ai.types import AssistantMessage
@@ -96,6 +40,69 @@ def _extract_last_assistant_text(agent: Any) -> str:
     return ""
 
 
+# Streamed text/thinking deltas are coalesced for this long before one event is sent
+DELTA_FLUSH_INTERVAL = 0.01
+
+
+class _DeltaBatcher:
+    """
+    Coalesces consecutive deltas of one type (text_delta / thinking_delta) into a
+    single event, sent after DELTA_FLUSH_INTERVAL or when flush() is called. Any
+    other event must flush first so clients see events in their original order.
+    """
+
+    def __init__(self, send: Callable[[dict], None]) -> None:
+        self._send = send
+        self._type: Optional[str] = None
+        self._parts: list[str] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    def append(self, event_type: str, delta: str) -> None:
+        if not delta:
+            return
+        if event_type != self._type:
+            self.flush()
+            self._type = event_type
+        self._parts.append(delta)
+        if self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(
+                DELTA_FLUSH_INTERVAL, self.flush
+            )
+
+    def flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._parts:
+            delta = "".join(self._parts)
+            self._parts.clear()
+            self._send({"type": self._type, "delta": delta})
+
+
+async def _send_events(queue: "asyncio.Queue[dict]", ref: list) -> None:
+    """Sender task: deliver queued events to the current sink (ref[0]) in FIFO order."""
+    while True:
+        payload = await queue.get()
+        try:
+            sink = ref[0]
+            if sink is not None:
+                await sink(payload)
+        except Exception:
+            logger.debug("Gateway event sink failed", exc_info=True)
+        finally:
+            queue.task_done()
+
+
+async def _drain_events(agent: Any) -> None:
+    """Send buffered deltas and wait until every queued event reached the sink."""
+    batcher = getattr(agent, "_gateway_delta_batcher", None)
+    if batcher is not None:
+        batcher.flush()
+    queue = getattr(agent, "_gateway_event_queue", None)
+    if queue is not None:
+        await queue.join()
+
+
 class AgentGateway:
     """
     Gateway that runs agent for a session; supports single default session and
@@ -106,6 +113,7 @@ class AgentGateway:
         self._agent_factory = agent_factory
         self._default_agent: Optional[Any] = None
         self._sessions: dict[str, Any] = {}
+        self._sender_tasks: list[asyncio.Task] = []
 
     def _get_agent(self, session_id: str) -> Any:
         if session_id == "default":
@@ -123,22 +131,44 @@ class AgentGateway:
         ref: list = [None]  # mutable so handlers see current sink
         agent._gateway_event_sink_ref = ref
 
-        def make_send(payload: dict) -> None:
-            sink = ref[0]
-            if sink is not None:
-                asyncio.create_task(sink(payload))
+        # One long-lived sender task per agent drains the queue, instead of a task per event.
+        # Unbounded: a slow client must not lose events (deltas are already coalesced).
+        queue: asyncio.Queue[dict] = asyncio.Queue()
+        agent._gateway_event_queue = queue
+        self._sender_tasks.append(asyncio.create_task(_send_events(queue, ref)))
 
-        agent.agent.on("text_delta", lambda e: make_send({"type": "text_delta", "delta": e.get("delta", "")}))
-        agent.agent.on("thinking_delta", lambda e: make_send({"type": "thinking_delta", "delta": e.get("delta", "")}))
-        agent.agent.on(
-            "agent_tool_call_start",
-            lambda e: make_send({
+        def send_now(payload: dict) -> None:
+            if ref[0] is not None:
+                queue.put_nowait(payload)
+
+        batcher = agent._gateway_delta_batcher = _DeltaBatcher(send_now)
+
+        def make_send(payload: dict) -> None:
+            batcher.flush()
+            send_now(payload)
+
+        # Handlers stay registered between runs; with no sink attached (e.g. a run
+        # started without a client) they return before batching or formatting anything.
+        def on_text_delta(e: dict) -> None:
+            if ref[0] is not None:
+                batcher.append("text_delta", e.get("delta", ""))
+
+        def on_thinking_delta(e: dict) -> None:
+            if ref[0] is not None:
+                batcher.append("thinking_delta", e.get("delta", ""))
+
+        def on_tool_call_start(e: dict) -> None:
+            if ref[0] is None:
+                return
+            make_send({
                 "type": "tool_call_start",
                 "tool_name": e.get("tool_name", "unknown"),
                 "arguments": e.get("arguments", {}),
-            }),
-        )
+            })
+
         def on_tool_call_end(e: dict) -> None:
+            if ref[0] is None:
+                return
             tool_name = e.get("tool_name", "unknown")
             if e.get("error") is not None:
                 make_send({"type": "tool_call_end", "tool_name": tool_name, "error": str(e["error"])})
@@ -159,6 +189,9 @@ class AgentGateway:
                     "options": last.get("options") or [],
                 })
 
+        agent.agent.on("text_delta", on_text_delta)
+        agent.agent.on("thinking_delta", on_thinking_delta)
+        agent.agent.on("agent_tool_call_start", on_tool_call_start)
         agent.agent.on("agent_tool_call_end", on_tool_call_end)
         agent.agent.on("agent_complete", lambda _: make_send({"type": "agent_complete"}))
         agent.agent.on(
@@ -167,6 +200,13 @@ class AgentGateway:
         )
         agent._gateway_event_sink_handlers = True
 
+    async def aclose(self) -> None:
+        """Stop the per-agent event sender tasks (app shutdown)."""
+        for task in self._sender_tasks:
+            task.cancel()
+        await asyncio.gather(*self._sender_tasks, return_exceptions=True)
+        self._sender_tasks.clear()
+
     async def run(
         self,
         session_id: str,
@@ -222,19 +262,24 @@ class AgentGateway:
                 )
                 if resumed:
                     if event_sink is not None and getattr(agent, "_gateway_event_sink_ref", None) is not None:
+                        await _drain_events(agent)
                         agent._gateway_event_sink_ref[0] = None
                     return _extract_last_assistant_text(agent)
             except Exception as e:
                 logger.exception("Resume pending ask failed")
                 if event_sink is not None:
+                    await _drain_events(agent)
                     await event_sink({"type": "agent_error", "error": str(e)})
                 if event_sink is not None and getattr(agent, "_gateway_event_sink_ref", None) is not None:
                     agent._gateway_event_sink_ref[0] = None
                 return f"Error: {e}"
 
         n_before = len(agent.context.messages)
+        # user_content is a plain str from the channel: skip pydantic validation
         agent.context.messages.append(
-            UserMessage(role="user", content=user_content, timestamp=int(time.time() * 1000))
+            UserMessage.model_construct(
+                role="user", content=user_content, timestamp=time.time_ns() // 1_000_000
+            )
         )
         try:
             await agent._run_with_trajectory_if_enabled(stream_llm_events=(event_sink is not None))
@@ -262,10 +307,12 @@ class AgentGateway:
         except Exception as e:
             logger.exception("Agent run failed in gateway")
             if event_sink is not None:
+                await _drain_events(agent)
                 await event_sink({"type": "agent_error", "error": str(e)})
             return f"Error: {e}"
         finally:
             if event_sink is not None and getattr(agent, "_gateway_event_sink_ref", None) is not None:
+                await _drain_events(agent)
                 agent._gateway_event_sink_ref[0] = None
 
         return _extract_last_assistant_text(agent)
@@ -310,13 +357,14 @@ def create_app(
     routes.extend(get_routes(gateway, config))
 
     async def lifespan(app: Starlette):
-        app.state.pid = pid or __import__("os").getpid()
+        app.state.pid = pid or os.getpid()
         app.state.gateway = gateway
         app.state.channel_config = config
         app.state.current_ws = None
         from .channels import mount_all_channels
         mount_all_channels(app, gateway, config)
         yield
+        await gateway.aclose()
         if getattr(app.state, "feishu_stop", None) is not None:
             try:
                 app.state.feishu_stop()
@@ -345,11 +393,14 @@ async def run_gateway(
     if agent_factory is None:
         raise ValueError("agent_factory is required")
 
-    pid = __import__("os").getpid()
+    pid = os.getpid()
     write_serve_state(pid, port)
     _start_time = time.time()
     app = create_app(pid=pid, agent_factory=agent_factory, channel_config=channel_config)
-    config = uvicorn.Config(app, host=host, port=port, log_level="info")
+    # Event frames are small and mostly local: skip permessage-deflate on every frame
+    config = uvicorn.Config(
+        app, host=host, port=port, log_level="info", ws_per_message_deflate=False
+    )
     server = uvicorn.Server(config)
     try:
         await server.serve()
@@ -1,68 +1,94 @@
 """
-State files for the resident assistant gateway: pid and port under ~/.basket/.
+State file for the resident assistant gateway: pid and port in ~/.basket/serve.json.
 """
 
+import json
 import os
 from pathlib import Path
-from typing import Optional
+from typing import NamedTuple, Optional
+
+
+class ServeState(NamedTuple):
+    """Snapshot of the gateway state files plus a liveness probe of the pid."""
+
+    running: bool
+    pid: Optional[int]
+    port: Optional[int]
 
 
 def _config_dir() -> Path:
     return Path.home() / ".basket"
 
 
+def _state_file() -> Path:
+    return _config_dir() / "serve.json"
+
+
 def _pid_file() -> Path:
+    """Legacy pid file (gateways started before serve.json); read and cleared only."""
     return _config_dir() / "serve.pid"
 
 
 def _port_file() -> Path:
+    """Legacy port file (gateways started before serve.json); read and cleared only."""
     return _config_dir() / "serve.port"
 
 
+def _read_int(path: Path) -> Optional[int]:
+    """Read an integer state file; None when missing, empty or malformed."""
+    try:
+        return int(path.read_text().strip() or 0) or None
+    except (ValueError, OSError):
+        return None
+
+
+def _positive_int(value: object) -> Optional[int]:
+    return value if isinstance(value, int) and value > 0 else None
+
+
 def read_serve_state() -> tuple[Optional[int], Optional[int]]:
     """
-    Read pid and port from state files.
+    Read pid and port from the state file.
 
     Returns:
-        (pid, port) or (None, None) if files missing or invalid.
+        (pid, port) or (None, None) if the file is missing or invalid.
     """
-    pid_path = _pid_file()
-    port_path = _port_file()
-    pid = None
-    port = None
-    if pid_path.exists():
-        try:
-            raw = pid_path.read_text().strip()
-            if raw:
-                pid = int(raw)
-        except (ValueError, OSError):
-            pass
-    if port_path.exists():
-        try:
-            raw = port_path.read_text().strip()
-            if raw:
-                port = int(raw)
-        except (ValueError, OSError):
-            pass
-    return pid, port
+    try:
+        raw = _state_file().read_text()
+    except OSError:
+        return _read_int(_pid_file()), _read_int(_port_file())
+    try:
+        data = json.loads(raw)
+        return _positive_int(data.get("pid")), _positive_int(data.get("port"))
+    except (ValueError, AttributeError):
+        return None, None
 
 
 def write_serve_state(pid: int, port: int) -> None:
-    """Write pid and port to state files. Creates config dir if needed."""
+    """
+    Write pid and port to the state file. Creates config dir if needed.
+
+    Both values are published together with one os.replace, so readers never see
+    a pid without its port.
+    """
     d = _config_dir()
-    d.mkdir(parents=True, exist_ok=True)
-    _pid_file().write_text(str(pid))
-    _port_file().write_text(str(port))
+    tmp = d / f"serve.json.{os.getpid()}.tmp"
+    payload = json.dumps({"pid": pid, "port": port})
+    try:
+        tmp.write_text(payload)
+    except FileNotFoundError:
+        d.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(payload)
+    os.replace(tmp, _state_file())
 
 
 def clear_serve_state() -> None:
-    """Remove pid and port files if they exist."""
-    for p in (_pid_file(), _port_file()):
-        if p.exists():
-            try:
-                p.unlink()
-            except OSError:
-                pass
+    """Remove the state file (and legacy pid/port files) if they exist."""
+    for p in (_state_file(), _pid_file(), _port_file()):
+        try:
+            p.unlink(missing_ok=True)
+        except OSError:
+            pass
 
 
 def is_serve_running() -> tuple[bool, Optional[int]]:
@@ -72,14 +98,25 @@ def is_serve_running() -> tuple[bool, Optional[int]]:
     Returns:
         (running, pid). running is True iff pid file exists and process exists.
     """
-    pid, _ = read_serve_state()
+    state = get_serve_state()
+    return state.running, state.pid
+
+
+def get_serve_state() -> ServeState:
+    """
+    Read pid and port once and check whether the process is alive.
+
+    Returns:
+        ServeState(running, pid, port); running is False when there is no pid file.
+    """
+    pid, port = read_serve_state()
     if pid is None:
-        return False, None
+        return ServeState(False, None, port)
     try:
         os.kill(pid, 0)
-        return True, pid
     except OSError:
-        return False, pid
+        return ServeState(False, pid, port)
+    return ServeState(True, pid, port)
 
 
 def get_serve_port() -> Optional[int]:
@@ -0,0 +1,106 @@
+"""
+Tool result formatting shared by the gateway channels and the terminal UI.
+
+Formatters are looked up in a table keyed by tool name; tools without an entry
+(and non-dict results) fall back to a truncated str().
+"""
+
+from typing import Any, Callable, Dict
+
+
+def _truncate(text: str, limit: int) -> str:
+    """Return text, or its first limit chars followed by a truncation note."""
+    size = len(text)
+    if size <= limit:
+        return text
+    return f"{text[:limit]}\n... ({size} chars total, truncated)"
+
+
+def _strip_truncate(text: str, limit: int) -> str:
+    """
+    _truncate(text.strip(), limit) without copying a long text whole: the cut and the
+    reported total are based on the stripped text, only the kept slice is rstripped.
+    """
+    text = text.lstrip()
+    size = len(text)
+    while size and text[size - 1].isspace():
+        size -= 1
+    if size <= limit:
+        return text[:size]
+    return f"{text[:limit].rstrip()}\n... ({size} chars total, truncated)"
+
+
+def _fmt_bash(result: dict) -> str:
+    exit_code = result.get("exit_code", 0)
+    parts = []
+    if result.get("timeout", False):
+        parts.append("Command timed out")
+    parts.append(f"exit {exit_code}" if exit_code == 0 else f"exit {exit_code} (error)")
+    stdout = _strip_truncate(result.get("stdout") or "", 1000)
+    if stdout:
+        parts.append(f"\n{stdout}")
+    stderr = (result.get("stderr") or "").lstrip()[:500].rstrip()
+    if stderr:
+        parts.append(f"\nErrors:\n{stderr}")
+    return "\n".join(parts)
+
+
+def _fmt_read(result: dict) -> str:
+    lines = result.get("lines", 0)
+    file_path = result.get("file_path", "")
+    # At most 6 pieces: the first 5 lines plus the unsplit remainder
+    content_lines = result.get("content", "").split("\n", 5)
+    preview = "\n".join(content_lines[:5])
+    if len(content_lines) > 5:
+        return f"Read {lines} lines from {file_path}\n\nFirst 5 lines:\n{preview}\n... ({lines} total lines)"
+    return f"Read {lines} lines from {file_path}\n\n{preview}"
+
+
+def _fmt_write(result: dict) -> str:
+    if result.get("success", False):
+        return f"Wrote file: {result.get('file_path', '')}"
+    return f"Write failed: {result.get('error', 'Unknown error')}"
+
+
+def _fmt_edit(result: dict) -> str:
+    if result.get("success", False):
+        replacements = result.get("replacements_made", 0)
+        return f"Made {replacements} replacement(s) in {result.get('file_path', '')}"
+    return f"Edit failed: {result.get('error', 'Unknown error')}"
+
+
+def _fmt_grep(result: dict) -> str:
+    total_matches = result.get("total_matches", 0)
+    matches = result.get("matches", [])
+    parts = [f"Found {total_matches} match(es)"]
+    if matches:
+        sample = matches[:5]
+        parts.append(f"\nShowing {len(sample)} of {total_matches}:")
+        for match in sample:
+            parts.append(f"  {match.get('file_path', '')}:{match.get('line_number', 0)}")
+        if total_matches > len(sample):
+            parts.append(f"... and {total_matches - len(sample)} more")
+    return "\n".join(parts)
+
+
+def _fmt_default(result: Any) -> str:
+    return _truncate(str(result), 500)
+
+
+# Tool name -> formatter for dict results
+_FORMATTERS: Dict[str, Callable[[dict], str]] = {
+    "bash": _fmt_bash,
+    "read": _fmt_read,
+    "write": _fmt_write,
+    "edit": _fmt_edit,
+    "grep": _fmt_grep,
+}
+
+
+def format_tool_result(tool_name: str, result: Any) -> str:
+    """Format tool result for display (shared by all channels and the TUI)."""
+    if result is None:
+        return "Tool executed successfully (no output)"
+    if isinstance(result, dict):
+        return _FORMATTERS.get(tool_name, _fmt_default)(result)
+    return _fmt_default(result)
@@ -4,13 +4,14 @@ pi-trajectory: task trajectory recording for agent runs (RL and tuning).
 
 from .schema import TaskTrajectory, ToolCallRecord, TurnRecord
 from .recorder import TrajectoryRecorder
-from .storage import write_trajectory, load_trajectory, load_trajectories
+from .storage import EventLogWriter, write_trajectory, load_trajectory, load_trajectories
 
 __all__ = [
     "TaskTrajectory",
     "TurnRecord",
     "ToolCallRecord",
     "TrajectoryRecorder",
+    "EventLogWriter",
     "write_trajectory",
     "load_trajectory",
     "load_trajectories",
@@ -43,7 +43,7 @@ class TrajectoryRecorder:
     """
 
     def __init__(self, task_id: Optional[str] = None):
-        self.task_id = task_id or f"task_{int(time.time() * 1000)}"
+        self.task_id = task_id or f"task_{time.time_ns() // 1_000_000}"
         self._started_at: float = 0.0
         self._ended_at: float = 0.0
         self._user_input: str = ""
@@ -152,32 +152,28 @@ class TrajectoryRecorder:
                     tool_names = [t.name for t in state.context.tools]
             except Exception:
                 pass
-            # Build turns from context.messages: each AssistantMessage = one turn
+            # Build turns from context.messages: each AssistantMessage = one turn.
+            # Each message is dumped once; turn i's input is a slice of the shared dumps
+            # (model_construct keeps the dicts shared instead of copying per turn).
             try:
                 messages = state.context.messages or []
+                dumped: List[Dict[str, Any]] = []
                 turn_index = 0
-                for i, msg in enumerate(messages):
+                for msg in messages:
+                    if hasattr(msg, "model_dump"):
+                        msg_dict = msg.model_dump(mode="json")
+                    elif isinstance(msg, dict):
+                        msg_dict = msg
+                    else:
+                        msg_dict = None
                     if getattr(msg, "role", None) == "assistant":
                         turn_index += 1
-                        asst_dict: Dict[str, Any] = {}
-                        if hasattr(msg, "model_dump"):
-                            asst_dict = msg.model_dump(mode="json")
-                        elif isinstance(msg, dict):
-                            asst_dict = msg
-                        tool_calls = self._turn_tool_calls.get(turn_index, [])
-                        # Input for this turn = all messages before this assistant
-                        input_messages: List[Dict[str, Any]] = []
-                        for m in messages[:i]:
-                            if hasattr(m, "model_dump"):
-                                input_messages.append(m.model_dump(mode="json"))
-                            elif isinstance(m, dict):
-                                input_messages.append(m)
                         turns.append(
-                            TurnRecord(
+                            TurnRecord.model_construct(
                                 turn_index=turn_index,
-                                input_messages=input_messages,
-                                assistant_message=asst_dict,
-                                tool_calls=tool_calls,
+                                input_messages=dumped[:],
+                                assistant_message=msg_dict if msg_dict is not None else {},
+                                tool_calls=self._turn_tool_calls.get(turn_index, []),
                             )
                         )
                         # Aggregate usage from this assistant message
@@ -188,6 +184,8 @@ class TrajectoryRecorder:
                             total_usage["total_tokens"] = total_usage.get("total_tokens", 0) + getattr(u, "total_tokens", 0)
                             if getattr(u, "cost", None) is not None:
                                 total_usage["cost_total"] = total_usage.get("cost_total", 0) + getattr(u.cost, "total", 0)
+                    if msg_dict is not None:
+                        dumped.append(msg_dict)
             except Exception as e:
                 logger.debug("Trajectory finalize from state: %s", e)
 
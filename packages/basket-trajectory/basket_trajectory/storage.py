@@ -3,19 +3,71 @@ Trajectory storage: write and load TaskTrajectory to/from disk.
 """
 
 import json
+import queue
+import threading
 from pathlib import Path
-from typing import List, Union
+from typing import Any, Dict, List, Optional, Union
 
 from .schema import TaskTrajectory
 
 
 def write_trajectory(trajectory: TaskTrajectory, path: Union[Path, str]) -> None:
-    """Write a single trajectory to a JSON file."""
+    """
+    Write a single trajectory to a JSON file.
+
+    Serializes straight from the model with pydantic-core (no intermediate dict tree).
+    """
     path = Path(path).expanduser()
     path.parent.mkdir(parents=True, exist_ok=True)
-    data = trajectory.model_dump(mode="json")
     with open(path, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
+        f.write(trajectory.model_dump_json(indent=2))
+
+
+def _json_default(obj: Any) -> Any:
+    """Fallback for json.dumps: pydantic models by model_dump, anything else as str."""
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump(mode="json")
+    return str(obj)
+
+
+class EventLogWriter:
+    """
+    Append raw agent events to a JSONL file as they arrive.
+
+    Each event is serialized on the calling thread (so later mutation of the event
+    does not leak into the log) and written by a background daemon thread, so the
+    caller never blocks on disk and nothing accumulates beyond the pending queue.
+    """
+
+    def __init__(self, path: Union[Path, str]):
+        self.path = Path(path).expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._queue: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        self._thread = threading.Thread(
+            target=self._drain, name="trajectory-events", daemon=True
+        )
+        self._thread.start()
+
+    def _drain(self) -> None:
+        get = self._queue.get
+        write = self._file.write
+        while True:
+            line = get()
+            if line is None:
+                break
+            write(line)
+        self._file.close()
+
+    def write(self, event: Dict[str, Any]) -> None:
+        """Queue one event as a JSON line."""
+        self._queue.put(json.dumps(event, default=_json_default) + "\n")
+
+    def close(self) -> None:
+        """Write all queued events and close the file; safe to call more than once."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
 
 
 def load_trajectory(path: Union[Path, str]) -> TaskTrajectory:
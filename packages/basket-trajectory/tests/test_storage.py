@@ -1,9 +1,11 @@
 """Tests for trajectory storage."""
 
+import json
+
 import pytest
 from pathlib import Path
 
-from basket_trajectory import TaskTrajectory, write_trajectory, load_trajectory, load_trajectories
+from basket_trajectory import EventLogWriter, TaskTrajectory, write_trajectory, load_trajectory, load_trajectories
 
 
 def test_write_and_load_trajectory(tmp_path):
@@ -55,3 +57,43 @@ def test_load_trajectories_single_file(tmp_path):
     out = load_trajectories(path)
     assert len(out) == 1
     assert out[0].task_id == "single"
+
+
+def test_write_trajectory_keeps_unicode_and_nested_turns(tmp_path):
+    from basket_trajectory import TurnRecord
+
+    tr = TaskTrajectory(
+        task_id="unicode",
+        started_at=1000.0,
+        ended_at=1005.0,
+        success=True,
+        user_input="你好",
+        turns=[
+            TurnRecord(
+                turn_index=1,
+                input_messages=[{"role": "user", "content": "你好"}],
+                assistant_message={"role": "assistant", "content": []},
+            )
+        ],
+        total_turns=1,
+    )
+    path = tmp_path / "unicode.json"
+    write_trajectory(tr, path)
+    assert "你好" in path.read_text(encoding="utf-8")
+    loaded = load_trajectory(path)
+    assert loaded == tr
+
+
+def test_event_log_writer_appends_jsonl(tmp_path):
+    path = tmp_path / "sub" / "task_1.events.jsonl"
+    log = EventLogWriter(path)
+    event = {"type": "agent_tool_call_end", "tool_name": "read", "result": {"n": 1}}
+    log.write(event)
+    event["result"] = "mutated after write"
+    final = TaskTrajectory(task_id="t", started_at=0.0, ended_at=1.0)
+    log.write({"type": "agent_complete", "final_message": final})
+    log.close()
+    log.close()
+    lines = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+    assert lines[0] == {"type": "agent_tool_call_end", "tool_name": "read", "result": {"n": 1}}
+    assert lines[1]["final_message"]["task_id"] == "t"